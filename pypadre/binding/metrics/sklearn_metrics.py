@@ -7,6 +7,7 @@ from pypadre import _name, _version
 from pypadre.core.metrics.metric_registry import metric_registry
 from pypadre.core.metrics.metrics import MetricProviderMixin, Metric
 from pypadre.core.model.code.code_mixin import PipIdentifier, PythonPackage
+from pypadre.core.model.computation.predictions import as_predictions
 from pypadre.core.model.pipeline.components.component_mixins import EvaluatorComponentMixin
 from pypadre.core.ontology.padre_ontology import PaDREOntology
 from pypadre.core.util.utils import unpack
@@ -42,41 +43,25 @@ def matrix(ctx, **kwargs) -> Optional[Metric]:
     from pypadre.core.model.pipeline.components.component_mixins import EvaluatorComponentMixin
     (computation,) = unpack(ctx, "computation")
 
-    # create the predicted values and the truth values array from the computation results
-    predictions = computation.result[EvaluatorComponentMixin.PREDICTIONS]
+    # create the predicted values and the truth values array from the computation results. Results stored with the
+    # old dict of the rows are converted into columns
+    predictions = as_predictions(computation.result[EvaluatorComponentMixin.PREDICTIONS])
 
-    predicted = []
-    truth = []
-
-    # The predictions dictionary contains as the key the testing row index, and the value is a dictionary. The
-    # dictionary contains the truth value, predicted value and probabilities
-    for row_idx in predictions:
-        prediction_results = predictions.get(row_idx)
-        predicted.append(prediction_results.get(EvaluatorComponentMixin.PREDICTED))
-        truth.append(prediction_results.get(EvaluatorComponentMixin.TRUTH))
-
-    if predicted is None or truth is None or len(predicted) != len(truth):
+    if predictions is None:
         computation.send_error("")
         return None
+    predicted = predictions.predicted
+    truth = predictions.truth
 
-    # Get the number of labels from the predicted and truth set
-    label_count = len(set(predicted).union(set(truth)))
-    confusion_matrix = np.zeros(shape=(label_count, label_count), dtype=int)
-    # If the labels given do not start from 0 and go up to the label_count - 1,
-    # a mapping function has to be created to map the label to the corresponding indices
-    if (min(predicted) != 0 and min(truth) != 0) or \
-            (max(truth) != label_count - 1 and max(predicted) != label_count - 1):
-        labels = list(set(predicted).union(set(truth)))
-        for idx in range(0, len(truth)):
-            row_idx = int(labels.index(truth[idx]))
-            col_idx = int(labels.index(predicted[idx]))
-            confusion_matrix[row_idx][col_idx] += 1
-
-    else:
+    # Map the labels to the indices of the sorted labels. For labels going from 0 to label_count - 1 the index equals
+    # the label.
+    labels, codes = np.unique(np.concatenate([truth, predicted]), return_inverse=True)
+    label_count = len(labels)
+    truth_codes, predicted_codes = codes[:len(truth)], codes[len(truth):]
 
-        # Iterate through the array and update the confusion matrix
-        for idx in range(0, len(truth)):
-            confusion_matrix[int(truth[idx])][int(predicted[idx])] += 1
+    # Count the pairs of truth and predicted label in one pass
+    confusion_matrix = np.bincount(truth_codes * label_count + predicted_codes,
+                                   minlength=label_count * label_count).reshape(label_count, label_count)
 
     return Metric(name=CONFUSION_MATRIX, computation=computation, result=copy.deepcopy(confusion_matrix.tolist()))
 
@@ -102,19 +87,9 @@ class ConfusionMatrix(MetricProviderMixin):
 def regression(ctx, **kwargs) -> Optional[Metric]:
     (computation,) = unpack(ctx, "computation")
 
-    predictions = computation.result[EvaluatorComponentMixin.PREDICTIONS]
-
-    predicted = []
-    truth = []
-
-    # The predictions dictionary contains as the key the testing row index, and the value is a dictionary. The
-    # dictionary contains the truth value, predicted value and probabilities
-    for row_idx in predictions:
-        prediction_results = predictions.get(row_idx)
-        predicted.append(prediction_results.get(EvaluatorComponentMixin.PREDICTED))
-        truth.append(prediction_results.get(EvaluatorComponentMixin.TRUTH))
+    predictions = as_predictions(computation.result[EvaluatorComponentMixin.PREDICTIONS])
 
-    if predicted is None or truth is None or len(predicted) != len(truth):
+    if predictions is None:
         computation.send_error("")
         return None
 
@@ -127,7 +102,7 @@ def regression(ctx, **kwargs) -> Optional[Metric]:
 
     :return: Dictionary containing the computed metrics
     """
-    error = np.array(truth) - np.array(predicted)
+    error = predictions.truth.astype(float) - predictions.predicted.astype(float)
 
     regression_metrics = dict()
     regression_metrics[TOTAL_ERROR] = float(np.sum(error))
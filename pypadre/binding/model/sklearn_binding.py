@@ -14,11 +14,12 @@ from pypadre.core.model.pipeline.components.components import PipelineComponent,
 class SKLearnPipeline(pipeline.DefaultPythonExperimentPipeline):
 
     def __init__(self, *, splitting: Optional[Union[Type[CodeMixin], Callable]] = None, parameter_provider=None,
-                 pipeline_fn: Callable, **kwargs):
+                 pipeline_fn: Callable, warm_start=False, **kwargs):
         """
 
         :param splitting:
         :param pipeline_fn: A function that returns a Sklearn pipeline as the return value
+        :param warm_start: Reuse fitted state between the combinations of the grid (see SKLearnEstimator)
         :param kwargs:
         """
         pipeline = pipeline_fn()
@@ -33,7 +34,7 @@ class SKLearnPipeline(pipeline.DefaultPythonExperimentPipeline):
 
         # TODO provider for a specific node
         sk_learn_estimator = SKLearnEstimator(pipeline=pipeline, parameter_provider=parameter_provider,
-                                              reference=kwargs.get("reference"))
+                                              warm_start=warm_start, reference=kwargs.get("reference"))
         sk_learn_evaluator = SKLearnEvaluator(reference=kwargs.get("reference"))
         super().__init__(splitting=splitting, estimator=sk_learn_estimator, evaluator=sk_learn_evaluator, **kwargs)
 
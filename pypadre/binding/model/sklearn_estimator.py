@@ -1,8 +1,15 @@
+import copy
+import json
+import threading
+from collections import OrderedDict
+
 import numpy as np
 
 from pypadre.binding.model.sklearn_gridsearch import sklearn_grid_search
 from pypadre.binding.visitors.scikit import SciKitVisitor
 from pypadre.core.base import phases
+from pypadre.core.model.computation.hyper_parameter_search import HyperParameterGrid, HyperParameterSearch, \
+    ParameterGrid
 from pypadre.core.model.computation.training import Training
 from pypadre.core.model.generic.custom_code import ProvidedCodeHolderMixin
 from pypadre.core.model.pipeline.components.component_mixins import EstimatorComponentMixin, \
@@ -20,6 +27,53 @@ def is_sklearn_pipeline(pipeline):
     return type(pipeline).__name__ == 'Pipeline' and type(pipeline).__module__ == 'sklearn.pipeline'
 
 
+# Parameters of the final estimator which can be increased by continuing a fitted model. Ensembles grown with
+# warm_start equal the ones fitted from scratch. Continuing the iterations of iterative models (max_iter, n_iter) with
+# warm_start or partial_fit doesn't reproduce a fit from scratch, so they are not continued.
+GROWING_PARAMETERS = ("n_estimators",)
+
+_TRANSFORMERS = "transformers"
+_ESTIMATORS = "estimators"
+
+
+class _FitCache:
+    """
+    Fitted state shared by the branches of a grid in a process. Entries are used least recently first. The cache
+    isn't pickled, so branches executed in other processes start with an empty cache.
+    """
+
+    def __init__(self, size=4):
+        self._size = size
+        self._lock = threading.Lock()
+        self._entries = {_TRANSFORMERS: OrderedDict(), _ESTIMATORS: OrderedDict()}
+
+    def get(self, kind, key):
+        with self._lock:
+            entries = self._entries[kind]
+            if key not in entries:
+                return None
+            entries.move_to_end(key)
+            return entries[key]
+
+    def put(self, kind, key, value):
+        with self._lock:
+            entries = self._entries[kind]
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self._size:
+                entries.popitem(last=False)
+
+    def __getstate__(self):
+        return {"size": self._size}
+
+    def __setstate__(self, state):
+        self.__init__(state["size"])
+
+
+def _key(*parts):
+    return json.dumps(parts, sort_keys=True, default=str)
+
+
 # def estimate(ctx, **kwargs):
 #     (component,) = unpack(ctx, "component")
 #     return component.estimate(ctx, **kwargs)
@@ -35,7 +89,14 @@ class SKLearnEstimator(ProvidedCodeHolderMixin, EstimatorComponentMixin, Paramet
     Workflows are used for abstracting from the underlying machine learning framework.
     """
 
-    def __init__(self, *, pipeline=None, parameter_provider=None, **kwargs):
+    def __init__(self, *, pipeline=None, parameter_provider=None, warm_start=False, **kwargs):
+        """
+        :param pipeline: The sklearn pipeline
+        :param parameter_provider: Provider of the parameter combinations
+        :param warm_start: Reuse fitted state between the combinations of a grid. Fitted upstream transformers are
+        reused if only parameters of the final estimator change. Ensembles supporting warm_start are continued if
+        only n_estimators grows. The grid is ordered to make use of this.
+        """
         # check for final component to determine final results
         # if step wise is true, log intermediate results. Otherwise, log only final results.
         # distingusish between training and fitting in classification.
@@ -46,6 +107,8 @@ class SKLearnEstimator(ProvidedCodeHolderMixin, EstimatorComponentMixin, Paramet
         if not pipeline or not is_sklearn_pipeline(pipeline):
             raise ValueError("SKLearnEstimator needs a delegate defined as sklearn.pipeline")
         self._pipeline = pipeline
+        self._warm_start = warm_start
+        self._fit_cache = _FitCache()
 
         super().__init__(name="SKLearnEstimator", fn=self.call, parameter_provider=parameter_provider, **kwargs)
 
@@ -53,7 +116,11 @@ class SKLearnEstimator(ProvidedCodeHolderMixin, EstimatorComponentMixin, Paramet
         (split, component, run, initial_hyperparameters) = unpack(ctx, "data", "component", "run",
                                                                   "initial_hyperparameters")
 
-        self.set_parameter_values(parameters=kwargs)
+        # Every branch of a grid fits its own copy of the pipeline. Branches may run in parallel and each training
+        # has to keep its own model.
+        from sklearn.base import clone
+        pipeline = clone(self._pipeline)
+        self.set_parameter_values(parameters=kwargs, pipeline=pipeline)
 
         self.send_start(message="Starting phase sklearn." + phases.fitting)
         y = None
@@ -63,11 +130,14 @@ class SKLearnEstimator(ProvidedCodeHolderMixin, EstimatorComponentMixin, Paramet
 
             # Create dummy target of zeros if target is not present.
             y = np.zeros(shape=(len(split.train_features, )))
-        self._pipeline.fit(split.train_features, y)
+        if self._warm_start:
+            self._fit_warm(pipeline, split, y, parameters=kwargs)
+        else:
+            pipeline.fit(split.train_features, y)
         self.send_stop(message='Stopping phase sklearn.' + phases.fitting)
         if self.is_scorer():
             self.send_start(message="Starting phase sklearn.scoring.trainset")
-            score = self._pipeline.score(split.train_features, y)
+            score = pipeline.score(split.train_features, y)
             self.send_stop(message="Stopping phase sklearn.scoring.trainset")
             # TODO use other signals?
             self.send_info(keys=['training score'], values=[score], message="Logging the training score")
@@ -75,10 +145,120 @@ class SKLearnEstimator(ProvidedCodeHolderMixin, EstimatorComponentMixin, Paramet
             if split.has_valset():
                 y = split.val_targets.reshape((len(split.val_targets),))
                 self.send_start(phase='sklearn.scoring.valset')
-                score = self._pipeline.score(split.val_features, y)
+                score = pipeline.score(split.val_features, y)
                 self.send_stop(phase='sklearn.scoring.valset')
                 self.send_info(keys=['validation score'], values=[score], message="Logging the validation score")
-        return Training(split=split, component=component, run=run, model=self._pipeline, parameters=kwargs,
+        return Training(split=split, component=component, run=run, model=pipeline, parameters=kwargs,
+                        initial_hyperparameters=initial_hyperparameters)
+
+    @property
+    def warm_start(self):
+        return self._warm_start
+
+    def _fit_warm(self, pipeline, split, y, parameters):
+        """
+        Fit the pipeline reusing the fitted state of previous combinations on the same split.
+        """
+        split_key = split.fingerprint() if hasattr(split, "fingerprint") else None
+        if split_key is None:
+            # Without an identity of the data nothing can be reused
+            pipeline.fit(split.train_features, y)
+            return
+
+        final_name = pipeline.steps[-1][0]
+        steps = {p: self._resolve_parameter(p, pipeline) for p in parameters}
+        upstream = {p: v for p, v in parameters.items() if steps[p][0] != final_name}
+        final = {steps[p][1]: v for p, v in parameters.items() if steps[p][0] == final_name}
+        upstream_key = _key(split_key, upstream)
+
+        x = split.train_features
+        if len(pipeline.steps) > 1:
+            cached = self._fit_cache.get(_TRANSFORMERS, upstream_key)
+            if cached is None:
+                fitted = []
+                for name, transformer in pipeline.steps[:-1]:
+                    if transformer is not None and transformer != "passthrough":
+                        x = transformer.fit_transform(x, y) if hasattr(transformer, "fit_transform") \
+                            else transformer.fit(x, y).transform(x)
+                    fitted.append((name, transformer))
+                cached = (fitted, x)
+                self._fit_cache.put(_TRANSFORMERS, upstream_key, cached)
+            fitted, x = cached
+            # Fitted transformers are only read from here on and shared by the pipelines of the branches
+            pipeline.steps = list(fitted) + [pipeline.steps[-1]]
+
+        estimator = pipeline.steps[-1][1]
+        growing = {name: value for name, value in final.items() if name in GROWING_PARAMETERS}
+        fixed_key = _key(upstream_key, {name: value for name, value in final.items() if name not in growing})
+        cached = self._fit_cache.get(_ESTIMATORS, fixed_key) if len(growing) > 0 else None
+        continued = self._continue(cached, estimator, growing, x, y) if cached is not None else None
+        if continued is None:
+            estimator.fit(x, y)
+        else:
+            estimator = continued
+            pipeline.steps[-1] = (final_name, estimator)
+        if len(growing) > 0:
+            self._fit_cache.put(_ESTIMATORS, fixed_key, (growing, estimator))
+
+    @staticmethod
+    def _continue(cached, estimator, growing, x, y):
+        """
+        Continue fitting a copy of a cached estimator up to the grown parameters.
+        :return: Fitted estimator or None if the cached estimator can't be continued
+        """
+        previous, fitted = cached
+        grown = [name for name in growing if growing[name] != previous.get(name)]
+        if len(grown) == 0:
+            return fitted
+        n_estimators, fitted_estimators = growing.get("n_estimators"), previous.get("n_estimators")
+        if len(grown) > 1 or not isinstance(n_estimators, int) or not isinstance(fitted_estimators, int) or \
+                n_estimators < fitted_estimators:
+            return None
+        params = estimator.get_params()
+        if "warm_start" not in params:
+            return None
+        # Ensembles add the missing members
+        continued = copy.deepcopy(fitted)
+        continued.set_params(warm_start=True, n_estimators=n_estimators)
+        continued.fit(x, y)
+        continued.set_params(warm_start=params["warm_start"])
+        return continued
+
+    def _order_combinations(self, combinations):
+        # Execute neighbouring combinations which can reuse fitted state after each other. The parameters of the
+        # final estimator vary faster than the ones of the transformers and growing parameters vary fastest.
+        if not self._warm_start or not isinstance(combinations, HyperParameterGrid) or \
+                isinstance(combinations, HyperParameterSearch) or not isinstance(combinations.result, ParameterGrid):
+            return combinations
+        names = combinations.parameter_names
+        final_name = self._pipeline.steps[-1][0]
+        steps = {name: self._resolve_parameter(name, self._pipeline) for name in names}
+
+        def rank(name):
+            step, path = steps[name]
+            return (step == final_name, step == final_name and path in GROWING_PARAMETERS, names.index(name))
+
+        combinations.reorder(sorted(names, key=rank),
+                             ascending=[name for name in names if steps[name][1] in GROWING_PARAMETERS])
+        return combinations
+
+    def _code_fingerprint(self):
+        # The estimator code is the same for all sklearn pipelines. Add the definition of the wrapped pipeline.
+        return super()._code_fingerprint() + str(sorted((key, str(value)) for key, value in
+                                                        self._pipeline.get_params(deep=True).items()))
+
+    def _to_memoized(self, results):
+        # Only the fitted pipeline is memoized. The training is rebuilt for the current run.
+        return results.model if isinstance(results, Training) else super()._to_memoized(results)
+
+    def _restore_memoized(self, memoized, *, data, run, predecessor=None, parameters=None,
+                          initial_hyperparameters=None, **kwargs):
+        if not is_sklearn_pipeline(memoized):
+            return super()._restore_memoized(memoized, data=data, run=run, predecessor=predecessor,
+                                             parameters=parameters, initial_hyperparameters=initial_hyperparameters,
+                                             **kwargs)
+        return Training(split=data, component=self, run=run, model=memoized,
+                        parameters=parameters if parameters is not None else {},
                         initial_hyperparameters=initial_hyperparameters)
 
     def configuration(self):
@@ -97,35 +277,44 @@ class SKLearnEstimator(ProvidedCodeHolderMixin, EstimatorComponentMixin, Paramet
     def pipeline(self):
         return self._pipeline
 
-    def set_parameter_values(self, parameters):
+    def set_parameter_values(self, parameters, pipeline=None):
+        if pipeline is None:
+            pipeline = self.pipeline
 
         for parameter in parameters:
-            # split_params[0] will be the name of the estimator
-            # split_params[1] will be the name of the parameter
-            split_params = parameter.split(sep='.')
-            estimator_name = split_params[0]
-            parameter_name = split_params[1]
-
-            estimator = self.pipeline.named_steps.get(estimator_name)
-            if estimator is None:
-                # Check if the estimator name is present int he alternate name mappings
-                estimator_name = self.find_estimator_name_in_mapping(estimator_name)
-                estimator = self.pipeline.named_steps.get(estimator_name)
-
-            # If the estimator is still not available throw an exception
-            assert (estimator is not None)
-
-            # The hyperparameters should be set to the variable which is available in the path of the
-            # hyperparameter name in the mappings file
-            parameter_path = parameter_name
-            if not hasattr(estimator, parameter_name):
-                # Check if the estimator has such a parameter and get its path
-                # Get the actual estimator name which would correspond to the mappings.json
-                parameter_path = self.get_parameter_path(estimator_name=estimator_name, parameter_name=parameter_name)
-
-            assert (parameter_name is not None)
-
-            estimator.set_params(**{parameter_path: parameters[parameter]})
+            estimator_name, parameter_path = self._resolve_parameter(parameter, pipeline)
+            pipeline.named_steps.get(estimator_name).set_params(**{parameter_path: parameters[parameter]})
+
+    def _resolve_parameter(self, parameter, pipeline):
+        """
+        Find the step and the path of a parameter given as "estimator.parameter".
+        :return: Tuple of the name of the step and the path of the parameter
+        """
+        # split_params[0] will be the name of the estimator
+        # split_params[1] will be the name of the parameter
+        split_params = parameter.split(sep='.')
+        estimator_name = split_params[0]
+        parameter_name = split_params[1]
+
+        estimator = pipeline.named_steps.get(estimator_name)
+        if estimator is None:
+            # Check if the estimator name is present int he alternate name mappings
+            estimator_name = self.find_estimator_name_in_mapping(estimator_name)
+            estimator = pipeline.named_steps.get(estimator_name)
+
+        # If the estimator is still not available throw an exception
+        assert (estimator is not None)
+
+        # The hyperparameters should be set to the variable which is available in the path of the
+        # hyperparameter name in the mappings file
+        parameter_path = parameter_name
+        if not hasattr(estimator, parameter_name):
+            # Check if the estimator has such a parameter and get its path
+            # Get the actual estimator name which would correspond to the mappings.json
+            parameter_path = self.get_parameter_path(estimator_name=estimator_name, parameter_name=parameter_name)
+
+        assert (parameter_name is not None)
+        return estimator_name, parameter_path
 
     def find_estimator_name_in_mapping(self, name):
         # This function is used to return the actual estimator name as specified in the mappings file
@@ -2,9 +2,11 @@ import numpy as np
 
 from pypadre.core.base import phases
 from pypadre.core.model.computation.evaluation import Evaluation
+from pypadre.core.model.computation.predictions import Predictions
 from pypadre.core.model.generic.custom_code import ProvidedCodeHolderMixin
 from pypadre.core.model.pipeline.components.component_mixins import EvaluatorComponentMixin, \
     ParameterizedPipelineComponentMixin
+from pypadre.core.model.split.indices import encode_indices
 from pypadre.core.ontology.padre_ontology import PaDREOntology
 from pypadre.core.util.utils import unpack
 from pypadre.core.visitors.mappings import name_mappings, alternate_name_mappings
@@ -42,8 +44,6 @@ class SKLearnEvaluator(ProvidedCodeHolderMixin, EvaluatorComponentMixin, Paramet
         self.send_error(message="Test set is missing.", condition=not split.has_testset())
 
         self.send_start(message="Starting phase sklearn." + phases.inferencing)
-        train_idx = train_idx.tolist()
-        test_idx = test_idx.tolist()
 
         y_predicted_probabilities = None
         y = split.test_targets.reshape((len(split.test_targets),))
@@ -82,7 +82,6 @@ class SKLearnEvaluator(ProvidedCodeHolderMixin, EvaluatorComponentMixin, Paramet
                 y_predicted_probabilities = model.predict_proba(split.test_features)
                 component.send_info(mode='probability', pred=y_predicted, truth=y, probabilities=y_predicted_probabilities,
                                message="Computing and saving the prediction probabilities")
-                y_predicted_probabilities = y_predicted_probabilities.tolist()
         else:
             type_ = PaDREOntology.SubClassesExperiment.Regression.value
 
@@ -94,7 +93,7 @@ class SKLearnEvaluator(ProvidedCodeHolderMixin, EvaluatorComponentMixin, Paramet
 
         results = component.create_results_dictionary(split_num=split.number, train_idx=train_idx, test_idx=test_idx,
                                                  dataset=split.dataset.name,
-                                                 truth=y.tolist(), predicted=y_predicted.tolist(), type_= type_,
+                                                 truth=y, predicted=y_predicted, type_= type_,
                                                  probabilities=y_predicted_probabilities)
 
 
@@ -116,35 +115,33 @@ class SKLearnEvaluator(ProvidedCodeHolderMixin, EvaluatorComponentMixin, Paramet
         return getattr(model, 'transform', None)
 
     @staticmethod
-    def create_results_dictionary(*, split_num: int, train_idx: list, test_idx: list, dataset: str, type_: str,
-                                  truth: list, predicted: list, probabilities: list):
+    def create_results_dictionary(*, split_num: int, train_idx, test_idx, dataset: str, type_: str,
+                                  truth, predicted, probabilities):
+        """
+        :param train_idx: Training indices. They are stored encoded (see pypadre.core.model.split.indices).
+        :param test_idx: Testing indices. They are stored encoded and index the predictions.
+        :param truth: Array of the truth values of the test rows
+        :param predicted: Array of the predicted values of the test rows
+        :param probabilities: Matrix of the predicted probabilities of the test rows or None
+        """
         from pypadre.core.model.pipeline.components.component_mixins import EvaluatorComponentMixin
         results = dict()
         results[DATASET_NAME] = dataset
         results[TRAINING_SAMPLES] = len(train_idx)
         results[TESTING_SAMPLES] = len(test_idx)
         results[SPLIT_NUM] = split_num
-        results[TRAINING_IDX] = train_idx
-        results[TESTING_IDX] = test_idx
+        results[TRAINING_IDX] = encode_indices(train_idx)
+        results[TESTING_IDX] = encode_indices(test_idx)
         results[TYPE] = type_
 
-        # Whether the probabilities of predictions should be written
-        write_probabilites = True
-        if probabilities is None or len(probabilities) != len(truth):
-            write_probabilites = False
-
-        # Predictions are a dictionary
-        predictions = dict()
-        for idx, test_row_index in enumerate(test_idx):
-            # Each prediction is a dictionary with the row id as the key. This key would point to the exact
-            # row that was tested
-            # The dictionary contains the truth value, the predicted value and if there are probabilities,
-            # the probabilities of the classes
-            curr_row_dict = dict()
-            curr_row_dict[EvaluatorComponentMixin.TRUTH] = truth[idx]
-            curr_row_dict[EvaluatorComponentMixin.PREDICTED] = predicted[idx]
-            curr_row_dict[EvaluatorComponentMixin.PROBABILITIES] = probabilities[idx] if write_probabilites is True else []
-            predictions[test_row_index] = curr_row_dict
+        # Probabilities are only written if there is one row of probabilities per prediction
+        if probabilities is not None and len(probabilities) != len(truth):
+            probabilities = None
+
+        # Predictions are stored column wise. They can still be accessed like a dictionary with the row id as the key,
+        # which points to the exact row that was tested, and a dictionary of the truth value, the predicted value and
+        # the probabilities of the classes as the value
+        predictions = Predictions(index=test_idx, truth=truth, predicted=predicted, probabilities=probabilities)
 
         # Add the predictions to the results dictionary
         results[EvaluatorComponentMixin.PREDICTIONS] = predictions
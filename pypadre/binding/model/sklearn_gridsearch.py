@@ -1,11 +1,10 @@
 from pypadre import _version, _name
 from pypadre.core.model.code.code_mixin import PythonPackage, PipIdentifier, Function
+from pypadre.core.model.computation.hyper_parameter_search import ParameterGrid
 from pypadre.core.model.pipeline.parameter_providers.parameters import ParameterProvider
 
 
 def _create_combinations(ctx, **parameters: dict):
-    import itertools
-
     # Generate every possible combination of the provided hyper parameters.
     master_list = []
     params_list = []
@@ -26,7 +25,7 @@ def _create_combinations(ctx, **parameters: dict):
             # Ordering of estimator.parameter corresponds to the value in the resultant grid tuple
             params_list.append(''.join([estimator, '.', params]))
 
-    grid = itertools.product(*master_list)
+    grid = ParameterGrid(params_list, master_list)
     return grid, params_list
 
 
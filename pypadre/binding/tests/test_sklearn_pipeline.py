@@ -3,6 +3,7 @@ import unittest
 
 # noinspection PyMethodMayBeStatic
 import numpy as np
+from sklearn.ensemble import RandomForestClassifier
 
 from pypadre.binding.model.sklearn_binding import SKLearnPipeline
 from pypadre.core.model.code.code_mixin import Function
@@ -51,6 +52,25 @@ def create_test_pipeline_multiple_estimators():
     return Pipeline(estimators)
 
 
+class _RecordingForest(RandomForestClassifier):
+    """ Forest recording the trees it built and the fitted forests. """
+    trees = 0
+    fits = []
+
+    def fit(self, X, y, sample_weight=None):
+        before = len(getattr(self, "estimators_", [])) if self.warm_start else 0
+        super().fit(X, y, sample_weight=sample_weight)
+        _RecordingForest.trees += len(self.estimators_) - before
+        _RecordingForest.fits.append((X, y, len(self.estimators_), self.predict_proba(X)))
+        return self
+
+
+def create_test_pipeline_recording_forest():
+    from sklearn.pipeline import Pipeline
+    from sklearn.decomposition.pca import PCA
+    return Pipeline([('PCA', PCA()), ('random forest classifier', _RecordingForest(random_state=0))])
+
+
 def find(name, path):
     for root, dirs, files in os.walk(path):
         if name in files:
@@ -372,6 +392,38 @@ class TestSKLearnPipeline(PadreAppTest):
             os.path.expanduser('~/.pypadre-test/projects/'))
         assert (project_name1 in files_found and project_name2 in files_found)
 
+    def test_warm_start(self):
+        from pypadre.core.model.project import Project
+        from pypadre.core.model.experiment import Experiment
+
+        self.app.datasets.load_defaults()
+        project = Project(name='Test Project Warm Start', description='Testing warm starts')
+        dataset = self.app.datasets.list({'name': '_iris_dataset'})
+        pipeline = SKLearnPipeline(pipeline_fn=create_test_pipeline_recording_forest, warm_start=True,
+                                   reference=self.test_reference)
+        experiment = Experiment(name='Test Experiment Warm Start', description='Test Experiment',
+                                dataset=dataset.pop(), project=project, pipeline=pipeline,
+                                reference=self.test_reference)
+        parameter_dict = {'random forest classifier': {'n_estimators': [20, 5, 10]}, 'PCA': {'n_components': [2, 3]}}
+        _RecordingForest.trees = 0
+        _RecordingForest.fits = []
+        experiment.execute(parameters={'SKLearnEstimator': {'parameters': parameter_dict}})
+
+        computations = self.app.computations.list()
+        assert (isinstance(computations, list))
+        assert (len(computations) > 0)
+
+        # The forests of every split and PCA are grown from 5 to 10 to 20 trees instead of fitting 35 trees
+        fits = _RecordingForest.fits
+        assert len(fits) > 0 and len(fits) % 3 == 0
+        assert sorted(set(n for _, _, n, _ in fits)) == [5, 10, 20]
+        assert _RecordingForest.trees == 20 * len(fits) // 3
+
+        # Grown forests equal the forests fitted from scratch
+        for x, y, n_estimators, probabilities in fits:
+            cold = RandomForestClassifier(random_state=0, n_estimators=n_estimators).fit(x, y)
+            assert np.allclose(cold.predict_proba(x), probabilities)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -12,6 +12,7 @@ from click_shell import shell
 from pypadre.cli.computation import computation_cli
 from pypadre.cli.execution import execution_cli
 from pypadre.cli.run import run_cli
+from pypadre.cli.worker import worker_cli
 from pypadre.pod.app import PadreConfig
 from pypadre.pod.app.padre_app import PadreAppFactory
 from .config import config_cli
@@ -112,6 +113,7 @@ pypadre.add_command(execution_cli.execution)
 pypadre.add_command(run_cli.run)
 pypadre.add_command(computation_cli.computation)
 pypadre.add_command(metric_cli.metric)
+pypadre.add_command(worker_cli.worker)
 
 
 if __name__ == '__main__':
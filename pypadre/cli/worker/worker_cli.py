@@ -0,0 +1,40 @@
+"""
+Command Line Interface for PADRE.
+
+"""
+import click
+
+from pypadre.core.model.pipeline.executors import execute_task
+from pypadre.pod.util.job_queue import JobQueue, Worker, DEFAULT_QUEUE
+
+
+#################################
+####### WORKER FUNCTIONS ########
+#################################
+
+
+@click.command(name="worker")
+@click.option('--queue', '-q', default=DEFAULT_QUEUE, type=click.Path(), help='Path of the job queue')
+@click.option('--name', '-n', default=None, help='Name of the worker. Defaults to host and process id')
+@click.option('--lease', default=60, help='Seconds until a task of a crashed worker is executed again')
+@click.option('--poll-interval', default=1.0, help='Seconds to wait if the queue is empty')
+@click.option('--max-tasks', default=None, type=click.INT, help='Stop after the given number of tasks')
+@click.option('--exit-when-empty', is_flag=True, help='Stop as soon as the queue is empty')
+@click.pass_context
+def worker(ctx, queue, name, lease, poll_interval, max_tasks, exit_when_empty):
+    """
+    Execute the tasks of experiments run with the queue executor. Results are written to the backends of the worker.
+    """
+    backends = ctx.obj["pypadre-app"].backends or []
+
+    def handle(payload):
+        result = execute_task(payload)
+        # The task only succeeded if its results are written
+        for backend in backends:
+            backend.flush(raise_errors=True)
+        return result
+
+    w = Worker(JobQueue(queue), handle, name=name, lease=lease, poll_interval=poll_interval)
+    click.echo("Worker " + w.name + " listens on " + queue)
+    executed = w.run(max_tasks=max_tasks, exit_when_empty=exit_when_empty)
+    click.echo("Worker " + w.name + " executed " + str(executed) + " tasks")
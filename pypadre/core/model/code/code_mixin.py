@@ -1,4 +1,6 @@
+import hashlib
 import importlib
+import inspect
 from _py_abc import ABCMeta
 from abc import abstractmethod
 from typing import Callable
@@ -208,6 +210,13 @@ class CodeMixin(StoreableMixin, MetadataMixin):
     def code_type(self):
         return self.metadata.get(self.CODE_TYPE)
 
+    def fingerprint(self):
+        """
+        Fingerprint of the executed code. The id identifies packages and files together with their version.
+        :return: Fingerprint
+        """
+        return str(self.id)
+
 
 # Code should be given by one of the following ways: A file (local, remote), a function to be persisted, a function
 # on the environment
@@ -306,6 +315,21 @@ class GenericCall(CodeMixin):
         return os.system(self._cmd)
 
 
+def _bytecode(code):
+    """
+    Bytecode of a code object and of the code objects nested in its constants.
+    :param code: Code object or None
+    :return: Bytes or None
+    """
+    if code is None:
+        return None
+    parts = [code.co_code]
+    for const in code.co_consts:
+        parts.append(_bytecode(const) if inspect.iscode(const) else repr(const).encode("utf-8"))
+    parts.append(repr(code.co_names).encode("utf-8"))
+    return b"|".join(parts)
+
+
 class Function(CodeMixin):
     """
     Simple function holder
@@ -336,6 +360,17 @@ class Function(CodeMixin):
     def _call(self, ctx, **kwargs):
         return self.fn(ctx, **kwargs)
 
+    def fingerprint(self):
+        # The id only holds the name of the function and the version of its repository. Changes of the function which
+        # aren't committed don't change it, so the source or the bytecode of the function is hashed instead.
+        try:
+            code = inspect.getsource(self.fn).encode("utf-8")
+        except (OSError, TypeError):
+            code = _bytecode(getattr(self.fn, "__code__", None))
+            if code is None:
+                return super().fingerprint()
+        return hashlib.sha256(code).hexdigest()
+
     def send_put(self, **kwargs):
         if not self._transient:
             super().send_put(**kwargs)
@@ -20,6 +20,7 @@ class Computation(StoreableMixin, ProgressableMixin, PlatformInfoMixin, Metadata
     RUN_ID = "run_id"
     PREDECESSOR_ID = "predecessor_computation_id"
     METRICS_IDS = "metrics_ids"
+    BRANCH_METRICS = "branch_metrics"
 
     @classmethod
     def _tablefy_register_columns(cls):
@@ -57,6 +58,8 @@ class Computation(StoreableMixin, ProgressableMixin, PlatformInfoMixin, Metadata
         self._parameters = parameters
         self._initial_hyperparameters = initial_hyperparameters
         self._branch = branch
+        self._resume_key = None
+        self._fingerprint = None
         super().__init__(parent=run, metadata=metadata, **kwargs)
 
 
@@ -102,6 +105,29 @@ class Computation(StoreableMixin, ProgressableMixin, PlatformInfoMixin, Metadata
     def branch(self):
         return self._branch
 
+    @property
+    def resume_key(self):
+        """
+        Key of the computation within its execution. This is derived from the component, the parameters and the
+        predecessor and therefore equal for the same computation in another run of the execution.
+        """
+        return self._resume_key
+
+    @resume_key.setter
+    def resume_key(self, resume_key):
+        self._resume_key = resume_key
+
+    @property
+    def fingerprint(self):
+        """
+        Fingerprint of the code, parameters and inputs the result was computed from. None if it is unknown.
+        """
+        return self._fingerprint
+
+    @fingerprint.setter
+    def fingerprint(self, fingerprint):
+        self._fingerprint = fingerprint
+
     @property
     def metrics(self):
         return self._metrics
@@ -1,5 +1,186 @@
+from abc import abstractmethod, ABCMeta
+from collections import namedtuple
+from numbers import Number
+
 from pypadre.core.model.computation.computation import Computation
 
+MAX = "max"
+MIN = "min"
+
+# Objectives tried if a search doesn't name one. Scores are nested in the results of the metrics.
+DEFAULT_OBJECTIVES = [("classification_metrics.accuracy", MAX), ("regression_metrics.mean_absolute_error", MIN)]
+
+# A combination proposed by a search. The budget is the fraction of the training rows to fit on.
+Trial = namedtuple("Trial", ["id", "parameters", "budget"])
+
+
+def average_metrics(results):
+    """
+    Merge the metrics of multiple branches (for example of the folds of a split). Numbers are averaged, nested dicts
+    are merged recursively and other values are taken from the last branch.
+    :param results: List of dicts of metric names and their results
+    :return: Merged dict
+    """
+    results = [r for r in results if isinstance(r, dict)]
+    merged = {}
+    for key in {key for r in results for key in r}:
+        values = [r[key] for r in results if key in r]
+        if all(isinstance(v, Number) and not isinstance(v, bool) for v in values):
+            merged[key] = sum(values) / len(values)
+        elif all(isinstance(v, dict) for v in values):
+            merged[key] = average_metrics(values)
+        else:
+            merged[key] = values[-1]
+    return merged
+
+
+class ParameterGrid:
+    """
+    Cartesian product of the values of named parameters which is never materialized. Combination k is decoded
+    directly from k as mixed radix number whose digits are the indices of the values. The last parameter varies
+    fastest, so the order equals the one of itertools.product. A grid only holds the names and value lists and can be
+    split into shards of index ranges, for example to distribute it to workers.
+    """
+
+    def __init__(self, parameter_names, values, start=0, stop=None):
+        """
+        :param parameter_names: Names of the parameters
+        :param values: List of the values of every parameter
+        :param start: First index of the shard
+        :param stop: Index after the last index of the shard. Defaults to the end of the product.
+        """
+        self._parameter_names = list(parameter_names)
+        self._values = [list(v) for v in values]
+        if len(self._parameter_names) != len(self._values):
+            raise ValueError("A grid needs a list of values for every parameter.")
+        size = 1
+        for v in self._values:
+            size *= len(v)
+        self._size = size
+        self._start = max(0, min(start, size))
+        self._stop = size if stop is None else max(self._start, min(stop, size))
+
+    @property
+    def parameter_names(self):
+        return list(self._parameter_names)
+
+    @property
+    def values(self):
+        return self._values
+
+    @property
+    def start(self):
+        return self._start
+
+    @property
+    def stop(self):
+        return self._stop
+
+    @property
+    def size(self):
+        """
+        :return: Number of combinations of the whole product
+        """
+        return self._size
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def decode(self, k):
+        """
+        :param k: Index of the combination in the whole product
+        :return: Tuple of the values
+        """
+        if k < 0 or k >= self._size:
+            raise IndexError("Combination " + str(k) + " is not in the grid of size " + str(self._size) + ".")
+        digits = []
+        for v in reversed(self._values):
+            k, digit = divmod(k, len(v))
+            digits.append(v[digit])
+        return tuple(reversed(digits))
+
+    def index(self, combination):
+        """
+        Inverse of decode.
+        :param combination: Tuple of the values
+        :return: Index of the combination in the whole product
+        """
+        k = 0
+        for v, value in zip(self._values, combination):
+            k = k * len(v) + v.index(value)
+        return k
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            start, stop, step = i.indices(len(self))
+            if step != 1:
+                raise ValueError("Grids can only be sliced into contiguous shards.")
+            return ParameterGrid(self._parameter_names, self._values, self._start + start, self._start + stop)
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError("Index " + str(i) + " is out of the shard of size " + str(len(self)) + ".")
+        return self.decode(self._start + i)
+
+    def __iter__(self):
+        for k in range(self._start, self._stop):
+            yield self.decode(k)
+
+    def shard(self, index, count):
+        """
+        Split the grid into count contiguous shards of almost equal size.
+        :param index: Index of the shard
+        :param count: Number of shards
+        :return: Grid of the shard
+        """
+        if index < 0 or index >= count:
+            raise IndexError("Shard " + str(index) + " doesn't exist in " + str(count) + " shards.")
+        size = len(self)
+        return self[index * size // count:(index + 1) * size // count]
+
+    def reorder(self, parameter_names, ascending=()):
+        """
+        Change the order in which the combinations are enumerated. The last parameter varies fastest.
+        :param parameter_names: Names of the parameters in the new order
+        :param ascending: Names of parameters whose values are enumerated in ascending order
+        :return: Grid over the same combinations
+        """
+        if len(self) != self._size:
+            raise ValueError("Shards of a grid can't be reordered.")
+        values = dict(zip(self._parameter_names, self._values))
+        reordered = []
+        for name in parameter_names:
+            v = values[name]
+            if name in ascending:
+                try:
+                    v = sorted(v)
+                except TypeError:
+                    # Values without an order are kept as they are
+                    pass
+            reordered.append(v)
+        return ParameterGrid(parameter_names, reordered)
+
+    def to_dict(self):
+        """
+        :return: Compact representation of the names and value lists
+        """
+        return {"parameter_names": self._parameter_names, "values": self._values, "start": self._start,
+                "stop": self._stop}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d["parameter_names"], d["values"], d.get("start", 0), d.get("stop", None))
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(state["parameter_names"], state["values"], state["start"], state["stop"])
+
+    def __repr__(self):
+        return "ParameterGrid(" + str(self._parameter_names) + ", [" + str(self._start) + ":" + str(self._stop) + \
+               "] of " + str(self._size) + ")"
+
 
 class HyperParameterGrid(Computation):
 
@@ -7,10 +188,157 @@ class HyperParameterGrid(Computation):
         super().__init__(component=component, run=run, result=result, **kwargs)
         self._parameter_names = kwargs.pop('parameter_names', None)
 
+    @property
+    def parameter_names(self):
+        return self._parameter_names
+
+    def __len__(self):
+        # Only index addressable grids know their size without being consumed
+        if not isinstance(self._result, ParameterGrid):
+            raise TypeError("The size of a lazily generated grid is unknown.")
+        return len(self._result)
+
+    def get(self, k):
+        """
+        :param k: Index of the combination
+        :return: Parameters of the combination
+        """
+        if not isinstance(self._result, ParameterGrid):
+            raise TypeError("Only index addressable grids support random access.")
+        return dict(zip(self._parameter_names, self._result[k]))
+
+    def shard(self, index, count):
+        """
+        Restrict the grid to a contiguous range of its combinations.
+        :param index: Index of the shard
+        :param count: Number of shards
+        :return: Grid of the shard
+        """
+        if not isinstance(self._result, ParameterGrid):
+            raise TypeError("Only index addressable grids can be sharded.")
+        return self._result.shard(index, count)
+
+    def reorder(self, parameter_names, ascending=()):
+        """
+        Change the order in which the branches are executed. See ParameterGrid.reorder.
+        """
+        if not isinstance(self._result, ParameterGrid):
+            raise TypeError("Only index addressable grids can be reordered.")
+        self._result = self._result.reorder(parameter_names, ascending)
+        self._parameter_names = list(parameter_names)
+
     def iter_result(self):
         for element in self._result:
-            execution_params = dict()
-            for param, idx in zip(self._parameter_names, range(0, len(self._parameter_names))):
-                execution_params[param] = element[idx]
+            yield dict(zip(self._parameter_names, element))
+
+
+class HyperParameterSearch(HyperParameterGrid):
+    """
+    Grid whose combinations are proposed depending on the results of the combinations executed before. The pipeline
+    asks the search for trials, executes them and reports the metrics of their branches back until the search
+    doesn't propose trials anymore.
+    """
+    __metaclass__ = ABCMeta
+
+    def __init__(self, *, component, run, candidates, objective=None, mode=None, **kwargs):
+        """
+        :param candidates: List of parameter dicts to search
+        :param objective: Path of the score in the metrics. For example "classification_metrics.f1_score"
+        :param mode: "max" or "min". Defaults to "max" for named objectives.
+        """
+        super().__init__(component=component, run=run, result=candidates, **kwargs)
+        self._candidates = candidates
+        self._objective = objective
+        self._mode = mode
+        self._history = []
+        self._trials = 0
 
-            yield execution_params
+    @property
+    def candidates(self):
+        return self._candidates
+
+    @property
+    def history(self):
+        """
+        :return: List of the observed trials and their scores
+        """
+        return list(self._history)
+
+    @property
+    def best_trial(self):
+        """
+        :return: Tuple of the trial with the best score at the largest budget and its score
+        """
+        scored = [(trial, score) for trial, score in self._history if score is not None]
+        if len(scored) == 0:
+            return None, None
+        trial, score = max(scored, key=lambda entry: (entry[0].budget, entry[1]))
+        return trial, self._sign * score
+
+    @property
+    def best(self):
+        """
+        :return: Tuple of the best parameters and their score
+        """
+        trial, score = self.best_trial
+        return (trial.parameters if trial is not None else None), score
+
+    @property
+    def _sign(self):
+        return -1 if self._mode == MIN else 1
+
+    def _trial(self, parameters, budget=1.0):
+        trial = Trial(self._trials, parameters, budget)
+        self._trials += 1
+        return trial
+
+    def score(self, metrics):
+        """
+        Extract the score to maximize from the metrics of a branch.
+        :param metrics: Dict of metric names and their results
+        :return: Score (negated for objectives to minimize) or None if the objective isn't found
+        """
+        objectives = [(self._objective, self._mode or MAX)] if self._objective is not None else DEFAULT_OBJECTIVES
+        for objective, mode in objectives:
+            value = metrics if isinstance(metrics, dict) else {}
+            for key in objective.split("."):
+                value = value.get(key, None) if isinstance(value, dict) else None
+            if isinstance(value, Number):
+                if self._mode is None:
+                    self._mode = mode
+                return self._sign * float(value)
+        return None
+
+    def observe(self, trial: Trial, metrics):
+        """
+        Report the metrics of an executed trial.
+        :param trial: Executed trial
+        :param metrics: Dict of metric names and their results
+        :return: Score of the trial
+        """
+        score = self.score(metrics)
+        self._history.append((trial, score))
+        self._observe(trial, score)
+        return score
+
+    def _observe(self, trial: Trial, score):
+        pass
+
+    @abstractmethod
+    def suggest(self, n=None):
+        """
+        Propose the next trials.
+        :param n: Number of trials which can be executed in parallel
+        :return: List of trials. An empty list while trials are running means to wait for their results. An empty
+        list after all trials were observed ends the search.
+        """
+        raise NotImplementedError()
+
+    def iter_result(self):
+        # Without feedback the budgets of the trials are ignored and all scores are unknown
+        trials = self.suggest()
+        while len(trials) > 0:
+            for trial in trials:
+                yield trial.parameters
+                self.observe(trial, None)
+            trials = self.suggest()
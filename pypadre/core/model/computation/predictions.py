@@ -0,0 +1,139 @@
+import io
+from collections.abc import Mapping
+
+import numpy as np
+
+TRUTH = "truth"
+PREDICTED = "predicted"
+PROBABILITIES = "probabilities"
+INDEX = "index"
+
+
+def _python(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class Predictions(Mapping):
+    """
+    Predictions of an evaluation stored column wise. The row indices, truth and predicted values are one dimensional
+    arrays and the probabilities a matrix with one column per class. Metrics work on the arrays directly.
+
+    For compatibility the predictions can still be used like the old dict mapping the row index to a dict of the
+    truth, the predicted value and the probabilities of the row. The rows are only built on access.
+    """
+
+    def __init__(self, index, truth, predicted, probabilities=None):
+        """
+        :param index: Row indices of the predicted rows in the dataset
+        :param truth: Truth values
+        :param predicted: Predicted values
+        :param probabilities: Matrix of the probabilities of the classes or None
+        """
+        self._index = np.asarray(index)
+        self._truth = np.asarray(truth).reshape(-1)
+        self._predicted = np.asarray(predicted).reshape(-1)
+        self._probabilities = None if probabilities is None else np.asarray(probabilities)
+        if not len(self._index) == len(self._truth) == len(self._predicted):
+            raise ValueError("Index, truth and predicted values need the same length.")
+        if self._probabilities is not None:
+            if len(self._probabilities) != len(self._index):
+                raise ValueError("Probabilities need a row for every prediction.")
+            self._probabilities = self._probabilities.reshape(len(self._index), -1)
+        self._positions = None
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def truth(self):
+        return self._truth
+
+    @property
+    def predicted(self):
+        return self._predicted
+
+    @property
+    def probabilities(self):
+        return self._probabilities
+
+    @classmethod
+    def from_dict(cls, predictions: dict):
+        """
+        Convert the old dict of the rows into columns.
+        :param predictions: Dict of the row index and a dict of truth, predicted value and probabilities
+        :return: Predictions
+        """
+        rows = list(predictions.values())
+        probabilities = [row.get(PROBABILITIES) for row in rows]
+        has_probabilities = len(rows) > 0 and all(p is not None and len(p) > 0 for p in probabilities)
+        return cls(index=[int(k) for k in predictions.keys()], truth=[row.get(TRUTH) for row in rows],
+                   predicted=[row.get(PREDICTED) for row in rows],
+                   probabilities=probabilities if has_probabilities else None)
+
+    def to_dict(self):
+        """
+        :return: The predictions in the old shape of a dict of the row index and a dict of the row
+        """
+        return {row: self[row] for row in self}
+
+    def _row(self, position):
+        return {TRUTH: _python(self._truth[position]), PREDICTED: _python(self._predicted[position]),
+                PROBABILITIES: self._probabilities[position].tolist() if self._probabilities is not None else []}
+
+    def __getitem__(self, row):
+        if self._positions is None:
+            self._positions = {r: position for position, r in enumerate(self._index.tolist())}
+        return self._row(self._positions[row])
+
+    def __iter__(self):
+        return iter(self._index.tolist())
+
+    def __len__(self):
+        return len(self._index)
+
+    def items(self):
+        # Rows are visited in order, which saves the lookup of their positions
+        return ((row, self._row(position)) for position, row in enumerate(self._index.tolist()))
+
+    def to_bytes(self):
+        """
+        :return: The columns in the binary npz format
+        """
+        columns = {INDEX: self._index, TRUTH: self._truth, PREDICTED: self._predicted}
+        if self._probabilities is not None:
+            columns[PROBABILITIES] = self._probabilities
+        buffer = io.BytesIO()
+        np.savez(buffer, **columns)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, buffer):
+        with np.load(io.BytesIO(buffer), allow_pickle=True) as columns:
+            return cls(index=columns[INDEX], truth=columns[TRUTH], predicted=columns[PREDICTED],
+                       probabilities=columns[PROBABILITIES] if PROBABILITIES in columns.files else None)
+
+    def __reduce__(self):
+        # Pickle the columns as one binary blob instead of the python objects
+        return Predictions.from_bytes, (self.to_bytes(),)
+
+    def __eq__(self, other):
+        if not isinstance(other, Predictions):
+            return super().__eq__(other)
+        return np.array_equal(self._index, other._index) and np.array_equal(self._truth, other._truth) and \
+            np.array_equal(self._predicted, other._predicted) and \
+            ((self._probabilities is None and other._probabilities is None) or
+             (self._probabilities is not None and other._probabilities is not None and
+              np.array_equal(self._probabilities, other._probabilities)))
+
+    __hash__ = None
+
+
+def as_predictions(predictions):
+    """
+    :param predictions: Predictions or the old dict of the rows
+    :return: Predictions
+    """
+    if predictions is None or isinstance(predictions, Predictions):
+        return predictions
+    return Predictions.from_dict(predictions)
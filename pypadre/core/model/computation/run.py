@@ -33,9 +33,12 @@ class Run(StoreableMixin, ValidateableExecutableMixin, MetadataMixin, ChildMixin
         metadata = {**defaults,
                     **{"id": uuid.uuid4().__str__() + "-" + str(persistent_hash(execution.id, algorithm=hashlib.md5)),
                        self.EXECUTION_ID: execution.id}, **kwargs.pop("metadata", {})}
+        self._resume = False
         super().__init__(model_clz=run_model, parent=execution, result=self, metadata=metadata, **kwargs)
 
-    def _execute_helper(self, *args, **kwargs):
+    def _execute_helper(self, *args, resume=False, **kwargs):
+        # In resume mode computations already completed by a previous run of the execution are skipped
+        self._resume = resume
 
         # Send signal
         self.send_put()
@@ -68,6 +71,10 @@ class Run(StoreableMixin, ValidateableExecutableMixin, MetadataMixin, ChildMixin
     def execution_id(self):
         return self.parent.id
 
+    @property
+    def resume(self):
+        return self._resume
+
     def separate_hyperparameters_and_component_parameters(self, parameters: dict):
 
         parameter_dict = dict()
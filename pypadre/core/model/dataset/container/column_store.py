@@ -0,0 +1,181 @@
+import json
+import os
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = "manifest.json"
+INDEX = "index.npy"
+
+
+class NpyLoader:
+    """
+    Picklable loader of a column stored as .npy file. Pickling a store with these loaders only transfers the paths, the
+    columns are memory mapped again by the receiving process.
+    """
+
+    def __init__(self, path, mmap_mode="r", allow_pickle=False):
+        self._path = path
+        self._mmap_mode = mmap_mode
+        self._allow_pickle = allow_pickle
+
+    @property
+    def path(self):
+        return self._path
+
+    def __call__(self):
+        if self._allow_pickle:
+            # Arrays of python objects can't be memory mapped
+            return np.load(self._path, allow_pickle=True)
+        return np.load(self._path, mmap_mode=self._mmap_mode)
+
+
+class ColumnStore:
+    """
+    Column wise view on a stored dataset binary. Every column is provided by its own loader function and is only loaded
+    on first access. This allows to keep columns memory mapped and to select rows and columns of the data without
+    materializing the whole binary.
+    """
+
+    def __init__(self, names: List, loaders: List[Callable], shape, bin_format, index: Callable = None):
+        """
+        :param names: Names of the columns
+        :param loaders: Function per column returning a one dimensional array for the column
+        :param shape: Shape of the stored data
+        :param bin_format: Format of the stored data (numpy or pandas)
+        :param index: Optional function returning the row index for pandas data
+        """
+        if len(names) != len(loaders):
+            raise ValueError("Got %d column names for %d columns." % (len(names), len(loaders)))
+        self._names = list(names)
+        self._loaders = list(loaders)
+        self._shape = tuple(shape)
+        self._format = bin_format
+        self._index = index
+        self._columns = {}
+
+    @property
+    def format(self):
+        return self._format
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def columns(self):
+        return pd.Index(self._names)
+
+    @property
+    def is_file_backed(self):
+        """
+        :return: True if all columns are read from files and the store can be pickled without its data
+        """
+        return all(isinstance(loader, NpyLoader) for loader in self._loaders)
+
+    def column(self, idx):
+        """
+        Get a single column. The column is loaded if it wasn't accessed yet.
+        :param idx: Position of the column
+        :return: One dimensional array
+        """
+        if idx not in self._columns:
+            self._columns[idx] = self._loaders[idx]()
+        return self._columns[idx]
+
+    def take(self, columns, rows=None):
+        """
+        Get a two dimensional array of the given columns. Only the given rows are read if rows are passed.
+        :param columns: Positions of the columns to take
+        :param rows: Row indices or mask to take. None for all rows.
+        :return: Array of shape (n_rows, n_columns)
+        """
+        if len(columns) == 0:
+            n_rows = self._shape[0] if rows is None else len(np.arange(self._shape[0])[rows])
+            return np.empty((n_rows, 0))
+        if rows is None:
+            return np.column_stack([self.column(c) for c in columns])
+        return np.column_stack([self.column(c)[rows] for c in columns])
+
+    def to_numpy(self):
+        return self.take(range(len(self._names)))
+
+    def to_pandas(self):
+        data = {name: self.column(i) for i, name in enumerate(self._names)}
+        return pd.DataFrame(data, index=self._index() if self._index is not None else None, columns=self._names)
+
+    def __getstate__(self):
+        # Loaded columns are not pickled. They are loaded (or memory mapped) again on access.
+        state = dict(self.__dict__)
+        state["_columns"] = {}
+        return state
+
+    @staticmethod
+    def can_write(data):
+        return (isinstance(data, np.ndarray) and data.ndim == 2) or isinstance(data, pd.DataFrame)
+
+    @staticmethod
+    def write(directory, data, bin_format):
+        """
+        Write two dimensional data column wise into the directory. Every column is stored as its own .npy file and
+        described in a small json manifest.
+        :param directory: Directory to write to
+        :param data: Two dimensional numpy array or pandas data frame
+        :param bin_format: Format of the data to restore on read
+        :return:
+        """
+        if not ColumnStore.can_write(data):
+            raise ValueError("Can't write data of type %s column wise." % type(data))
+
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        index = None
+        if isinstance(data, pd.DataFrame):
+            names = [name if isinstance(name, (str, int, float)) else str(name) for name in data.columns]
+            columns = [data.iloc[:, i].values for i in range(data.shape[1])]
+            if not data.index.equals(pd.RangeIndex(data.shape[0])):
+                index = INDEX
+                np.save(os.path.join(directory, INDEX), data.index.values, allow_pickle=True)
+        else:
+            names = list(range(data.shape[1]))
+            columns = [data[:, i] for i in range(data.shape[1])]
+
+        manifest = {"format": bin_format, "shape": list(data.shape), "index": index, "columns": []}
+        for i, (name, column) in enumerate(zip(names, columns)):
+            file_name = "column_" + str(i) + ".npy"
+            column = np.ascontiguousarray(column)
+            np.save(os.path.join(directory, file_name), column, allow_pickle=column.dtype.hasobject)
+            manifest["columns"].append({"name": name, "file": file_name, "dtype": str(column.dtype),
+                                        "object": column.dtype.hasobject})
+
+        with open(os.path.join(directory, MANIFEST), "w") as f:
+            f.write(json.dumps(manifest))
+
+    @staticmethod
+    def has_manifest(directory):
+        return os.path.exists(os.path.join(directory, MANIFEST))
+
+    @staticmethod
+    def read_manifest(directory):
+        with open(os.path.join(directory, MANIFEST), "r") as f:
+            return json.loads(f.read())
+
+    @staticmethod
+    def open(directory, mmap_mode="r"):
+        """
+        Open data written by write. Columns are only read on access.
+        :param directory: Directory to read from
+        :param mmap_mode: Memory map mode for numerical columns. None to read the columns into memory.
+        :return: ColumnStore serving the columns
+        """
+        manifest = ColumnStore.read_manifest(directory)
+        loaders = [NpyLoader(os.path.join(directory, c["file"]), mmap_mode=mmap_mode,
+                             allow_pickle=c.get("object", False)) for c in manifest["columns"]]
+        index = None
+        if manifest.get("index") is not None:
+            index = NpyLoader(os.path.join(directory, manifest.get("index")), allow_pickle=True)
+
+        return ColumnStore(names=[c["name"] for c in manifest["columns"]], loaders=loaders,
+                           shape=manifest["shape"], bin_format=manifest["format"], index=index)
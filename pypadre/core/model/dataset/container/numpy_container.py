@@ -8,17 +8,36 @@ from scipy import stats
 from pypadre.core.model.dataset import dataset
 from pypadre.core.model.dataset.attribute import Attribute
 from pypadre.core.model.dataset.container.base_container import IBaseContainer
+from pypadre.core.model.dataset.container.column_store import ColumnStore
 from pypadre.core.model.dataset.container.pandas_container import PandasContainer
 from pypadre.core.model.generic.i_model_mixins import LoggableMixin
 from pypadre.core.ontology.padre_ontology import PaDREOntology
 
 
+def _to_slice(columns):
+    """
+    Column selections with consecutive indices are converted to a slice. Slicing returns a view on the data instead of
+    copying it which also keeps memory mapped data on the disk.
+    :param columns: Column indices
+    :return: Slice or the given indices
+    """
+    if len(columns) > 0 and np.array_equal(columns, np.arange(columns[0], columns[0] + len(columns))):
+        return slice(int(columns[0]), int(columns[0]) + len(columns))
+    return columns
+
+
 class NumpyContainer(IBaseContainer, LoggableMixin):
 
     def __init__(self, data, attributes: List[Attribute]=None):
         super().__init__(dataset.formats.numpy, data, attributes)
         self._shape = data.shape
-        self._data = data
+        if isinstance(data, ColumnStore):
+            # Columns are only read if they are accessed
+            self._store = data
+            self._data = None
+        else:
+            self._store = None
+            self._data = data
         self._attributes = self.validate_attributes(attributes)
         self._targets_idx = np.array([idx for idx, a in enumerate(self._attributes) if a.defaultTargetAttribute])
         self._features_idx = np.array([idx for idx, a in enumerate(self._attributes) if not a.defaultTargetAttribute])
@@ -32,20 +51,56 @@ class NumpyContainer(IBaseContainer, LoggableMixin):
 
     @property
     def features(self):
-        if self._features_idx is None:
-            return self._data
-        else:
-            return self._data[:, self._features_idx]
+        return self.get_features()
 
     @property
     def targets(self):
+        return self.get_targets()
+
+    def get_features(self, rows=None):
+        """
+        Get the features of the data.
+        :param rows: Row indices to take. None for all rows.
+        :return: Feature matrix
+        """
+        if self._features_idx is None:
+            return self.data if rows is None else self.data[rows]
+        return self._take(self._features_idx, rows)
+
+    def get_targets(self, rows=None):
+        """
+        Get the targets of the data.
+        :param rows: Row indices to take. None for all rows.
+        :return: Target matrix
+        """
         if self._targets_idx is None:
             return None
-        else:
-            return self._data[:, self._targets_idx]
+        return self._take(self._targets_idx, rows)
+
+    def _take(self, columns, rows=None):
+        if self._data is None and self._store is not None:
+            return self._store.take(columns, rows)
+        selection = self._data[:, _to_slice(columns)]
+        return selection if rows is None else selection[rows]
+
+    def get_column(self, name):
+        """
+        Get a single column by its attribute name. Only this column is read for stored data.
+        :param name: Name of the attribute
+        :return: One dimensional array
+        """
+        names = [a.name for a in self._attributes]
+        if name not in names:
+            raise ValueError("No attribute with name %s." % str(name))
+        idx = names.index(name)
+        if self._data is None and self._store is not None:
+            return self._store.column(idx)
+        return self._data[:, idx]
 
     @property
     def data(self):
+        if self._data is None and self._store is not None:
+            self._data = self._store.to_numpy()
         return self._data
 
     @property
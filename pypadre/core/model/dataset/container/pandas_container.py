@@ -6,6 +6,7 @@ from scipy import stats
 from pypadre.core.model.dataset import dataset
 from pypadre.core.model.dataset.attribute import Attribute
 from pypadre.core.model.dataset.container.base_container import IBaseContainer
+from pypadre.core.model.dataset.container.column_store import ColumnStore
 from pypadre.core.model.generic.i_model_mixins import LoggableMixin
 from pypadre.core.ontology.padre_ontology import PaDREOntology
 
@@ -15,7 +16,13 @@ class PandasContainer(IBaseContainer, LoggableMixin):
     def __init__(self, data, attributes=None):
         super().__init__(dataset.formats.pandas, data, attributes)
         self._shape = data.shape
-        self._data = data
+        if isinstance(data, ColumnStore):
+            # Columns are only read if they are accessed
+            self._store = data
+            self._data = None
+        else:
+            self._store = None
+            self._data = data
         self._attributes = self.validate_attributes(attributes)
         self._targets_idx = np.array([idx for idx, a in enumerate(self._attributes) if a.defaultTargetAttribute])
         self._features_idx = np.array([idx for idx, a in enumerate(self._attributes) if not a.defaultTargetAttribute])
@@ -31,20 +38,41 @@ class PandasContainer(IBaseContainer, LoggableMixin):
 
     @property
     def features(self):
-        if self._attributes is None:
-            return self._data
-        else:
-            removekeys = []
-            for att in self._attributes:
-                if att.defaultTargetAttribute:
-                    removekeys.append(att.name)
-            return self._data.drop(removekeys,axis=1).values
+        return self.get_features()
 
     @property
     def targets(self):
+        return self.get_targets()
+
+    def get_features(self, rows=None):
+        """
+        Get the features of the data.
+        :param rows: Row indices to take. None for all rows.
+        :return: Feature matrix
+        """
+        if self._attributes is None:
+            return self.data if rows is None else self.data.iloc[rows]
+        if self._data is None and self._store is not None:
+            return self._store.take(self._features_idx, rows)
+        removekeys = []
+        for att in self._attributes:
+            if att.defaultTargetAttribute:
+                removekeys.append(att.name)
+        features = self._data.drop(removekeys, axis=1)
+        return (features if rows is None else features.iloc[rows]).values
+
+    def get_targets(self, rows=None):
+        """
+        Get the targets of the data.
+        :param rows: Row indices to take. None for all rows.
+        :return: Target matrix
+        """
         if self._targets_idx is None or len(self._targets_idx) == 0:
             return None
         else:
+            if self._data is None and self._store is not None:
+                return self._store.take(self._targets_idx, rows)
+
             targets=[]
             for col,att in enumerate(self._attributes):
                 if att.defaultTargetAttribute:
@@ -54,10 +82,27 @@ class PandasContainer(IBaseContainer, LoggableMixin):
             if len(targets) == 0:
                 return None
 
-            return self._data[targets].values
+            selection = self._data[targets]
+            return (selection if rows is None else selection.iloc[rows]).values
+
+    def get_column(self, name):
+        """
+        Get a single column by its attribute name. Only this column is read for stored data.
+        :param name: Name of the attribute
+        :return: One dimensional array
+        """
+        names = [a.name for a in self._attributes]
+        if name not in names:
+            raise ValueError("No attribute with name %s." % str(name))
+        idx = names.index(name)
+        if self._data is None and self._store is not None:
+            return self._store.column(idx)
+        return self._data.iloc[:, idx].values
 
     @property
     def data(self):
+        if self._data is None and self._store is not None:
+            self._data = self._store.to_pandas()
         return self._data
 
     @property
@@ -67,7 +112,7 @@ class PandasContainer(IBaseContainer, LoggableMixin):
 
     @property
     def num_attributes(self):
-        return self._data.shape[1]
+        return self._shape[1]
 
     def validate_attributes(self, attributes=None):
         # TODO look for validating the attributes properties with regards to the ontology
@@ -110,7 +155,7 @@ class PandasContainer(IBaseContainer, LoggableMixin):
     def describe(self):
         ret = {"n_att" : len(self._attributes),
                "n_target" : len([a for a in self._attributes if a.defaultTargetAttribute])}
-        shallow_cp=self._data
+        shallow_cp=self.data
         for col in shallow_cp:
             if isinstance(shallow_cp[col][0], str):
                 shallow_cp[col]=pd.factorize(shallow_cp[col])[0]
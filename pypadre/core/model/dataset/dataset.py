@@ -4,6 +4,10 @@ Module containing python classes for managing data sets
 - TODO allow group based management of binary files similar to hdF5
 
 """
+import atexit
+import os
+import shutil
+import tempfile
 from logging import warning
 from typing import Callable
 
@@ -14,12 +18,14 @@ from scipy.stats.stats import DescribeResult
 
 from pypadre.core.base import MetadataMixin
 from pypadre.core.model.dataset.container.base_container import IBaseContainer
+from pypadre.core.model.dataset.container.column_store import ColumnStore
 from pypadre.core.model.dataset.container.graph_container import GraphContainer
 from pypadre.core.model.dataset.container.numpy_container import NumpyContainer
 from pypadre.core.model.dataset.container.pandas_container import PandasContainer
 from pypadre.core.model.generic.i_storable_mixin import StoreableMixin
 from pypadre.core.ontology.padre_ontology import PaDREOntology
 from pypadre.core.printing.util.print_util import StringBuilder, get_default_table
+from pypadre.core.util.memoization import fingerprint_array
 from pypadre.core.util.utils import _Const
 from pypadre.core.validation.json_validation import make_model
 
@@ -38,6 +44,9 @@ dataset_model = make_model(schema_resource_name='dataset.json')
 
 class Dataset(StoreableMixin, MetadataMixin):
 
+    SHAPE = "shape"
+    FINGERPRINT = "fingerprint"
+
     @classmethod
     def _tablefy_register_columns(cls):
         # TODO make all fields tablefyable
@@ -64,9 +73,13 @@ class Dataset(StoreableMixin, MetadataMixin):
 
         self._binaries = dict()
         self._proxy_loaders = {}
+        # Dtypes of the columns of a stored binary which isn't loaded yet
+        self._dtypes = None
 
     def add_proxy_loader(self, fn: Callable):
-        self._proxy_loaders[fn.__hash__()] = lambda: self.set_data(data=fn())
+        # Proxy loaders load the stored binary, whose fingerprint is stored with the dataset
+        self._proxy_loaders[fn.__hash__()] = lambda: self.set_data(data=fn(),
+                                                                   fingerprint=self.metadata.get(self.FINGERPRINT))
 
     @property
     def type(self):
@@ -139,6 +152,14 @@ class Dataset(StoreableMixin, MetadataMixin):
         :return:
         """
         self._binaries[container.format] = container
+        # The fingerprint of the previous binary doesn't hold anymore
+        if self.metadata.get(self.FINGERPRINT, None) is not None:
+            self.metadata[self.FINGERPRINT] = None
+        try:
+            # Keep the shape in the metadata to answer size requests without loading the binary
+            self.metadata[self.SHAPE] = [int(s) for s in container.shape]
+        except (TypeError, ValueError):
+            pass
 
     def data(self, bin_format=None):
         """
@@ -154,20 +175,21 @@ class Dataset(StoreableMixin, MetadataMixin):
         else:
             pass
 
-    def set_data(self, data):
+    def set_data(self, data, fingerprint=None):
         """
         Set new data. Container type can be derived automatically.
         :param data: Data to set
+        :param fingerprint: Fingerprint of the data if it is already known
         :return:
         """
 
         if self.attributes is None or len(self.attributes) == 0:
             self.send_warn(message='Dataset has no attributes yet! Attempting to derive them from the binary using '
                                    'targets metadata if exits')
-            if isinstance(data, pd.DataFrame):
+            if isinstance(data, pd.DataFrame) or (isinstance(data, ColumnStore) and data.format == formats.pandas):
                 attributes = PandasContainer.derive_attributes(data, targets=self.metadata.get("targets", None))
                 container = PandasContainer(data, attributes)
-            elif isinstance(data, np.ndarray):
+            elif isinstance(data, np.ndarray) or isinstance(data, ColumnStore):
                 attributes = NumpyContainer.derive_attributes(data, targets=self.metadata.get("targets", None))
                 container = NumpyContainer(data, attributes)
             elif isinstance(data, nx.Graph):
@@ -177,9 +199,9 @@ class Dataset(StoreableMixin, MetadataMixin):
                 raise ValueError("Unknown data format. Type %s not known." % (type(data)))
             self.set_attributes(attributes)
         else:
-            if isinstance(data, pd.DataFrame):
+            if isinstance(data, pd.DataFrame) or (isinstance(data, ColumnStore) and data.format == formats.pandas):
                 container = PandasContainer(data, self.attributes)
-            elif isinstance(data, np.ndarray):
+            elif isinstance(data, np.ndarray) or isinstance(data, ColumnStore):
                 container = NumpyContainer(data, self.attributes)
             elif isinstance(data, nx.Graph):
                 container = GraphContainer(data, self.attributes)
@@ -188,6 +210,8 @@ class Dataset(StoreableMixin, MetadataMixin):
 
         # Add the binary
         self.add_container(container)
+        if fingerprint is not None:
+            self.metadata[self.FINGERPRINT] = fingerprint
 
     def __str__(self):
         return str(self.id) + "_" + str(self.name) + ": " + str(self.type)
@@ -197,24 +221,143 @@ class Dataset(StoreableMixin, MetadataMixin):
         """
         :return: (n_examples, n_attributes)
         """
+        if not self.has_container() and self.SHAPE in self.metadata:
+            # Don't load the binary if the shape is already known
+            return tuple(self.metadata[self.SHAPE])
         container: IBaseContainer = self.container(bin_format)
         if container:
             return container.shape
         else:
             return 0
 
-    def targets(self, bin_format=None):
+    def set_dtypes(self, dtypes):
+        """
+        Set the dtypes of the columns of the stored binary. They are used to estimate the memory of the dataset as long
+        as the binary isn't loaded.
+        :param dtypes: List of dtypes (or their names) per column
+        :return:
+        """
+        self._dtypes = [np.dtype(dtype) for dtype in dtypes] if dtypes is not None else None
+
+    def estimate_memory(self):
+        """
+        Estimate the memory of the dataset for caches. Datasets whose binary isn't loaded yet are estimated by their
+        shape and the dtypes of their stored columns, so they are accounted with the size they take once they are
+        loaded. Columns of unknown dtype are assumed to hold 64 bit floats.
+        :return: Estimated size in bytes or None if the dataset should be measured by its loaded binaries
+        """
+        if not self.has_container() and self.SHAPE in self.metadata:
+            shape = self.metadata[self.SHAPE]
+            dtypes = getattr(self, "_dtypes", None)
+            if dtypes is not None and len(shape) == 2 and len(dtypes) == shape[1]:
+                return int(shape[0]) * sum(dtype.itemsize for dtype in dtypes)
+            return int(np.prod(shape)) * np.dtype(np.float64).itemsize
+        return None
+
+    def targets(self, bin_format=None, rows=None):
+        """
+        Get the targets of the dataset.
+        :param bin_format: format
+        :param rows: Row indices to take. Containers supporting it only read the needed rows.
+        :return: Targets
+        """
+        container: IBaseContainer = self.container(bin_format)
+        if hasattr(container, "get_targets"):
+            return container.get_targets(rows=rows)
+        targets = container.targets
+        return targets if rows is None or targets is None else targets[rows]
+
+    def features(self, bin_format=None, rows=None):
+        """
+        Get the features of the dataset.
+        :param bin_format: format
+        :param rows: Row indices to take. Containers supporting it only read the needed rows.
+        :return: Features
+        """
         container: IBaseContainer = self.container(bin_format)
-        return container.targets
+        if hasattr(container, "get_features"):
+            return container.get_features(rows=rows)
+        features = container.features
+        return features if rows is None else features[rows]
 
-    def features(self, bin_format=None):
+    def column(self, name, bin_format=None):
+        """
+        Get a single column of the dataset. Containers supporting it only read the requested column.
+        :param name: Name of the attribute
+        :param bin_format: format
+        :return: One dimensional array of the column
+        """
         container: IBaseContainer = self.container(bin_format)
-        return container.features
+        if hasattr(container, "get_column"):
+            return container.get_column(name)
+        names = [a.name for a in self.attributes]
+        if name not in names:
+            raise ValueError("Dataset %s has no attribute %s." % (str(self.id), str(name)))
+        return np.asarray(self.data(bin_format))[:, names.index(name)]
 
     def describe(self, bin_format=None):
         container: IBaseContainer = self.container(bin_format)
         return container.describe()
 
+    def fingerprint(self):
+        """
+        Hash of the content of the dataset. The hash is kept in the metadata, so it is stored with the dataset and
+        datasets loaded from a repository don't have to load and hash their binary. It is only computed from the data
+        if it isn't known yet.
+        :return: Hex digest or None if the data can't be hashed
+        """
+        if self.metadata.get(self.FINGERPRINT, None) is None:
+            try:
+                self.metadata[self.FINGERPRINT] = fingerprint_array(np.asarray(self.features())) + \
+                                                  fingerprint_array(self.targets())
+            except (ValueError, TypeError, AttributeError):
+                return None
+        return self.metadata[self.FINGERPRINT]
+
+    def share(self, directory=None):
+        """
+        Store the binary column wise and replace it with a memory mapped view on the stored columns. Pickling the
+        dataset afterwards only transfers the paths of the columns, so worker processes can read the data without
+        getting a copy of it. Datasets already read from column wise storage are kept as they are.
+        :param directory: Directory to store the columns in. Defaults to a temporary directory in shared memory
+        (/dev/shm) if available, which is removed on exit. Columns already stored in the directory are reused.
+        :return: The dataset
+        """
+        container = self.container()
+        if container is None:
+            return self
+        store = getattr(container, "_store", None)
+        if store is not None and store.is_file_backed and getattr(container, "_data", None) is None:
+            return self
+        data = container.data
+        if not ColumnStore.can_write(data):
+            return self
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="padre-shared-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+            atexit.register(shutil.rmtree, directory, True)
+        if not ColumnStore.has_manifest(directory):
+            ColumnStore.write(directory, data, container.format)
+        self._binaries.pop(container.format, None)
+        self.set_data(ColumnStore.open(directory), fingerprint=self.metadata.get(self.FINGERPRINT))
+        return self
+
+    def __getstate__(self):
+        # Proxy loaders are closures over the repository. Load the data before pickling instead.
+        self._execute_proxy_loaders()
+        return dict(self.__dict__)
+
+    def describe_metadata(self):
+        """
+        Describe the dataset by its metadata only. This never loads the binary.
+        :return: Description dict
+        """
+        attributes = self.attributes if self.attributes is not None else []
+        ret = {"n_att": len(attributes),
+               "n_target": len([a for a in attributes if a.get("defaultTargetAttribute", False)])}
+        if self.SHAPE in self.metadata:
+            ret[self.SHAPE] = tuple(self.metadata[self.SHAPE])
+        return ret
+
     def profile(self, bin_format=None, bins=50, check_correlation=True, correlation_threshold=0.8,
                 correlation_overrides=None, check_recoded=False):
         # TODO check is wrong if the parameters for profiling aren't the same
@@ -288,7 +431,8 @@ class Dataset(StoreableMixin, MetadataMixin):
         for k, v in self.metadata.items():
             sb.append_line("\t%s=%s" % (k, str(v)))
         sb.append_line("Binary description:")
-        for k, v in self.describe().items():
+        # Only describe the binary if it is already loaded. Otherwise the metadata is used.
+        for k, v in (self.describe() if self.has_container() else self.describe_metadata()).items():
             # todo printing the statistics is not ideal. needs to be improved
             if k == "stats" and isinstance(v, DescribeResult):
                 if self.attributes is None:
@@ -75,9 +75,19 @@ class Experiment(CodeManagedMixin, StoreableMixin, ProgressableMixin, Validateab
     - keep_runs={True|False} if true, all rund data (i.e. scores) will be kept in memory.
                              If false, no split run data is not kept
     - n_runs = int  number of runs to conduct. todo: needs to be extended with hyperparameter search
+    - concurrency = dict configuring the execution of the branches of a parameter grid and of the folds of a split.
+                    For example {"executor": "thread", "max_workers": 8}. Executors are "serial" (default), "thread",
+                    "process" and "queue". The queue executor places the branches on a durable job queue
+                    ({"executor": "queue", "queue": "/shared/queue.sqlite", "max_attempts": 3}) which is processed
+                    by "pypadre worker" processes.
+    - memoize = True or dict configuring the cache of component results. For example
+                {"directory": "~/.pypadre/memoization", "max_bytes": 2147483648}. Components executed with the same
+                code, parameters and input data reuse the cached results across runs, executions and experiments.
+    - resume={True|False} passed to execute. Computations completed by a previous run of the same execution (same
+                          code, component, parameters and split) are skipped. The previous run doesn't have to be
+                          executed in resume mode itself.
 
     TODO:
-    - Queuing mode
     - Searching Hyperparameter Space
 
     """
@@ -85,6 +95,8 @@ class Experiment(CodeManagedMixin, StoreableMixin, ProgressableMixin, Validateab
     PROJECT_ID = "project_id"
     DATASET_ID = "dataset_id"
     SEED = "seed"
+    CONCURRENCY = "concurrency"
+    MEMOIZE = "memoize"
     NAME = "name"
     DESCRIPTION = "description"
     # variable to store the path of the source code which is used to run the experiment
@@ -94,7 +106,7 @@ class Experiment(CodeManagedMixin, StoreableMixin, ProgressableMixin, Validateab
     def __init__(self, *, name="Default experiment", description="Default experiment description",
                  project: Project = None, dataset: Dataset = None,
                  reference: Optional[Union[Type[CodeMixin], Callable]] = None, pipeline: Pipeline,
-                 executions=None, seed=None, **kwargs):
+                 executions=None, seed=None, concurrency: Optional[dict] = None, memoize=None, **kwargs):
         if executions is None:
             executions = []
 
@@ -104,11 +116,18 @@ class Experiment(CodeManagedMixin, StoreableMixin, ProgressableMixin, Validateab
         # Either get given path or look up the path of the calling file
 
         # Merge defaults
-        metadata = {**defaults, **kwargs.pop("metadata", {}), **{
+        metadata = kwargs.pop("metadata", {})
+        if concurrency is None:
+            concurrency = metadata.get(self.CONCURRENCY, None)
+        if memoize is None:
+            memoize = metadata.get(self.MEMOIZE, None)
+        metadata = {**defaults, **metadata, **{
             "id": name + "-" + str(persistent_hash(project.id, algorithm=hashlib.md5)),
             self.PROJECT_ID: project.id if project is not None else None,
             self.DATASET_ID: dataset.id if dataset is not None else None,
             self.SEED: seed if seed else random.randint(1, int(1e9)),
+            self.CONCURRENCY: concurrency,
+            self.MEMOIZE: memoize,
             self.NAME: name,
             self.DESCRIPTION: description
         }}
@@ -140,6 +159,14 @@ class Experiment(CodeManagedMixin, StoreableMixin, ProgressableMixin, Validateab
     def seed(self):
         return self.metadata[self.SEED]
 
+    @property
+    def concurrency(self):
+        return self.metadata.get(self.CONCURRENCY, None)
+
+    @property
+    def memoize(self):
+        return self.metadata.get(self.MEMOIZE, None)
+
     def _execute_helper(self, *args, **kwargs):
 
         set_seeds(self.seed)
@@ -0,0 +1,68 @@
+"""
+State of the branch executed by the current thread. Branches executed by a pool don't send their puts directly. The
+puts are collected per branch and sent by the executor once the branch is merged. The state lives in the core layer,
+so storable objects can check it without depending on the executors of the pipeline.
+"""
+import threading
+from contextlib import contextmanager
+
+_branch = threading.local()
+
+
+def in_branch():
+    """
+    :return: True if the current thread executes a branch of a pool or a task of a queue
+    """
+    return getattr(_branch, "puts", None) is not None or getattr(_branch, "task", False)
+
+
+@contextmanager
+def deferred_puts():
+    """
+    Collect all puts sent by the current thread within the context instead of sending them.
+    :return: List of (object, kwargs) tuples of the collected puts
+    """
+    previous = getattr(_branch, "puts", None)
+    _branch.puts = []
+    try:
+        yield _branch.puts
+    finally:
+        _branch.puts = previous
+
+
+@contextmanager
+def executing_task():
+    """
+    Mark the current thread as executing a task of a queue within the context. Puts of tasks are sent directly.
+    :return:
+    """
+    previous = getattr(_branch, "task", False)
+    _branch.task = True
+    try:
+        yield
+    finally:
+        _branch.task = previous
+
+
+def defer_put(obj, kwargs):
+    """
+    Collect a put if the current thread executes a branch.
+    :param obj: Object to put
+    :param kwargs: Arguments of the put
+    :return: True if the put was collected and must not be sent
+    """
+    puts = getattr(_branch, "puts", None)
+    if puts is None:
+        return False
+    puts.append((obj, kwargs))
+    return True
+
+
+def send_puts(puts):
+    """
+    Send the collected puts of a branch.
+    :param puts: List of (object, kwargs) tuples
+    :return:
+    """
+    for obj, kwargs in puts:
+        obj.send_put(**kwargs)
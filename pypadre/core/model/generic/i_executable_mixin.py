@@ -26,9 +26,11 @@ class ExecuteableMixin(Signaler):
         if not self.is_executable():
             raise ValueError(str(self) + " is not executable.")
         self.send_start()
-        execute = self._execute_helper(*args, **kwargs)
-        self.send_stop()
-        return execute
+        try:
+            return self._execute_helper(*args, **kwargs)
+        finally:
+            # Stop is also sent on failures to let listeners close what they opened on start
+            self.send_stop()
 
     # noinspection PyMethodMayBeStatic
     def is_executable(self, *args, **kwargs):
@@ -2,6 +2,7 @@ from abc import ABCMeta, abstractmethod
 
 from pypadre.core.base import MetadataMixin
 from pypadre.core.events.events import signals, CommonSignals, Signaler
+from pypadre.core.model.generic.branch_state import defer_put
 
 
 @signals(CommonSignals.PUT, CommonSignals.DELETE, CommonSignals.GET)
@@ -10,6 +11,7 @@ class StoreableMixin(MetadataMixin, Signaler):
     __metaclass__ = ABCMeta
 
     RETURN_VAL = "return_val"
+    HASH = "hash"
 
     @abstractmethod
     def __init__(self, *args, metadata=None, **kwargs):
@@ -32,6 +34,9 @@ class StoreableMixin(MetadataMixin, Signaler):
                            + str(in_hash) + ".")
 
     def send_put(self, **kwargs):
+        if defer_put(self, kwargs):
+            # Sent in order by the executor when the branch is merged
+            return
         self.send_signal(CommonSignals.PUT, self, message="Putting object {name}".format(name=self.name), **kwargs)
 
     def send_delete(self, **kwargs):
@@ -43,6 +48,15 @@ class StoreableMixin(MetadataMixin, Signaler):
         cls.send_cls_signal(CommonSignals.GET, *sender, **{**callback, **kwargs})
         return callback.get(cls.RETURN_VAL, {cls.RETURN_VAL: None})
 
+    @classmethod
+    def send_get_metadata(cls, *sender, hash=None, **kwargs):
+        """
+        Get the metadata of a stored object with the given hash without loading the object.
+        :param hash: Hash of the object
+        :return: Metadata of the object or None if no object with the hash exists
+        """
+        return cls.send_get(*sender, hash=hash, metadata=True, **kwargs)[cls.RETURN_VAL]
+
     # @property
     # def __hash(self):
     #     if self.HASH in self.metadata:
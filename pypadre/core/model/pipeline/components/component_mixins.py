@@ -1,6 +1,8 @@
 # https://stackoverflow.com/questions/33533148/how-do-i-specify-that-the-return-type-of-a-method-is-the-same-as-the-class-itsel
 from __future__ import annotations
 
+import hashlib
+import json
 from abc import ABCMeta, abstractmethod
 from typing import Optional, Iterable, List
 
@@ -12,6 +14,7 @@ from pypadre.core.model.generic.i_executable_mixin import ValidateableExecutable
 from pypadre.core.model.pipeline.components.component_interfaces import IConsumer, IProvider
 from pypadre.core.model.pipeline.parameter_providers.gridsearch import default_parameter_provider
 from pypadre.core.model.pipeline.parameter_providers.parameters import ParameterProviderMixin, ParameterMap
+from pypadre.core.util.memoization import make_cache
 from pypadre.core.util.utils import persistent_hash
 from pypadre.core.validation.validation import ValidateParameters
 
@@ -41,12 +44,30 @@ class PipelineComponentMixin(CodeManagedMixin, CustomCodeHolder, IConsumer, IPro
     def _execute_helper(self, *, run: Run, data,
                         predecessor: Computation = None, branch=False, intermediate_results=True, store_results=False, **kwargs):
 
-        # TODO find the problem in the loop
-        results = self._execute_component_code(data=data, run=run, predecessor=predecessor, **kwargs)
+        # Memoization is opt in per experiment. Branching results are generators and can't be memoized.
+        cache = make_cache(getattr(run.experiment, "memoize", None)) if run is not None and not branch else None
+        fingerprint = self._fingerprint(data=data, predecessor=predecessor,
+                                        parameters=kwargs.get("parameters", {})) if cache is not None else None
+        if fingerprint is None:
+            cache = None
+
+        hit, results = cache.get(fingerprint) if cache is not None else (False, None)
+        if hit:
+            self.send_info(message="Reusing memoized result of " + self.name + ".")
+            results = self._restore_memoized(results, data=data, run=run, predecessor=predecessor, **kwargs)
+        else:
+            # TODO find the problem in the loop
+            results = self._execute_component_code(data=data, run=run, predecessor=predecessor, **kwargs)
+            if cache is not None:
+                memoized = self._to_memoized(results)
+                if memoized is not None:
+                    cache.put(fingerprint, memoized)
+
         if not isinstance(results, Computation):
             results = Computation(component=self, run=run, predecessor=predecessor,
                                   branch=branch, result=results, parameters=kwargs.get("parameters", {}),
                                   initial_hyperparameters=kwargs.get('initial_hyperparameters', {}))
+        results.fingerprint = fingerprint
 
         if intermediate_results:
             results.send_put(store_results=store_results)
@@ -56,6 +77,52 @@ class PipelineComponentMixin(CodeManagedMixin, CustomCodeHolder, IConsumer, IPro
     def _execute_component_code(self, **kwargs):
         return self.code.call(component=self, **kwargs)
 
+    def _code_fingerprint(self):
+        """
+        Fingerprint of the code of the component. The id of a component is derived from its name, code and the
+        version of the referenced code. The code adds the fingerprint of its source for functions.
+        """
+        code = getattr(self, "code", None)
+        if code is None or not hasattr(code, "fingerprint"):
+            return str(self.id)
+        return str(self.id) + ":" + code.fingerprint()
+
+    def _fingerprint(self, *, data, predecessor: Computation = None, parameters=None):
+        """
+        Fingerprint of an execution of the component. This combines the code, the parameters and the inputs. Data
+        which can't be hashed itself is identified by the fingerprint of the computation it was derived from.
+        :return: Fingerprint or None if the inputs can't be identified
+        """
+        if hasattr(data, "fingerprint") and callable(data.fingerprint):
+            data_fingerprint = data.fingerprint()
+        elif data is None:
+            data_fingerprint = "none"
+        else:
+            data_fingerprint = predecessor.fingerprint if predecessor is not None else None
+        if data_fingerprint is None:
+            return None
+        return hashlib.sha256("|".join([self._code_fingerprint(), data_fingerprint,
+                                        json.dumps(parameters, sort_keys=True, default=str)])
+                              .encode("utf-8")).hexdigest()
+
+    def _to_memoized(self, results):
+        """
+        Extract the part of the results to memoize. Computations hold references to their run and are not memoized
+        by default. Components returning computations can memoize their payload instead.
+        :param results: Results of the component code
+        :return: Object to memoize or None
+        """
+        return None if isinstance(results, Computation) else results
+
+    def _restore_memoized(self, memoized, **kwargs):
+        """
+        Rebuild the results of the component code from a memoized object.
+        :param memoized: Memoized object
+        :param kwargs: Arguments of the execution
+        :return: Results
+        """
+        return memoized
+
 
 class ParameterizedPipelineComponentMixin(PipelineComponentMixin, ValidateParameters):
     """
@@ -90,9 +157,20 @@ class ParameterizedPipelineComponentMixin(PipelineComponentMixin, ValidateParame
     def combinations(self, *, run, predecessor, parameter_map: ParameterMap):
         combinations = self._parameter_provider.execute(run=run, component=self,
                                                              predecessor=predecessor, parameter_map=parameter_map)
+        combinations = self._order_combinations(combinations)
+        # Only the metadata is stored. Index addressable grids are stored by their value lists and generators are
+        # never consumed by the put.
         combinations.send_put()
         return combinations
 
+    def _order_combinations(self, combinations):
+        """
+        Hook to change the order in which the branches of the combinations are executed.
+        :param combinations: Computation of the parameter provider
+        :return: Computation to branch over
+        """
+        return combinations
+
 
 class SplitComponentMixin(PipelineComponentMixin):
     """ This component is used to generate splits from a dataset. """
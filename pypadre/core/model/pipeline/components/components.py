@@ -55,10 +55,10 @@ def custom_splitting_wrapper(fn: Callable):
     """
 
     def custom_split(ctx, **kwargs):
-        num = -1
+        num = 0
         train_idx, test_idx, val_idx = fn(ctx, **kwargs)
         (data, run, component, predecessor) = unpack(ctx, "data", "run", "component", ("predecessor", None))
-        yield Split(run=run, num=++num, train_idx=train_idx, test_idx=test_idx,
+        yield Split(run=run, num=num, train_idx=train_idx, test_idx=test_idx,
                     val_idx=val_idx, component=component, predecessor=predecessor)
 
     return custom_split
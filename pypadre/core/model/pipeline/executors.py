@@ -0,0 +1,303 @@
+"""
+Executors used to fan out the branches of a parameter grid or the folds of a split. Branches executed by a pool don't send their puts
+directly. The puts are collected per branch and sent by the calling thread in the order of the grid, so stored
+computations, metrics and pipeline outputs don't depend on the order in which the branches finish.
+"""
+import os
+import pickle
+from abc import ABCMeta, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice, chain
+
+from pypadre.core.model.generic.branch_state import deferred_puts, executing_task, send_puts
+from pypadre.core.util import random as padre_random
+
+SERIAL = "serial"
+THREAD = "thread"
+PROCESS = "process"
+QUEUE = "queue"
+
+# Seconds the queue executor waits for a worker to claim one of its tasks
+DEFAULT_CLAIM_TIMEOUT = 300
+
+
+def _execute_branch(fn, item, seed=None):
+    if seed is not None:
+        padre_random.set_seeds(seed)
+    with deferred_puts() as puts:
+        result = fn(item)
+    return puts, result
+
+
+def execute_task(payload):
+    """
+    Execute a branch queued by the QueueExecutor. The puts of the branch are sent directly to the repositories of the
+    calling process.
+    :param payload: Pickled branch
+    :return: Pickled result of the branch
+    """
+    fn, item, seed = pickle.loads(payload)
+    if seed is not None:
+        padre_random.set_seeds(seed)
+    with executing_task():
+        return pickle.dumps(fn(item))
+
+
+class BranchExecutor:
+    """ Base class of the executors running the branches of a grid. """
+    __metaclass__ = ABCMeta
+
+    def __init__(self, max_workers=None):
+        self._max_workers = max_workers
+
+    @property
+    def max_workers(self):
+        return self._max_workers
+
+    @property
+    def parallelism(self):
+        """
+        :return: Number of branches executed at the same time
+        """
+        return self.max_workers or os.cpu_count() or 1
+
+    def prepare(self, run):
+        """
+        Prepare the data of a run before its branches are executed.
+        :param run: Run to execute
+        :return:
+        """
+        pass
+
+    @abstractmethod
+    def map(self, fn, items):
+        """
+        Execute fn for every item and send the puts of the branches in the order of the items.
+        :param fn: Function executing a branch
+        :param items: Items to branch over
+        :return: List of the results of fn in the order of the items
+        """
+        raise NotImplementedError()
+
+    def search(self, fn, suggest, observe):
+        """
+        Execute the trials of a search until it doesn't suggest trials anymore. The trials are executed in batches of
+        the suggested trials.
+        :param fn: Function executing a trial
+        :param suggest: Function taking the number of free branches and returning a list of trials
+        :param observe: Function taking a trial and its result
+        :return:
+        """
+        trials = suggest(self.parallelism)
+        while len(trials) > 0:
+            for trial, result in zip(trials, self.map(fn, trials)):
+                observe(trial, result)
+            trials = suggest(self.parallelism)
+
+
+class SerialExecutor(BranchExecutor):
+    """ Executes the branches one after another in the calling thread. Puts are sent directly. """
+
+    @property
+    def parallelism(self):
+        return 1
+
+    def map(self, fn, items):
+        return [fn(item) for item in items]
+
+
+class _PoolExecutor(BranchExecutor):
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def _pool(self):
+        raise NotImplementedError()
+
+    def _submit(self, pool, fn, item):
+        return pool.submit(_execute_branch, fn, item)
+
+    def map(self, fn, items):
+        items = iter(items)
+        first = list(islice(items, 2))
+        if len(first) <= 1:
+            # Nothing to fan out. Keep the pool for the branches further down.
+            return SerialExecutor().map(fn, first)
+        # Items are drawn lazily. Only a window of branches is submitted ahead, so lazily created grids start to fit
+        # right away and grids bounded by time stop drawing when the time is up.
+        window = 2 * (self.max_workers or os.cpu_count() or 1)
+        with self._pool() as pool:
+            futures = deque()
+            results = []
+
+            def collect():
+                puts, result = futures.popleft().result()
+                send_puts(puts)
+                results.append(result)
+
+            try:
+                for item in chain(first, items):
+                    futures.append(self._submit(pool, fn, item))
+                    if len(futures) >= window:
+                        collect()
+                while len(futures) > 0:
+                    collect()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+            return results
+
+    def search(self, fn, suggest, observe):
+        # Trials are observed as soon as they finish and the freed branches are filled with new suggestions. The puts
+        # of trials finishing together are sent in the order the trials were suggested in.
+        slots = self.parallelism
+        suggested = 0
+        with self._pool() as pool:
+            running = {}
+            try:
+                while True:
+                    if len(running) < slots:
+                        for trial in suggest(slots - len(running)):
+                            running[self._submit(pool, fn, trial)] = (suggested, trial)
+                            suggested += 1
+                    if len(running) == 0:
+                        # Nothing is running and the search doesn't suggest trials anymore
+                        return
+                    done, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+                    for future in sorted(done, key=lambda f: running[f][0]):
+                        _, trial = running.pop(future)
+                        puts, result = future.result()
+                        send_puts(puts)
+                        observe(trial, result)
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
+
+
+class ThreadExecutor(_PoolExecutor):
+    """ Executes the branches in a thread pool. This pays off for estimators releasing the GIL while fitting. """
+
+    def _pool(self):
+        return ThreadPoolExecutor(max_workers=self.max_workers)
+
+
+class ProcessExecutor(_PoolExecutor):
+    """
+    Executes the branches in a process pool. The pipeline, its components and the data have to be picklable. Every
+    branch starts with the seed of the experiment.
+    """
+
+    def __init__(self, max_workers=None, mp_context=None):
+        super().__init__(max_workers=max_workers)
+        self._mp_context = mp_context
+
+    def _pool(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._mp_context)
+
+    def prepare(self, run):
+        # Share the dataset memory mapped instead of pickling it for every branch
+        dataset = getattr(run, "dataset", None) if run is not None else None
+        if dataset is not None and hasattr(dataset, "share"):
+            dataset.share()
+
+    def _submit(self, pool, fn, item):
+        return pool.submit(_execute_branch, fn, item, padre_random.padre_seed)
+
+
+class QueueExecutor(BranchExecutor):
+    """
+    Places the branches as tasks on a durable job queue and waits until workers (see "pypadre worker") executed them.
+    Workers may run on other hosts sharing the file system of the queue and of the backend. They write the results of
+    the branches through their own repositories, so the order of the puts depends on the order the tasks finish in.
+    The pipeline, its components and the data have to be picklable and importable by the workers.
+    """
+
+    def __init__(self, max_workers=None, queue=None, max_attempts=3, poll_interval=1.0, timeout=None,
+                 claim_timeout=DEFAULT_CLAIM_TIMEOUT):
+        """
+        :param max_workers: Number of workers expected to serve the queue. Twice as many tasks are queued ahead.
+        Defaults to the number of cpus.
+        :param queue: Path of the queue
+        :param max_attempts: Number of times a task is executed before it fails
+        :param poll_interval: Seconds between polls of the task states
+        :param timeout: Maximal seconds to wait for the tasks
+        :param claim_timeout: Maximal seconds to wait for a worker claiming a task. Fails fast if no worker runs.
+        """
+        super().__init__(max_workers=max_workers)
+        # Import here to not load the pod for the other executors
+        from pypadre.pod.util.job_queue import JobQueue, DEFAULT_QUEUE
+        self._queue = JobQueue(queue if queue is not None else DEFAULT_QUEUE)
+        self._max_attempts = max_attempts
+        self._poll_interval = poll_interval
+        self._timeout = timeout
+        self._claim_timeout = claim_timeout
+        self._group = None
+
+    @property
+    def queue(self):
+        return self._queue
+
+    def prepare(self, run):
+        self._group = getattr(run, "id", None)
+        # Workers on other hosts can't map /dev/shm. Share the dataset next to the queue instead.
+        dataset = getattr(run, "dataset", None) if run is not None else None
+        if dataset is not None and hasattr(dataset, "share"):
+            dataset.share(directory=os.path.join(os.path.dirname(self._queue.path), "shared", str(dataset.id)))
+
+    def map(self, fn, items):
+        # Items are pickled and queued lazily. Like for the pools only a window of tasks is queued ahead, so the payloads
+        # of a large grid aren't held in memory at once and no further tasks are queued after a task failed.
+        window = 2 * self.parallelism
+        items = iter(items)
+        ids = deque()
+        results = []
+        queued = 0
+        while True:
+            payloads = [pickle.dumps((fn, item, padre_random.padre_seed)) for item in islice(items, window - len(ids))]
+            if len(payloads) > 0:
+                ids.extend(self._queue.put_many(payloads, group=self._group, max_attempts=self._max_attempts))
+                queued += len(payloads)
+            if len(ids) == 0:
+                return results
+            uid = ids.popleft()
+            failed = self._wait([uid])
+            if len(failed) > 0:
+                # Let the queued tasks finish before reporting the failure
+                failed.update(self._wait(ids))
+                raise RuntimeError(str(len(failed)) + " of " + str(queued) + " tasks failed. First error: " +
+                                   str(next(iter(failed.values()))))
+            result = self._queue.results([uid]).get(uid, None)
+            results.append(pickle.loads(result) if result is not None else None)
+
+    def _wait(self, ids):
+        return self._queue.wait(ids, poll_interval=self._poll_interval, timeout=self._timeout,
+                                claim_timeout=self._claim_timeout)
+
+
+executors = {
+    SERIAL: SerialExecutor,
+    THREAD: ThreadExecutor,
+    PROCESS: ProcessExecutor,
+    QUEUE: QueueExecutor
+}
+
+
+def make_executor(concurrency=None):
+    """
+    Create the executor for a concurrency configuration like {"executor": "thread", "max_workers": 8}. All other
+    entries are passed to the executor, for example {"executor": "queue", "queue": "/shared/queue.sqlite"}.
+    :param concurrency: Dict of the configuration, name of the executor or an executor
+    :return: Executor
+    """
+    if concurrency is None:
+        return SerialExecutor()
+    if isinstance(concurrency, BranchExecutor):
+        return concurrency
+    if isinstance(concurrency, str):
+        concurrency = {"executor": concurrency}
+    name = concurrency.get("executor", SERIAL)
+    if name not in executors:
+        raise ValueError("Unknown executor " + str(name) + ". Known executors are " + str(list(executors.keys())))
+    return executors[name](**{key: value for key, value in concurrency.items() if key != "executor"})
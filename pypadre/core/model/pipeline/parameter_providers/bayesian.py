@@ -0,0 +1,122 @@
+import time
+
+import numpy as np
+
+from pypadre._package import PACKAGE_ID
+from pypadre.core.model.code.code_mixin import PythonPackage
+from pypadre.core.model.computation.hyper_parameter_search import HyperParameterSearch
+from pypadre.core.model.pipeline.parameter_providers.parameters import ParameterProviderMixin
+from pypadre.core.model.pipeline.parameter_providers.sampling import search_space
+from pypadre.core.util import random as padre_random
+from pypadre.core.util.sampling import SearchSpace, make_points, SOBOL, RANDOM, MAX_SOBOL_DIMENSIONS
+from pypadre.core.util.surrogate import proposers, GAUSSIAN_PROCESS, TREE_PARZEN
+
+
+class BayesianSearch(HyperParameterSearch):
+    """
+    Sequential model based search. The first trials are spread over the search space by a Sobol sequence. Afterwards
+    a surrogate model fitted on the scores of the metrics of the finished trials proposes the next trials. Trials
+    which were suggested but not yet observed are taken into account, so suggestions can be made for parallel
+    branches and while other trials are still running.
+    """
+
+    def __init__(self, *, space: SearchSpace, method=GAUSSIAN_PROCESS, n_trials=30, n_initial=None, time_limit=None,
+                 **kwargs):
+        """
+        :param space: Search space
+        :param method: "gaussian_process" or "tree_parzen"
+        :param n_trials: Maximal number of trials
+        :param n_initial: Number of trials before the model is used. Defaults to twice the dimensions (at least 5).
+        :param time_limit: Seconds after the first suggestion after which no further trials are suggested
+        """
+        super().__init__(candidates=[], **kwargs)
+        if method not in proposers:
+            raise ValueError("Unknown method " + str(method) + ". Known methods are " + str(list(proposers.keys())))
+        self._space = space
+        self._method = method
+        self._n_trials = n_trials
+        self._n_initial = min(n_trials, n_initial if n_initial is not None else max(5, 2 * space.dimensions))
+        self._time_limit = time_limit
+        self._random_state = np.random.RandomState(padre_random.padre_seed)
+        self._initial = make_points(SOBOL if space.dimensions <= MAX_SOBOL_DIMENSIONS else RANDOM, space.dimensions,
+                                    np.random.RandomState(padre_random.padre_seed))
+        self._points = {}
+        self._observed = {}
+        self._start = None
+
+    @property
+    def space(self):
+        return self._space
+
+    def suggest(self, n=None):
+        if self._start is None:
+            self._start = time.time()
+        elif self._time_limit is not None and time.time() - self._start > self._time_limit:
+            return []
+        n = min(n if n is not None else 1, self._n_trials - self._trials)
+        if n <= 0:
+            return []
+
+        points = [next(self._initial) for _ in range(min(n, max(0, self._n_initial - self._trials)))]
+        if len(points) < n:
+            points.extend(self._propose(n - len(points), pending=points))
+
+        trials = []
+        for point in points:
+            trial = self._trial(dict(zip(self._space.names, self._space.decode(point))))
+            self._points[trial.id] = point
+            trials.append(trial)
+        return trials
+
+    def _propose(self, n, pending):
+        scored = [(self._points[uid], score) for uid, score in self._observed.items() if score is not None]
+        if len(scored) < 2:
+            # Nothing to learn from yet
+            return [self._random_state.random_sample(self._space.dimensions) for _ in range(n)]
+        # Branches without a score are counted as the worst observations
+        worst = min(score for _, score in scored)
+        x = [self._points[uid] for uid in self._observed]
+        y = [score if score is not None else worst for score in self._observed.values()]
+        pending = list(pending) + [p for uid, p in self._points.items() if uid not in self._observed]
+        return proposers[self._method](x, y, n, self._random_state, pending=pending)
+
+    def _observe(self, trial, score):
+        if trial.id in self._points:
+            self._observed[trial.id] = score
+
+
+class BayesianParameterProvider(ParameterProviderMixin):
+    """
+    Parameter provider choosing the next combinations by a surrogate model of the scores of the finished branches.
+    Parameters can be given as distributions (see pypadre.core.util.sampling), lists of values or constants. Scores
+    are read from the metrics calculated for the branches.
+    """
+
+    def __init__(self, name=None, method=GAUSSIAN_PROCESS, n_trials=30, n_initial=None, time_limit=None,
+                 objective=None, mode=None, code=None, reference=None, **kwargs):
+        """
+        :param method: "gaussian_process" or "tree_parzen"
+        :param n_trials: Maximal number of trials
+        :param n_initial: Number of trials before the model is used
+        :param time_limit: Seconds after which no further trials are suggested
+        :param objective: Path of the score in the metrics. For example "classification_metrics.f1_score"
+        :param mode: "max" or "min"
+        :param code: Code creating the search space
+        """
+        if code is None:
+            code = search_space
+        if reference is None:
+            reference = PythonPackage(package=__name__, variable=method + "_search", repository_identifier=PACKAGE_ID)
+        self._search_options = {"method": method, "n_trials": n_trials, "n_initial": n_initial,
+                                "time_limit": time_limit, "objective": objective, "mode": mode}
+        super().__init__(name=name if name is not None else method + "_search", code=code, reference=reference,
+                         **kwargs)
+
+    def _make_result(self, *, grid, parameter_names, run, component, predecessor=None):
+        return BayesianSearch(component=component, run=run, parameters={}, space=grid,
+                              parameter_names=parameter_names, predecessor=predecessor, branch=True,
+                              **self._search_options)
+
+
+gaussian_process_search = BayesianParameterProvider(method=GAUSSIAN_PROCESS)
+tree_parzen_search = BayesianParameterProvider(method=TREE_PARZEN)
@@ -1,5 +1,6 @@
 from pypadre._package import PACKAGE_ID
 from pypadre.core.model.code.code_mixin import PythonPackage, Function
+from pypadre.core.model.computation.hyper_parameter_search import ParameterGrid
 from pypadre.core.model.pipeline.parameter_providers.parameters import ParameterProvider
 
 
@@ -7,11 +8,9 @@ def _create_combinations(ctx, **parameters: dict):
     """
     Creates all the possible combinations of hyper parameters passed
     :param parameters: Dictionary containing hyperparameter names and their possible values
-    :return: A list containing all the combinations and a list containing the hyperparameter names
+    :return: A lazily decoded grid of all the combinations and a list containing the hyperparameter names
     """
 
-    import itertools
-
     params_list = []
     master_list = []
 
@@ -29,8 +28,8 @@ def _create_combinations(ctx, **parameters: dict):
         # Ordering of estimator.parameter corresponds to the value in the resultant grid tuple
         params_list.append(parameter)
 
-    # Create the grid
-    grid = itertools.product(*master_list)
+    # Create the grid. Combinations are decoded by their index when they are needed.
+    grid = ParameterGrid(params_list, master_list)
     return grid, params_list
 
 
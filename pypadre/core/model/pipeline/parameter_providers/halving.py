@@ -0,0 +1,234 @@
+import math
+
+import numpy as np
+
+from pypadre._package import PACKAGE_ID
+from pypadre.core.model.code.code_mixin import PythonPackage
+from pypadre.core.model.computation.hyper_parameter_search import HyperParameterSearch
+from pypadre.core.model.pipeline.parameter_providers.gridsearch import grid_search
+from pypadre.core.model.pipeline.parameter_providers.parameters import ParameterProviderMixin
+from pypadre.core.util import random as padre_random
+
+SUCCESSIVE_HALVING = "successive_halving"
+HYPERBAND = "hyperband"
+ASHA = "asha"
+
+
+def _budgets(min_budget, max_budget, eta):
+    """
+    Budgets of the rungs of a halving search. Every rung has eta times the budget of the rung below.
+    """
+    budgets = []
+    budget = min_budget
+    while budget < max_budget * (1 - 1e-9):
+        budgets.append(budget)
+        budget *= eta
+    budgets.append(max_budget)
+    return budgets
+
+
+def _rank_key(score):
+    return score if score is not None else float("-inf")
+
+
+class _Bracket:
+    """
+    Synchronous successive halving over a set of configurations. All trials of a rung have to be observed before
+    the next rung is proposed.
+    """
+
+    def __init__(self, candidates, budgets, eta):
+        self._active = list(candidates)
+        self._budgets = budgets
+        self._eta = eta
+        self._rung = -1
+        self._trials = []
+        self._scores = {}
+
+    @property
+    def waiting(self):
+        """
+        :return: True if trials of the current rung weren't observed yet
+        """
+        return any(trial.id not in self._scores for trial in self._trials)
+
+    @property
+    def done(self):
+        return not self.waiting and (self._rung == len(self._budgets) - 1 or len(self._active) == 0)
+
+    def next_rung(self, make_trial):
+        if self.waiting or self.done:
+            return []
+        if self._rung >= 0:
+            ranked = sorted(self._trials, key=lambda t: _rank_key(self._scores.get(t.id, None)), reverse=True)
+            keep = max(1, len(ranked) // self._eta)
+            self._active = [t.parameters for t in ranked[:keep]]
+            # A single configuration left is directly evaluated on the full budget
+            self._rung = len(self._budgets) - 1 if keep == 1 else self._rung + 1
+        else:
+            self._rung = 0
+        self._trials = [make_trial(parameters, self._budgets[self._rung]) for parameters in self._active]
+        return list(self._trials)
+
+    def observe(self, trial, score):
+        self._scores[trial.id] = score
+
+
+class SuccessiveHalving(HyperParameterSearch):
+    """
+    Successive halving evaluates all configurations on a small budget, keeps the best 1/eta of them and evaluates
+    these again with eta times the budget until the full budget is reached.
+    """
+
+    def __init__(self, *, candidates, eta=3, min_budget=None, max_budget=1.0, **kwargs):
+        super().__init__(candidates=candidates, **kwargs)
+        if min_budget is None:
+            # Start with a budget at which a single configuration is left for the full budget
+            rungs = int(math.floor(math.log(max(len(candidates), 1), eta) + 1e-9))
+            min_budget = max_budget / eta ** rungs
+        self._bracket = _Bracket(candidates, _budgets(min_budget, max_budget, eta), eta)
+
+    def suggest(self, n=None):
+        return self._bracket.next_rung(self._trial)
+
+    def _observe(self, trial, score):
+        self._bracket.observe(trial, score)
+
+
+class Hyperband(HyperParameterSearch):
+    """
+    Hyperband runs successive halving in multiple brackets. Brackets trade the number of configurations against the
+    budget they start with, from many configurations on the smallest budget to few configurations on the full budget.
+    A bracket is started while the brackets before it wait for the results of their rungs.
+    The configurations of a bracket are drawn from the candidates with the seed of the experiment.
+    """
+
+    def __init__(self, *, candidates, eta=3, min_budget=None, max_budget=1.0, **kwargs):
+        super().__init__(candidates=candidates, **kwargs)
+        if min_budget is None:
+            min_budget = max_budget / eta ** 2
+        s_max = int(math.floor(math.log(max_budget / min_budget, eta) + 1e-9))
+        random_state = np.random.RandomState(padre_random.padre_seed)
+        self._brackets = []
+        for s in range(s_max, -1, -1):
+            n = min(len(candidates), int(math.ceil((s_max + 1) / (s + 1) * eta ** s)))
+            chosen = [candidates[i] for i in random_state.permutation(len(candidates))[:n]]
+            self._brackets.append(_Bracket(chosen, _budgets(max_budget / eta ** s, max_budget, eta), eta))
+        self._current = 0
+        self._bracket_of = {}
+
+    def suggest(self, n=None):
+        # Brackets are independent. While a bracket waits for the results of its rung the next one can be started.
+        while self._current < len(self._brackets) and self._brackets[self._current].done:
+            self._current += 1
+        for index in range(self._current, len(self._brackets)):
+            trials = self._brackets[index].next_rung(self._trial)
+            if len(trials) > 0:
+                for trial in trials:
+                    self._bracket_of[trial.id] = index
+                return trials
+        return []
+
+    def _observe(self, trial, score):
+        self._brackets[self._bracket_of.get(trial.id, self._current)].observe(trial, score)
+
+
+class AsynchronousHalving(HyperParameterSearch):
+    """
+    Asynchronous successive halving (ASHA) doesn't wait for complete rungs. Whenever a branch is free a configuration
+    is promoted to the next rung if it is in the best 1/eta of the configurations observed on its rung. Otherwise a new
+    configuration is started on the smallest budget. This keeps parallel executors busy. Thread and process executors
+    report every trial as soon as it finished, the queue executor reports the trials in batches.
+    """
+
+    def __init__(self, *, candidates, eta=3, min_budget=None, max_budget=1.0, max_trials=None, **kwargs):
+        super().__init__(candidates=candidates, **kwargs)
+        if min_budget is None:
+            min_budget = max_budget / eta ** 2
+        self._eta = eta
+        self._budgets = _budgets(min_budget, max_budget, eta)
+        self._max_trials = max_trials
+        self._order = list(np.random.RandomState(padre_random.padre_seed).permutation(len(candidates)))
+        self._next = 0
+        self._rung_of = {}
+        self._rungs = [dict() for _ in self._budgets]
+        self._promoted = [set() for _ in self._budgets]
+
+    def _promotion(self):
+        for rung in range(len(self._budgets) - 2, -1, -1):
+            observed = sorted(self._rungs[rung].items(), key=lambda entry: _rank_key(entry[1][1]), reverse=True)
+            for uid, (parameters, score) in observed[:len(observed) // self._eta]:
+                if uid not in self._promoted[rung]:
+                    self._promoted[rung].add(uid)
+                    return self._trial(parameters, self._budgets[rung + 1]), rung + 1
+        return None
+
+    def suggest(self, n=None):
+        trials = []
+        for _ in range(n if n is not None else 1):
+            if self._max_trials is not None and self._trials >= self._max_trials:
+                break
+            promotion = self._promotion()
+            if promotion is not None:
+                trial, rung = promotion
+            elif self._next < len(self._order):
+                trial, rung = self._trial(self._candidates[self._order[self._next]], self._budgets[0]), 0
+                self._next += 1
+            else:
+                break
+            self._rung_of[trial.id] = rung
+            trials.append(trial)
+        return trials
+
+    def _observe(self, trial, score):
+        rung = self._rung_of.get(trial.id, 0)
+        self._rungs[rung][trial.id] = (trial.parameters, score)
+
+
+strategies = {
+    SUCCESSIVE_HALVING: SuccessiveHalving,
+    HYPERBAND: Hyperband,
+    ASHA: AsynchronousHalving
+}
+
+
+class HalvingParameterProvider(ParameterProviderMixin):
+    """
+    Parameter provider pruning bad configurations early. The configurations are taken from the grid of the code
+    (the cartesian product by default) and first evaluated on a fraction of the training rows. Only the best ones
+    are evaluated on larger fractions. Scores are read from the metrics calculated for the branches.
+    """
+
+    def __init__(self, name=None, strategy=SUCCESSIVE_HALVING, eta=3, min_budget=None, max_budget=1.0,
+                 objective=None, mode=None, code=None, reference=None, **kwargs):
+        """
+        :param strategy: "successive_halving", "hyperband" or "asha"
+        :param eta: Factor by which the configurations are reduced and the budget is increased per rung
+        :param min_budget: Smallest fraction of the training rows
+        :param max_budget: Largest fraction of the training rows
+        :param objective: Path of the score in the metrics. For example "classification_metrics.f1_score"
+        :param mode: "max" or "min"
+        :param code: Code creating the grid of configurations
+        """
+        if strategy not in strategies:
+            raise ValueError("Unknown strategy " + str(strategy) + ". Known strategies are " +
+                             str(list(strategies.keys())))
+        if code is None:
+            code = grid_search
+        if reference is None:
+            reference = PythonPackage(package=__name__, variable=strategy, repository_identifier=PACKAGE_ID)
+        self._strategy = strategy
+        self._search_options = {"eta": eta, "min_budget": min_budget, "max_budget": max_budget,
+                                "objective": objective, "mode": mode}
+        super().__init__(name=name if name is not None else strategy, code=code, reference=reference, **kwargs)
+
+    def _make_result(self, *, grid, parameter_names, run, component, predecessor=None):
+        candidates = [dict(zip(parameter_names, element)) for element in grid]
+        return strategies[self._strategy](component=component, run=run, parameters={}, candidates=candidates,
+                                          parameter_names=parameter_names, predecessor=predecessor, branch=True,
+                                          **self._search_options)
+
+
+successive_halving = HalvingParameterProvider(strategy=SUCCESSIVE_HALVING)
+hyperband = HalvingParameterProvider(strategy=HYPERBAND)
+asha = HalvingParameterProvider(strategy=ASHA)
@@ -63,9 +63,19 @@ class ParameterProviderMixin(CodeManagedMixin, CustomCodeHolder, SuperStop):
         grid, params_list = super()._execute_helper(run=run, component=component, predecessor=predecessor,
                                                     parameter_map=parameter_map, parameters=hyperparameters)
 
+        return self._make_result(grid=grid, parameter_names=params_list, run=run, component=component,
+                                 predecessor=predecessor)
+
+    def _make_result(self, *, grid, parameter_names, run, component, predecessor=None):
+        """
+        Wrap the grid created by the code into the computation the pipeline branches over.
+        :param grid: Iterable of value tuples
+        :param parameter_names: Names of the values in the tuples
+        :return: Computation
+        """
         return HyperParameterGrid(component=component, run=run,
                                   parameters={},
-                                  result=grid, parameter_names=params_list,
+                                  result=grid, parameter_names=parameter_names,
                                   predecessor=predecessor, branch=True)
 
 
@@ -0,0 +1,95 @@
+import time
+
+import numpy as np
+
+from pypadre._package import PACKAGE_ID
+from pypadre.core.model.code.code_mixin import PythonPackage, Function
+from pypadre.core.model.computation.hyper_parameter_search import HyperParameterGrid
+from pypadre.core.model.pipeline.parameter_providers.parameters import ParameterProviderMixin
+from pypadre.core.util import random as padre_random
+from pypadre.core.util.sampling import SearchSpace, make_points, RANDOM, SOBOL, LATIN_HYPERCUBE
+
+
+def _create_space(ctx, **parameters: dict):
+    """
+    Creates the search space of the hyper parameters passed
+    :param parameters: Dictionary containing hyperparameter names and their distributions or possible values
+    :return: The search space and a list containing the hyperparameter names
+    """
+    space = SearchSpace(parameters)
+    return space, space.names
+
+
+# noinspection PyTypeChecker
+search_space = Function(fn=_create_space, transient=True, repository_identifier=PACKAGE_ID)
+
+
+def sample(space: SearchSpace, method=RANDOM, n_trials=None, time_limit=None, seed=None):
+    """
+    Lazily draw combinations from a search space. Drawing stops as soon as the trials or the time are used up. In
+    spaces without continuous parameters combinations are not drawn twice.
+    :param space: Search space
+    :param method: "random", "sobol" or "latin_hypercube"
+    :param n_trials: Maximal number of combinations
+    :param time_limit: Seconds after the first combination after which no further combinations are drawn
+    :param seed: Seed of the sampler
+    :return: Generator of value tuples
+    """
+    if n_trials is None and time_limit is None and space.size is None:
+        raise ValueError("Sampling a continuous space needs a number of trials or a time limit.")
+    points = make_points(method, space.dimensions, np.random.RandomState(seed), n=n_trials)
+    size = space.size
+    seen = set()
+    start = time.time()
+    drawn = 0
+    for point in points:
+        if n_trials is not None and drawn >= n_trials:
+            return
+        if time_limit is not None and time.time() - start > time_limit:
+            return
+        if size is not None and len(seen) >= size:
+            return
+        values = space.decode(point)
+        if size is not None:
+            key = repr(values)
+            if key in seen:
+                continue
+            seen.add(key)
+        drawn += 1
+        yield values
+
+
+class SamplingParameterProvider(ParameterProviderMixin):
+    """
+    Parameter provider drawing a fixed number of combinations instead of building the cartesian product. Parameters
+    can be given as distributions (see pypadre.core.util.sampling), lists of values or constants. Combinations are
+    drawn lazily with the seed of the experiment while the branches are executed.
+    """
+
+    def __init__(self, name=None, method=RANDOM, n_trials=10, time_limit=None, code=None, reference=None, **kwargs):
+        """
+        :param method: "random", "sobol" or "latin_hypercube"
+        :param n_trials: Number of combinations to draw
+        :param time_limit: Seconds after which no further combinations are drawn
+        :param code: Code creating the search space
+        """
+        if code is None:
+            code = search_space
+        if reference is None:
+            reference = PythonPackage(package=__name__, variable=method + "_search", repository_identifier=PACKAGE_ID)
+        self._method = method
+        self._n_trials = n_trials
+        self._time_limit = time_limit
+        super().__init__(name=name if name is not None else method + "_search", code=code, reference=reference,
+                         **kwargs)
+
+    def _make_result(self, *, grid, parameter_names, run, component, predecessor=None):
+        combinations = sample(grid, method=self._method, n_trials=self._n_trials, time_limit=self._time_limit,
+                              seed=padre_random.padre_seed)
+        return HyperParameterGrid(component=component, run=run, parameters={}, result=combinations,
+                                  parameter_names=parameter_names, predecessor=predecessor, branch=True)
+
+
+random_search = SamplingParameterProvider(method=RANDOM)
+sobol_search = SamplingParameterProvider(method=SOBOL)
+latin_hypercube_search = SamplingParameterProvider(method=LATIN_HYPERCUBE)
@@ -1,3 +1,5 @@
+import json
+from functools import partial
 from typing import Callable, Optional, Union, Type
 
 import networkx
@@ -7,8 +9,10 @@ from pypadre.core.metrics.metric_registry import metric_registry
 from pypadre.core.metrics.write_result_metrics_map import WriteResultMetricsMap, MetricsMap
 from pypadre.core.model.code.code_mixin import CodeMixin
 from pypadre.core.model.computation.computation import Computation
+from pypadre.core.model.computation.hyper_parameter_search import HyperParameterSearch, Trial, average_metrics
 from pypadre.core.model.computation.pipeline_output import PipelineOutput
 from pypadre.core.model.computation.run import Run
+from pypadre.core.model.generic.branch_state import in_branch
 from pypadre.core.model.generic.custom_code import CodeManagedMixin
 from pypadre.core.model.generic.i_executable_mixin import ExecuteableMixin
 from pypadre.core.model.generic.i_model_mixins import ProgressableMixin
@@ -16,11 +20,17 @@ from pypadre.core.model.pipeline.components.component_mixins import EstimatorCom
     PipelineComponentMixin, \
     ParameterizedPipelineComponentMixin
 from pypadre.core.model.pipeline.components.components import SplitComponent, PipelineComponent, DefaultSplitComponent
+from pypadre.core.model.pipeline.executors import make_executor, SerialExecutor
 from pypadre.core.model.pipeline.parameter_providers.parameters import ParameterMap
+from pypadre.core.model.split.split import Split
 from pypadre.core.util.utils import persistent_hash
 from pypadre.core.validation.validation import ValidateableMixin
 
 
+def _call(branch):
+    return branch()
+
+
 class Pipeline(CodeManagedMixin, ProgressableMixin, ExecuteableMixin, DiGraph, ValidateableMixin):
     def __init__(self, allow_metrics=True, **attr):
         self._allow_metrics = allow_metrics
@@ -59,9 +69,12 @@ class Pipeline(CodeManagedMixin, ProgressableMixin, ExecuteableMixin, DiGraph, V
 
         entries = self.get_entries()
 
+        results = []
         for entry in entries:
-            self._execute_pipeline(entry, parameter_map=parameter_map, write_parameters_map=write_parameters_map,
-                                   run=run, data=data, **kwargs)
+            results.append(self._execute_pipeline(entry, parameter_map=parameter_map,
+                                                  write_parameters_map=write_parameters_map, run=run, data=data,
+                                                  **kwargs))
+        return average_metrics(results)
 
     def _execute_pipeline(self, node: PipelineComponentMixin, *, data, parameter_map: ParameterMap,
                           write_parameters_map: WriteResultMetricsMap, run: Run, metrics_map:MetricsMap,
@@ -74,20 +87,131 @@ class Pipeline(CodeManagedMixin, ProgressableMixin, ExecuteableMixin, DiGraph, V
             parameter_grid = node.combinations(run=run, predecessor=kwargs.get("predecessor", None),
                                                parameter_map=parameter_map)
 
-            # branch if we have multiple parameter settings
-            for parameters in parameter_grid.iter_result():
-                # If the parameter map returns a generator or other iterable and should branch we have to
-                # execute for each item
-                self._execute_pipeline_helper(node, data=data, parameters=parameters,
-                                              parameter_map=parameter_map,
-                                              metrics_map=metrics_map,
-                                              write_parameters_map=write_parameters_map, run=run,
-                                              predecessor=kwargs.get("predecessor", None))
+            # branch if we have multiple parameter settings. If the parameter map returns a generator or other
+            # iterable and should branch we have to execute for each item. The branches are executed by the executor
+            # configured for the experiment.
+            executor = self._executor(run)
+            if isinstance(parameter_grid, HyperParameterSearch):
+                return self._execute_search(node, parameter_grid, executor, data=data, parameter_map=parameter_map,
+                                            metrics_map=metrics_map, write_parameters_map=write_parameters_map,
+                                            run=run, predecessor=kwargs.get("predecessor", None))
+            return average_metrics(
+                executor.map(partial(self._execute_branch, node, data=data, parameter_map=parameter_map,
+                                     metrics_map=metrics_map, write_parameters_map=write_parameters_map, run=run,
+                                     predecessor=kwargs.get("predecessor", None)),
+                             parameter_grid.iter_result()))
         else:
             # If we don't need parameters we don't extract them from the map but only pass the map to the following
             # components
-            self._execute_pipeline_helper(node, data=data, parameter_map=parameter_map,
-                                          write_parameters_map=write_parameters_map, metrics_map=metrics_map,run=run, **kwargs)
+            return self._execute_pipeline_helper(node, data=data, parameter_map=parameter_map,
+                                                 write_parameters_map=write_parameters_map, metrics_map=metrics_map,
+                                                 run=run, **kwargs)
+
+    def _execute_search(self, node: PipelineComponentMixin, search: HyperParameterSearch, executor, **kwargs):
+        # Ask the search for trials until it is done. The metrics of the executed trials are reported back.
+        metrics = {}
+
+        def observe(trial, result):
+            metrics[trial.id] = result
+            search.observe(trial, result)
+
+        executor.search(partial(self._execute_trial, node, **kwargs), search.suggest, observe)
+
+        best, score = search.best_trial
+        if best is not None:
+            message = "Best parameters of " + node.name + ": " + str(best.parameters) + " with score " + str(score)
+            self.send_info(message=message)
+        return metrics.get(best.id, {}) if best is not None else {}
+
+    @staticmethod
+    def _executor(run: Run):
+        # Branches of branches are executed serially to not nest pools
+        if in_branch():
+            return SerialExecutor()
+        experiment = run.experiment if run is not None else None
+        executor = make_executor(getattr(experiment, "concurrency", None))
+        executor.prepare(run)
+        return executor
+
+    def _execute_branch(self, node: PipelineComponentMixin, parameters, **kwargs):
+        return self._execute_pipeline_helper(node, parameters=parameters, **kwargs)
+
+    def _execute_trial(self, node: PipelineComponentMixin, trial: Trial, *, data, **kwargs):
+        # The budget of a trial is the fraction of the training rows of the split
+        if isinstance(data, Split) and trial.budget < 1:
+            data = data.subsample(trial.budget)
+        return self._execute_branch(node, trial.parameters, data=data, **kwargs)
+
+    def _execute_folds(self, node: PipelineComponentMixin, computation: Computation, executor, *, run: Run,
+                       parameter_map: ParameterMap, write_parameters_map: WriteResultMetricsMap,
+                       metrics_map: MetricsMap, **kwargs):
+        """
+        Execute the successors of a branching computation for each of its folds. For pools and queues the folds and
+        the combinations of the parameterized successors are flattened into one map. The executor therefore fans out
+        over folds x combinations instead of only over the folds, whose grids would run serially within a branch.
+        Searches depend on the results of their trials. They are executed fold by fold afterwards and use the whole
+        executor for their trials.
+        :return: Metrics averaged over the folds
+        """
+        common = dict(run=run, predecessor=computation, parameter_map=parameter_map,
+                      write_parameters_map=write_parameters_map, metrics_map=metrics_map)
+        if isinstance(executor, SerialExecutor):
+            return average_metrics(executor.map(partial(self._execute_fold, node, **common, **kwargs),
+                                                computation.iter_result()))
+
+        successors = list(self.successors(node))
+        folds = []
+        keys = []
+        searches = []
+
+        def branches():
+            # Branches are created lazily while the executor consumes them
+            for fold in computation.iter_result():
+                folds.append(fold)
+                for position, successor in enumerate(successors):
+                    key = (len(folds) - 1, position)
+                    if not isinstance(successor, ParameterizedPipelineComponentMixin):
+                        keys.append(key)
+                        yield partial(self._execute_pipeline_helper, successor, data=fold, **common, **kwargs)
+                        continue
+                    parameter_grid = successor.combinations(run=run, predecessor=computation,
+                                                            parameter_map=parameter_map)
+                    if isinstance(parameter_grid, HyperParameterSearch):
+                        searches.append((key, successor, parameter_grid))
+                        continue
+                    for parameters in parameter_grid.iter_result():
+                        keys.append(key)
+                        yield partial(self._execute_branch, successor, parameters, data=fold, **common)
+
+        try:
+            branch_results = {}
+            # The keys are recorded while the generator is consumed
+            for number, result in enumerate(executor.map(_call, branches())):
+                branch_results.setdefault(keys[number], []).append(result)
+            for key, successor, search in searches:
+                branch_results[key] = [self._execute_search(successor, search, executor, data=folds[key[0]],
+                                                            **common)]
+
+            fold_results = []
+            for fold_number in range(len(folds)):
+                results = {}
+                for position in range(len(successors)):
+                    results.update(average_metrics(branch_results.get((fold_number, position), [])))
+                fold_results.append(results)
+            return average_metrics(fold_results)
+        finally:
+            # The slices of the folds aren't needed anymore after their branches finished
+            for fold in folds:
+                if isinstance(fold, Split):
+                    fold.release()
+
+    def _execute_fold(self, node: PipelineComponentMixin, data, **kwargs):
+        try:
+            return self._execute_successors(node, data=data, **kwargs)
+        finally:
+            # The slices of a fold aren't needed anymore after its branches finished
+            if isinstance(data, Split):
+                data.release()
 
     def _execute_pipeline_helper(self, node: PipelineComponentMixin, *, data, parameter_map: ParameterMap,
                                  write_parameters_map: WriteResultMetricsMap, metrics_map: MetricsMap,
@@ -98,15 +222,29 @@ class Pipeline(CodeManagedMixin, ProgressableMixin, ExecuteableMixin, DiGraph, V
         allow_metrics = True if len(write_parameters.get('allow_metrics', [])) > 0 else self.allow_metrics
         store_results = write_parameters.get('write_results', False)
 
+        predecessor = kwargs.pop("predecessor", None)
+        resume_key = self._resume_key(node, run=run, data=data, predecessor=predecessor,
+                                      parameters=kwargs.get("parameters", None))
+        if getattr(run, "resume", False):
+            # Only the metadata of the completed computation is loaded. It holds the metrics of its branches.
+            completed = Computation.send_get_metadata(hash=resume_key)
+            if completed is not None:
+                message = "Skipping " + node.name + ". The computation was already completed by a previous run."
+                self.send_info(message=message)
+                return completed.get(Computation.BRANCH_METRICS, {})
+
         # If the node has the functionality get the hyperparameters
         initial_hyperparameters = None
         if hasattr(node, 'get_initial_hyperparameters'):
             initial_hyperparameters = node.get_initial_hyperparameters()
 
+        # The computation is put once all of its successors are done. Its resume key and the metrics of its branches
+        # are part of this put, so stored computations are always completed ones.
         computation = node.execute(run=run, data=data,
-                                   predecessor=kwargs.pop("predecessor", None), store_results=store_results,
-                                   initial_hyperparameters=initial_hyperparameters,
+                                   predecessor=predecessor, store_results=store_results,
+                                   initial_hyperparameters=initial_hyperparameters, intermediate_results=False,
                                    **kwargs)
+        computation.resume_key = resume_key
 
         # look up available metrics
         available_metrics = metric_registry.available_providers(computation)
@@ -117,6 +255,7 @@ class Pipeline(CodeManagedMixin, ProgressableMixin, ExecuteableMixin, DiGraph, V
             print(available_message)
 
         # calculate metrics
+        results = {}
         if allow_metrics:
             providers = []
             for metric in available_metrics:
@@ -134,13 +273,15 @@ class Pipeline(CodeManagedMixin, ProgressableMixin, ExecuteableMixin, DiGraph, V
             computation.metrics = metrics
             for metric in metrics:
                 metric.send_put()
+                results[metric.name] = metric.result
 
-        # branch results now if needed (for example for splits)
-        for res in computation.iter_result():
-            self._execute_successors(node, run=run, predecessor=computation,
-                                     parameter_map=parameter_map, write_parameters_map=write_parameters_map,
-                                     metrics_map=metrics_map,
-                                     data=res, **kwargs)
+        # branch results now if needed (for example for splits). The folds of a split are executed by the executor
+        # configured for the experiment.
+        executor = self._executor(run) if computation.branch else SerialExecutor()
+        # Metrics of the folds are averaged
+        results.update(self._execute_folds(node, computation, executor, run=run, parameter_map=parameter_map,
+                                           write_parameters_map=write_parameters_map, metrics_map=metrics_map,
+                                           **kwargs))
 
         # Check if we are a end node
         if self.out_degree(node) == 0 and aggregate_results:
@@ -151,12 +292,35 @@ class Pipeline(CodeManagedMixin, ProgressableMixin, ExecuteableMixin, DiGraph, V
             self.send_info(message=message)
             print(message)
 
+        # The computation and all of its successors are done. Runs resuming the execution look it up by its resume key
+        # and use the stored metrics, so searches resumed later observe the scores of skipped branches.
+        computation.metadata[Computation.HASH] = resume_key
+        computation.metadata[Computation.BRANCH_METRICS] = results
+        computation.send_put(store_results=store_results)
+        return results
+
+    @staticmethod
+    def _resume_key(node: PipelineComponentMixin, *, run: Run, data, predecessor: Computation = None,
+                    parameters=None):
+        """
+        Key of a computation which is equal for each run of the execution. It is derived from the component, its
+        parameters, the key of the predecessor and the number of the split the computation works on.
+        """
+        execution_id = getattr(run, "execution_id", None) if run is not None else None
+        predecessor_key = predecessor.resume_key if predecessor is not None else None
+        split = None
+        if isinstance(data, Split):
+            split = data.number if data.budget >= 1 else (data.number, data.budget)
+        return str(persistent_hash((execution_id, node.id, predecessor_key, split,
+                                    json.dumps(parameters, sort_keys=True, default=str))))
+
     def _execute_successors(self, node: PipelineComponentMixin, *, data, parameter_map: ParameterMap, run: Run,
                             predecessor: Computation = None, metrics_map: MetricsMap, **kwargs):
-        successors = self.successors(node)
-        for successor in successors:
-            self._execute_pipeline(successor, data=data, run=run, predecessor=predecessor,
-                                   parameter_map=parameter_map, metrics_map=metrics_map, **kwargs)
+        results = {}
+        for successor in self.successors(node):
+            results.update(self._execute_pipeline(successor, data=data, run=run, predecessor=predecessor,
+                                                  parameter_map=parameter_map, metrics_map=metrics_map, **kwargs))
+        return results
 
 
 
@@ -0,0 +1,234 @@
+"""
+Vectorized generation of the index arrays of splits. Index arrays are sorted and use 32 bit integers if the number of
+rows allows it, so a fold needs a few bytes per row instead of a python object per row. Index arrays are stored run
+length or bitmap encoded.
+"""
+import base64
+
+import numpy as np
+
+
+def index_dtype(n):
+    """
+    :param n: Number of rows
+    :return: Smallest integer type used for indices into n rows
+    """
+    return np.int32 if n <= np.iinfo(np.int32).max else np.int64
+
+
+def complement(n, idx):
+    """
+    Rows which are not in idx.
+    :param n: Number of rows
+    :param idx: Index array
+    :return: Sorted index array
+    """
+    mask = np.ones(n, dtype=bool)
+    mask[idx] = False
+    return np.flatnonzero(mask).astype(index_dtype(n), copy=False)
+
+
+def cv_folds(n, n_folds):
+    """
+    Contiguous folds of cross validation. Fold i tests on the rows i * (n // n_folds) to (i + 1) * (n // n_folds).
+    :param n: Number of rows
+    :param n_folds: Number of folds
+    :return: Generator of (train, test) index arrays
+    """
+    if n_folds < 2 or n_folds > n:
+        raise ValueError("The number of folds has to be between 2 and the number of rows " + str(n) + ".")
+    dtype = index_dtype(n)
+    size = n // n_folds
+    for i in range(n_folds):
+        test = np.arange(i * size, (i + 1) * size, dtype=dtype)
+        yield complement(n, test), test
+
+
+def labels(y):
+    """
+    Encode targets as consecutive integer labels. Rows of multi column targets are labelled by their combination.
+    :param y: Targets
+    :return: Tuple of the label of every row and the number of labels
+    """
+    y = np.asarray(y)
+    if y.ndim > 1:
+        if y.shape[1] == 1:
+            y = y.ravel()
+        else:
+            _, codes = np.unique(y, axis=0, return_inverse=True)
+            return codes.ravel(), int(codes.max()) + 1 if len(codes) > 0 else 0
+    uniques, codes = np.unique(y, return_inverse=True)
+    return codes, len(uniques)
+
+
+def _rank_in_label(codes, n_labels, random_state=None):
+    """
+    Bucket the rows by label like a counting sort and number them within their bucket.
+    :param codes: Label of every row
+    :param random_state: Shuffle the rows within their buckets if given
+    :return: Tuple of the rank of every row within its label and the number of rows per label
+    """
+    n = len(codes)
+    order = random_state.permutation(n) if random_state is not None else np.arange(n)
+    # A stable sort by label keeps the (shuffled) order within the buckets
+    order = order[np.argsort(codes[order], kind="mergesort")]
+    counts = np.bincount(codes, minlength=n_labels)
+    starts = np.cumsum(counts) - counts
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n) - np.repeat(starts, counts)
+    return rank, counts
+
+
+def folds_of_assignment(fold, n_folds):
+    """
+    :param fold: Fold of every row
+    :param n_folds: Number of folds
+    :return: Generator of (train, test) index arrays
+    """
+    dtype = index_dtype(len(fold))
+    for i in range(n_folds):
+        test = fold == i
+        yield np.flatnonzero(~test).astype(dtype, copy=False), np.flatnonzero(test).astype(dtype, copy=False)
+
+
+def kfold_assignment(n, n_folds, random_state=None):
+    """
+    :param random_state: Shuffle the rows before they are assigned to folds if given
+    :return: Fold of every row. Folds differ in size by at most one row.
+    """
+    order = random_state.permutation(n) if random_state is not None else np.arange(n)
+    fold = np.empty(n, dtype=np.int32)
+    fold[order] = np.arange(n) * n_folds // n
+    return fold
+
+
+def stratified_assignment(y, n_folds, random_state=None):
+    """
+    Distribute the rows of every label round robin over the folds. Every label continues where the previous label
+    stopped, so the folds differ in size by at most one row and every label by at most one row per fold.
+    :param y: Targets
+    :param random_state: Shuffle the rows within their labels if given
+    :return: Fold of every row
+    """
+    codes, n_labels = labels(y)
+    rank, counts = _rank_in_label(codes, n_labels, random_state)
+    offsets = np.cumsum(counts) - counts
+    return ((rank + offsets[codes]) % n_folds).astype(np.int32)
+
+
+def group_assignment(groups, n_folds):
+    """
+    Assign whole groups to folds. Groups are sorted by size and dealt out in alternating direction, which balances
+    the sizes of the folds.
+    :param groups: Group of every row
+    :return: Fold of every row
+    """
+    codes, n_groups = labels(groups)
+    if n_groups < n_folds:
+        raise ValueError("The number of groups " + str(n_groups) + " is smaller than the number of folds.")
+    counts = np.bincount(codes, minlength=n_groups)
+    by_size = np.argsort(-counts, kind="mergesort")
+    position = np.arange(n_groups)
+    rounds, offset = np.divmod(position, n_folds)
+    group_fold = np.empty(n_groups, dtype=np.int32)
+    group_fold[by_size] = np.where(rounds % 2 == 0, offset, n_folds - 1 - offset)
+    return group_fold[codes]
+
+
+def stratified_holdout(y, test_ratio, random_state):
+    """
+    Hold out the same ratio of the rows of every label.
+    :return: Tuple of the train and test index arrays
+    """
+    codes, n_labels = labels(y)
+    rank, counts = _rank_in_label(codes, n_labels, random_state)
+    test = rank < np.floor(counts * test_ratio + 0.5)[codes]
+    dtype = index_dtype(len(codes))
+    return np.flatnonzero(~test).astype(dtype, copy=False), np.flatnonzero(test).astype(dtype, copy=False)
+
+
+def time_series_folds(n, n_folds, gap=0, max_train_size=None, test_size=None):
+    """
+    Forward chaining splits of rows ordered by time. Every fold tests on the rows following its training rows.
+    :param n_folds: Number of folds
+    :param gap: Rows left out between the training and the test rows
+    :param max_train_size: Maximal number of training rows. Older rows are dropped.
+    :param test_size: Number of test rows per fold. Defaults to n // (n_folds + 1).
+    :return: Generator of (train, test) index arrays
+    """
+    test_size = test_size if test_size is not None else n // (n_folds + 1)
+    if test_size < 1 or n - n_folds * test_size - gap < 1:
+        raise ValueError("Too many folds for " + str(n) + " rows.")
+    dtype = index_dtype(n)
+    for i in range(n_folds):
+        start = n - (n_folds - i) * test_size
+        end = start - gap
+        begin = 0 if max_train_size is None else max(0, end - max_train_size)
+        yield np.arange(begin, end, dtype=dtype), np.arange(start, start + test_size, dtype=dtype)
+
+
+RANGES = "ranges"
+BITMAP = "bitmap"
+ARRAY = "array"
+
+
+def encode_indices(idx):
+    """
+    Encode an index array compactly. Consecutive runs are stored as (start, length) pairs, which keeps the order of
+    the indices. Sorted indices with many runs are stored as bitmap over the rows. Arrays which compress in neither
+    way are stored as raw bytes.
+    :param idx: Index array or None
+    :return: Json serializable dict or None
+    """
+    if idx is None:
+        return None
+    idx = np.asarray(idx, dtype=np.int64)
+    count = len(idx)
+    if count == 0:
+        return {"encoding": RANGES, "count": 0, "ranges": []}
+    breaks = np.flatnonzero(np.diff(idx) != 1) + 1
+    starts = idx[np.r_[0, breaks]]
+    lengths = np.diff(np.r_[0, breaks, count])
+    upper = int(idx.max()) + 1
+    dtype = index_dtype(upper)
+    # Sizes in bytes of the encodings
+    sizes = {RANGES: 2 * len(starts) * np.dtype(dtype).itemsize, ARRAY: count * np.dtype(dtype).itemsize}
+    if np.all(np.diff(idx) > 0):
+        sizes[BITMAP] = (upper + 7) // 8
+    encoding = min(sizes, key=sizes.get)
+    if encoding == RANGES:
+        return {"encoding": RANGES, "count": count, "ranges": np.column_stack([starts, lengths]).tolist()}
+    if encoding == BITMAP:
+        mask = np.zeros(upper, dtype=bool)
+        mask[idx] = True
+        return {"encoding": BITMAP, "count": count, "length": upper,
+                "bitmap": base64.b64encode(np.packbits(mask).tobytes()).decode("ascii")}
+    return {"encoding": ARRAY, "count": count, "dtype": np.dtype(dtype).name,
+            "array": base64.b64encode(idx.astype(dtype).tobytes()).decode("ascii")}
+
+
+def decode_indices(encoded):
+    """
+    Inverse of encode_indices. Plain lists of indices are accepted as well.
+    :param encoded: Encoded indices or None
+    :return: Index array or None
+    """
+    if encoded is None:
+        return None
+    if not isinstance(encoded, dict):
+        return np.asarray(encoded)
+    encoding = encoded["encoding"]
+    if encoding == RANGES:
+        ranges = np.asarray(encoded["ranges"], dtype=np.int64).reshape(-1, 2)
+        starts, lengths = ranges[:, 0], ranges[:, 1]
+        total = int(lengths.sum())
+        offsets = np.cumsum(lengths) - lengths
+        idx = np.arange(total, dtype=np.int64) + np.repeat(starts - offsets, lengths)
+        return idx.astype(index_dtype(int(idx.max()) + 1 if total > 0 else 0))
+    if encoding == BITMAP:
+        bits = np.unpackbits(np.frombuffer(base64.b64decode(encoded["bitmap"]), dtype=np.uint8))
+        length = encoded["length"]
+        return np.flatnonzero(bits[:length]).astype(index_dtype(length))
+    if encoding == ARRAY:
+        return np.frombuffer(base64.b64decode(encoded["array"]), dtype=encoded["dtype"]).copy()
+    raise ValueError("Unknown index encoding " + str(encoding) + ".")
@@ -1,5 +1,12 @@
+import copy
+
+import numpy as np
+
 from pypadre.core.base import MetadataMixin, ChildMixin
 from pypadre.core.model.generic.i_storable_mixin import StoreableMixin
+from pypadre.core.model.split.indices import encode_indices, decode_indices
+from pypadre.core.util import random as padre_random
+from pypadre.core.util.memoization import fingerprint_array
 
 
 class Split(StoreableMixin, MetadataMixin, ChildMixin):
@@ -17,6 +24,9 @@ class Split(StoreableMixin, MetadataMixin, ChildMixin):
         self._splits = []
         self._id = kwargs.pop("split_id", None)
         self._run = run
+        self._budget = 1.0
+        # Slices of the dataset computed once for the lifetime of the split
+        self._views = {}
         # Add defaults
         defaults = {}
 
@@ -33,86 +43,182 @@ class Split(StoreableMixin, MetadataMixin, ChildMixin):
         return self._num
 
     def has_testset(self):
-        return self._test_idx is not None and len(self._test_idx) > 0
+        return self.test_idx is not None and len(self.test_idx) > 0
 
     def has_valset(self):
-        return self._val_idx is not None and len(self._val_idx) > 0
+        return self.val_idx is not None and len(self.val_idx) > 0
 
     def has_targets(self):
         return self.dataset.targets() is not None and len(self.dataset.targets()) > 0
 
+    def _indices(self, name):
+        # Indices of unpickled splits are decoded on first access
+        encoded = self.__dict__.get("_encoded_indices", {})
+        if name in encoded:
+            setattr(self, name, decode_indices(encoded.pop(name)))
+        return getattr(self, name)
+
     @property
     def train_idx(self):
-        return self._train_idx
+        return self._indices("_train_idx")
 
     @property
     def test_idx(self):
-        return self._test_idx
+        return self._indices("_test_idx")
 
     @property
     def val_idx(self):
-        return self._val_idx
+        return self._indices("_val_idx")
 
     @property
     def dataset(self):
         return self.execution.experiment.dataset
 
+    @property
+    def budget(self):
+        """
+        Fraction of the training rows of the original split
+        """
+        return getattr(self, "_budget", 1.0)
+
+    def subsample(self, fraction):
+        """
+        Get a view of the split training only on a fraction of the training rows. The rows are drawn with the seed of
+        the experiment, so all configurations evaluated on the same budget see the same rows.
+        :param fraction: Fraction of the training rows to keep
+        :return: Split
+        """
+        if fraction >= 1 or self.train_idx is None:
+            return self
+        n = max(1, int(round(len(self.train_idx) * fraction)))
+        rows = np.random.RandomState(padre_random.padre_seed or 0).choice(len(self.train_idx), n, replace=False)
+        split = copy.copy(self)
+        split._encoded_indices = dict(self.__dict__.get("_encoded_indices", {}))
+        split._train_idx = np.asarray(self.train_idx)[np.sort(rows)]
+        split._views = {}
+        split._budget = self.budget * fraction
+        return split
+
+    def fingerprint(self):
+        """
+        Hash of the content of the dataset and the indices of the split.
+        :return: Hex digest or None if the dataset can't be hashed
+        """
+        dataset = self.dataset.fingerprint() if hasattr(self.dataset, "fingerprint") else None
+        if dataset is None:
+            return None
+        return dataset + fingerprint_array(self.train_idx) + fingerprint_array(self.val_idx) + \
+            fingerprint_array(self.test_idx)
+
+    @staticmethod
+    def _rows(idx):
+        """
+        Contiguous ascending index arrays are passed as slice, so containers hand out views instead of copies.
+        """
+        if idx is None or len(idx) == 0:
+            return idx
+        start = int(idx[0])
+        if int(idx[-1]) == start + len(idx) - 1 and np.all(np.diff(idx) == 1):
+            return slice(start, start + len(idx))
+        return idx
+
+    def _view(self, name, get, idx):
+        # Copies created by subsample don't share the views of the original split
+        views = self.__dict__.setdefault("_views", {})
+        if name not in views:
+            view = get(rows=self._rows(idx))
+            if isinstance(view, np.ndarray):
+                # Views are shared by all branches of the split and may point into the dataset
+                view.flags.writeable = False
+            views[name] = view
+        return views[name]
+
+    def release(self, *names):
+        """
+        Drop cached slices of the dataset. They are computed again on the next access.
+        :param names: Names of the slices to drop (for example "train_features"). All slices if none are given.
+        """
+        views = self.__dict__.get("_views", {})
+        for name in (names if len(names) > 0 else list(views.keys())):
+            views.pop(name, None)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_views"] = {}
+        # Indices are pickled run length or bitmap encoded
+        encoded = dict(state.pop("_encoded_indices", {}))
+        for name in ["_train_idx", "_test_idx", "_val_idx"]:
+            if name not in encoded:
+                encoded[name] = encode_indices(state[name])
+            state[name] = None
+        state["_encoded_indices"] = encoded
+        return state
+
+    def _has_targets(self):
+        views = self.__dict__.setdefault("_views", {})
+        if "has_targets" not in views:
+            views["has_targets"] = self.has_targets()
+        return views["has_targets"]
+
     @property
     def train_features(self):
-        return self.dataset.features()[self._train_idx]
+        return self._view("train_features", self.dataset.features, self.train_idx)
 
     @property
     def test_features(self):
         if not self.has_testset():
             return None
         else:
-            return self.dataset.features()[self._test_idx]
+            return self._view("test_features", self.dataset.features, self.test_idx)
 
     @property
     def val_features(self):
         if not self.has_valset():
             return None
         else:
-            return self.dataset.features()[self._val_idx]
+            return self._view("val_features", self.dataset.features, self.val_idx)
 
     @property
     def train_targets(self):
-        if not self.has_targets():
+        if not self._has_targets():
             return None
         else:
-            return self.dataset.targets()[self._train_idx]
+            return self._view("train_targets", self.dataset.targets, self.train_idx)
 
     @property
     def test_targets(self):
-        if not self.has_testset() or not self.has_targets():
+        if not self.has_testset() or not self._has_targets():
             return None
         else:
-            return self.dataset.targets()[self._test_idx]
+            return self._view("test_targets", self.dataset.targets, self.test_idx)
 
     @property
     def val_targets(self):
-        if not self.has_valset() or not self.has_targets():
+        if not self.has_valset() or not self._has_targets():
             return None
         else:
-            return self.dataset.targets()[self._val_idx]
+            return self._view("val_targets", self.dataset.targets, self.val_idx)
+
+    def _data(self, rows):
+        return self.dataset.data()[rows]
 
     @property
     def train_data(self):
-        return self.dataset.data()[self._train_idx]
+        return self._view("train_data", self._data, self.train_idx)
 
     @property
     def test_data(self):
         if not self.has_testset():
             return None
         else:
-            return self.dataset.data()[self._test_idx]
+            return self._view("test_data", self._data, self.test_idx)
 
     @property
     def val_data(self):
         if not self.has_valset():
             return None
         else:
-            return self.dataset.data()[self._val_idx]
+            return self._view("val_data", self._data, self.val_idx)
 
     def __str__(self):
         s = []
@@ -3,12 +3,15 @@ import numpy as np
 from pypadre._package import PACKAGE_ID
 from pypadre.core.model.code.code_mixin import Function
 from pypadre.core.model.dataset.dataset import Dataset
+from pypadre.core.model.split.indices import index_dtype, cv_folds, folds_of_assignment, kfold_assignment, \
+    stratified_assignment, group_assignment, stratified_holdout, time_series_folds
 from pypadre.core.model.split.split import Split
 from pypadre.core.util.utils import unpack
 
 
 def split(ctx, strategy="random", test_ratio=0.25, random_seed=None, val_ratio=0,
-          n_folds=3, shuffle=True, stratified=None, indices=None, index=None):
+          n_folds=3, shuffle=True, stratified=None, indices=None, index=None, groups=None, n_repeats=2, gap=0,
+          max_train_size=None):
     (data, run, component, predecessor) = unpack(ctx, "data", "run", "component", ("predecessor", None))
     """
         The splitter creates index arrays into the dataset for different splitting startegies. It provides an iterator
@@ -17,26 +20,34 @@ def split(ctx, strategy="random", test_ratio=0.25, random_seed=None, val_ratio=0
         Currently the following splitting strategies are supported:
          - random split (stratified / non-stratified). If no_shuffle is true, the order will not be changed.
          - cross validation (stratified / non-stratified)"
+         - stratified - k-fold cross validation keeping the ratio of the classes in every fold
+         - group - k-fold cross validation keeping the rows of a group in the same fold
+         - repeated - k-fold cross validation repeated with differently shuffled folds (stratified / non-stratified)
+         - time_series - forward chaining splits testing on the rows following the training rows
          - explicit - expects an explicit split given as parameter indices = (train_idx, val_idx, test_idx)
          - function - expects a function taking as input the dataset and performing the split.
          - none - there will be no splitting. only a training set will be provided
 
          Options:
          ========
-         - strategy={"random"|"cv"|"explicit"|"none"/None} splitting strategy, default random
+         - strategy={"random"|"cv"|"stratified"|"group"|"repeated"|"time_series"|"explicit"|"index"|"none"/None}
+                                   splitting strategy, default random
          - test_ratio=float[0:1]   ratio of test dataset, default 0.25
          - val_ratio=float[0:1]    ratio of the validation test (taken from the training set), default 0
          - n_folds=int             number of folds when selecting cv strategies, default 3. smaller than dataset size
          - random_seed=int         seed for the random generator or None if no seeding should be done
-         - stratified={True|False|None} True, if splits should consider class stratification. If None, than stratification
-                                   is activated when there are targets (default). Otherwise, stratification strategies
-                                    is taking explicityly into account
+         - stratified={True|False|None} True, if the random, cv and repeated splits should consider class
+                                   stratification. Stratification needs targets.
          - shuffle={True|False} indicates, whether shuffling the data is allowed.
          - indices = [(train, validation, test)] a list of tuples with three index arrays in the dataset.
                                    Every index array contains
                                    the row index of the datapoints contained in the split
          - fn                      function of the form fn(dataset, **options) that returns a iterator over
                                    (train, validation, test) tuples (the form is similar to the indices parameter) as split
+         - groups                  group of every row or a function of the dataset returning them, for the group strategy
+         - n_repeats=int           number of repetitions of the repeated strategy, default 2
+         - gap=int                 rows between the training and the test rows of the time_series strategy, default 0
+         - max_train_size=int      maximal number of training rows of the time_series strategy
         """
     if isinstance(data, Dataset):
         n = data.size[0]
@@ -45,32 +56,44 @@ def split(ctx, strategy="random", test_ratio=0.25, random_seed=None, val_ratio=0
     # first create index array and random state vector
     # n = data.size
 
-    # TODO FIXME usage?
-    # stratified = self._stratified
-    # if stratified is None:
-    #     stratified = dataset.targets() is not None
-    # else:
-    #     if stratified and dataset.targets() is None:
-    #         stratified = False
+    targets = None
+    if stratified or strategy == "stratified":
+        targets = data.targets()
+        if targets is None:
+            raise ValueError("Stratified splits need a dataset with targets.")
 
     if random_seed is None:
         from pypadre.core.util.random import padre_seed
         random_seed = padre_seed
     r = np.random.RandomState(random_seed)
-    idx = np.arange(n)
+    idx = np.arange(n, dtype=index_dtype(n))
+
+    def make_split(num, train, test):
+        if val_ratio > 0:  # create a validation set out of the training set
+            n_v = int(len(train) * val_ratio)
+            return Split(run=run, num=num, train_idx=train[n_v:], test_idx=test, val_idx=train[:n_v],
+                         component=component, predecessor=predecessor)
+        return Split(run=run, num=num, train_idx=train, test_idx=test, val_idx=None, component=component,
+                     predecessor=predecessor)
 
     def splitting_iterator():
         num = -1
         # now apply splitting strategy
-        # todo s: time aware cross validation, stratified splits,
         # Todo do sanity checks that indizes do not overlap
         if strategy is None:
-            yield Split(run=run, num=++num, train_idx=idx, test_idx=None, val_idx=None, component=component,
+            num += 1
+            yield Split(run=run, num=num, train_idx=idx, test_idx=None, val_idx=None, component=component,
                         predecessor=predecessor)
         elif strategy == "explicit":
             for i in indices:
                 # TODO FIXME
                 yield i
+        elif strategy == "random" and stratified:
+            num += 1
+            train, test = stratified_holdout(targets, test_ratio, r)
+            if shuffle:
+                train = r.permutation(train)
+            yield make_split(num, train, test)
         elif strategy == "random":
             # for i in range(n_folds):
             if shuffle:  # Reshuffle every "fold"
@@ -78,32 +101,35 @@ def split(ctx, strategy="random", test_ratio=0.25, random_seed=None, val_ratio=0
             n_tr = int(n * (1.0 - test_ratio))
             train, test = idx[:n_tr], idx[n_tr:]
             num += 1
-            if val_ratio > 0:  # create a validation set out of the test set
-                n_v = int(len(train) * val_ratio)
-                yield Split(run=run, num=num, train_idx=train[:n_v], test_idx=test, val_idx=train[n_v:],
-                            component=component, predecessor=predecessor)
-            else:
-                yield Split(run=run, num=num, train_idx=train, test_idx=test, val_idx=None, component=component,
-                            predecessor=predecessor)
+            yield make_split(num, train, test)
+        elif strategy == "stratified" or (strategy == "cv" and stratified):
+            for train, test in folds_of_assignment(stratified_assignment(targets, n_folds, r if shuffle else None),
+                                                   n_folds):
+                num += 1
+                yield make_split(num, train, test)
+        elif strategy == "group":
+            if groups is None:
+                raise ValueError("The group strategy needs the groups of the rows.")
+            for train, test in folds_of_assignment(group_assignment(groups(data) if callable(groups) else groups,
+                                                                    n_folds), n_folds):
+                num += 1
+                yield make_split(num, train, test)
+        elif strategy == "repeated":
+            for _ in range(n_repeats):
+                fold = stratified_assignment(targets, n_folds, r) if stratified else kfold_assignment(n, n_folds, r)
+                for train, test in folds_of_assignment(fold, n_folds):
+                    num += 1
+                    yield make_split(num, train, test)
+        elif strategy == "time_series":
+            for train, test in time_series_folds(n, n_folds, gap=gap, max_train_size=max_train_size):
+                num += 1
+                yield make_split(num, train, test)
         elif strategy == "cv":
-            for i in range(n_folds):
-                # The test array can be seen as a non overlapping sub array of size n_te moving from start to end
-                n_te = i * int(n / n_folds)
-                test = np.asarray(range(n_te, n_te + int(n / n_folds)))
-
-                # if the test array exceeds the end of the array wrap it around the beginning of the array
-                test = np.mod(test, n)
-
-                # The training array is the set difference of the complete array and the testing array
-                train = np.asarray(list(set(idx) - set(test)))
-
-                if val_ratio > 0:  # create a validation set out of the test set
-                    n_v = int(len(train) * val_ratio)
-                    yield Split(run=run, num=++num, train_idx=train[:n_v], test_idx=test, val_idx=train[n_v:],
-                                component=component, predecessor=predecessor)
-                else:
-                    yield Split(run=run, num=++num, train_idx=train, test_idx=test, val_idx=None, component=component,
-                                predecessor=predecessor)
+            # The test array is a non overlapping sub array moving from start to end. The training array is the
+            # complement of the test array.
+            for train, test in cv_folds(n, n_folds):
+                num += 1
+                yield make_split(num, train, test)
 
         elif strategy == "index":
             # If a list of dictionaries are given to the experiment as indices, pop each one out and return
@@ -120,7 +146,8 @@ def split(ctx, strategy="random", test_ratio=0.25, random_seed=None, val_ratio=0
                 if val is not None:
                     val = np.array(val)
 
-                yield Split(run=run, num=++num, train_idx=train, test_idx=test, val_idx=val, component=component,
+                num += 1
+                yield Split(run=run, num=num, train_idx=train, test_idx=test, val_idx=val, component=component,
                             predecessor=predecessor)
 
         else:
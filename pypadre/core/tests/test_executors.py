@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from pypadre.core.model.generic.branch_state import defer_put, in_branch
+from pypadre.core.model.pipeline.executors import make_executor, ThreadExecutor, SerialExecutor, execute_task
+from pypadre.pod.util.job_queue import Worker
+
+
+class _Stored:
+    sent = []
+
+    def __init__(self, value):
+        self.value = value
+
+    def send_put(self, **kwargs):
+        if not defer_put(self, kwargs):
+            _Stored.sent.append(self.value)
+
+
+def _branch(i):
+    # Later branches finish first
+    time.sleep(0.01 * (5 - i))
+    _Stored(i).send_put()
+
+
+class TestExecutors(unittest.TestCase):
+
+    def setUp(self):
+        _Stored.sent = []
+
+    def test_make(self):
+        assert isinstance(make_executor(None), SerialExecutor)
+        executor = make_executor({"executor": "thread", "max_workers": 4})
+        assert isinstance(executor, ThreadExecutor) and executor.max_workers == 4
+        self.assertRaises(ValueError, make_executor, "unknown")
+
+    def test_deterministic_merge(self):
+        make_executor({"executor": "thread", "max_workers": 5}).map(_branch, range(5))
+        assert _Stored.sent == [0, 1, 2, 3, 4]
+
+    def test_single_item(self):
+        # A single branch is executed in the calling thread and keeps the pool for the branches further down
+        make_executor("thread").map(lambda i: _Stored(in_branch()).send_put(), [0])
+        assert _Stored.sent == [False]
+
+    def test_search(self):
+        # Trial 0 runs long. The trials after it are suggested as soon as a branch is free.
+        suggested = []
+        observed = []
+
+        def suggest(n):
+            trials = list(range(len(suggested), min(len(suggested) + n, 4)))
+            suggested.extend(trials)
+            return trials
+
+        def observe(trial, result):
+            observed.append(result)
+
+        def run(trial):
+            time.sleep(0.2 if trial == 0 else 0.01)
+            _Stored(trial).send_put()
+            return trial
+
+        ThreadExecutor(2).search(run, suggest, observe)
+        assert observed[-1] == 0 and sorted(observed) == [0, 1, 2, 3]
+        assert _Stored.sent == observed
+
+    def test_queue(self):
+        directory = tempfile.mkdtemp()
+        try:
+            executor = make_executor({"executor": "queue", "queue": os.path.join(directory, "queue.sqlite"),
+                                      "max_workers": 1, "poll_interval": 0.01, "timeout": 10})
+            queued = []
+
+            def handle(payload):
+                queued.append(sum(executor.queue.stats().values()))
+                return execute_task(payload)
+
+            worker = Worker(executor.queue, handle, poll_interval=0.01)
+            thread = threading.Thread(target=worker.run, kwargs={"max_tasks": 5})
+            thread.start()
+            executor.map(_branch, range(5))
+            thread.join()
+            # Workers write directly
+            assert sorted(_Stored.sent) == [0, 1, 2, 3, 4]
+            # Only a window of twice the workers is queued ahead of the finished tasks
+            assert all(count - done <= 2 for done, count in enumerate(queued))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import itertools
+import pickle
+import unittest
+from types import SimpleNamespace
+
+from pypadre.core.model.computation.hyper_parameter_search import average_metrics, ParameterGrid
+from pypadre.core.model.pipeline.parameter_providers.halving import SuccessiveHalving, Hyperband, \
+    AsynchronousHalving
+
+
+def _search(cls, **kwargs):
+    candidates = [{"x": x} for x in range(9)]
+    return cls(component=SimpleNamespace(id="component"), run=SimpleNamespace(id="run"), parameters={},
+               candidates=candidates, parameter_names=["x"], eta=3, **kwargs)
+
+
+def _metrics(trial):
+    # Larger x are better independent of the budget
+    return {"classification_metrics": {"accuracy": trial.parameters["x"] / 10}}
+
+
+def _rungs(search):
+    # Run the search synchronously and collect the suggested rungs
+    rungs = []
+    trials = search.suggest(4)
+    while len(trials) > 0:
+        rungs.append(trials)
+        for trial in trials:
+            search.observe(trial, _metrics(trial))
+        trials = search.suggest(4)
+    return rungs
+
+
+class TestHyperParameterSearch(unittest.TestCase):
+
+    def test_average_metrics(self):
+        folds = [{"classification_metrics": {"accuracy": 0.5, "confusion_matrix": [[1]]}},
+                 {"classification_metrics": {"accuracy": 1.0, "confusion_matrix": [[2]]}}, None]
+        merged = average_metrics(folds)
+        assert merged["classification_metrics"]["accuracy"] == 0.75
+        assert merged["classification_metrics"]["confusion_matrix"] == [[2]]
+        assert average_metrics([]) == {}
+
+    def test_parameter_grid(self):
+        values = [[1, 2, 3], ["a", "b"], [{"x": 1}], [0.1, 0.2, 0.3, 0.4]]
+        grid = ParameterGrid(["n", "s", "d", "f"], values)
+        product = list(itertools.product(*values))
+        assert len(grid) == grid.size == 24
+        assert list(grid) == product
+        assert grid[17] == product[17] and grid[-1] == product[-1]
+        assert grid.index(product[13]) == 13
+
+        # Shards cover the grid without overlap
+        shards = [grid.shard(i, 5) for i in range(5)]
+        assert [c for shard in shards for c in shard] == product
+        assert shards[1][0] == product[shards[1].start]
+
+        copy = pickle.loads(pickle.dumps(shards[2]))
+        assert list(copy) == list(shards[2])
+        assert ParameterGrid.from_dict(grid.to_dict()).to_dict() == grid.to_dict()
+        assert list(ParameterGrid([], [])) == [()]
+
+    def test_successive_halving(self):
+        search = _search(SuccessiveHalving)
+        first = search.suggest(4)
+        assert len(first) == 9 and all(t.budget == 1 / 9 for t in first)
+        for trial in first[:-1]:
+            search.observe(trial, _metrics(trial))
+        # The rung waits for its last trial
+        assert search.suggest(4) == []
+        search.observe(first[-1], _metrics(first[-1]))
+        rungs = [first] + _rungs(search)
+        assert [len(rung) for rung in rungs] == [9, 3, 1]
+        assert [rung[0].budget for rung in rungs] == [1 / 9, 1 / 3, 1.0]
+        assert [t.parameters["x"] for t in rungs[1]] == [8, 7, 6] and rungs[2][0].parameters == {"x": 8}
+        assert search.best == ({"x": 8}, 0.8)
+
+    def test_hyperband(self):
+        search = _search(Hyperband)
+        first = search.suggest(4)
+        # The next bracket starts while the first one waits for its rung
+        second = search.suggest(4)
+        assert [len(first), len(second)] == [9, 5] and second[0].budget == 1 / 3
+        for trial in first + second:
+            search.observe(trial, _metrics(trial))
+        rungs = [first, second] + _rungs(search)
+        assert [(len(rung), rung[0].budget) for rung in rungs] == \
+            [(9, 1 / 9), (5, 1 / 3), (3, 1 / 3), (1, 1.0), (1, 1.0), (3, 1.0)]
+        assert search.best == ({"x": 8}, 0.8)
+
+    def test_asynchronous_halving(self):
+        search = _search(AsynchronousHalving)
+        first = search.suggest(3)
+        assert len(first) == 3 and all(t.budget == 1 / 9 for t in first)
+        for trial in first[:2]:
+            search.observe(trial, _metrics(trial))
+        # Doesn't wait for the running trial but starts a new configuration
+        running = search.suggest(1)
+        assert len(running) == 1 and running[0].budget == 1 / 9
+        search.observe(first[2], _metrics(first[2]))
+        # The best of three configurations on the lowest rung is promoted
+        promoted = search.suggest(1)[0]
+        assert promoted.budget == 1 / 3 and promoted.parameters == max((t.parameters for t in first),
+                                                                       key=lambda p: p["x"])
+        search.observe(running[0], _metrics(running[0]))
+        search.observe(promoted, _metrics(promoted))
+
+        trials = first + running + [promoted] + [t for rung in _rungs(search) for t in rung]
+        budgets = {budget: [t.parameters["x"] for t in trials if t.budget == budget] for budget in (1 / 9, 1 / 3, 1.0)}
+        assert sorted(budgets[1 / 9]) == list(range(9))
+        assert {6, 7, 8} <= set(budgets[1 / 3]) and 8 in budgets[1.0]
+        assert search.best == ({"x": 8}, 0.8)
+
+
+if __name__ == '__main__':
+    unittest.main()
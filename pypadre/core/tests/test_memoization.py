@@ -0,0 +1,71 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from pypadre.core.model.code.code_mixin import Function, PipIdentifier
+from pypadre.core.util.memoization import MemoizationCache, fingerprint_array, make_cache
+
+
+def _function(source):
+    # Functions of the same name whose code isn't available as source
+    namespace = {}
+    exec(source, namespace)
+    return Function(fn=namespace["estimate"], repository_identifier=PipIdentifier("pypadre", "0.0.1"),
+                    transient=True)
+
+
+class TestMemoization(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_fingerprint(self):
+        assert fingerprint_array(np.arange(5)) == fingerprint_array(np.arange(5))
+        assert fingerprint_array(np.arange(5)) != fingerprint_array(np.arange(5, dtype=np.int32))
+        assert fingerprint_array(np.array(["a", None], dtype=object)) != fingerprint_array(None)
+
+    def test_code_fingerprint(self):
+        first = _function("def estimate(ctx):\n    return 1\n")
+        assert first.fingerprint() == _function("def estimate(ctx):\n    return 1\n").fingerprint()
+        assert first.fingerprint() != _function("def estimate(ctx):\n    return 2\n").fingerprint()
+        assert first.id == _function("def estimate(ctx):\n    return 2\n").id
+
+    def test_get_and_put(self):
+        cache = MemoizationCache(self.dir)
+        assert cache.get("ab01") == (False, None)
+        assert cache.put("ab01", {"model": [1, 2]})
+        assert cache.get("ab01") == (True, {"model": [1, 2]})
+        assert make_cache(None) is None
+        assert make_cache({"directory": self.dir}) is make_cache({"directory": self.dir})
+
+    def test_eviction(self):
+        cache = MemoizationCache(self.dir, max_bytes=2500)
+        for key in ["aa", "bb"]:
+            cache.put(key, b"x" * 1000)
+        # Use the older entry, so the other one is evicted first
+        time.sleep(0.01)
+        cache.get("aa")
+        cache.put("cc", b"x" * 1000)
+        assert cache.get("aa")[0] and cache.get("cc")[0] and not cache.get("bb")[0]
+        assert cache.size <= 2500
+
+    def test_running_size(self):
+        cache = MemoizationCache(self.dir)
+        cache.put("aa", b"x" * 1000)
+        size = cache.size
+        # Puts keep the total without listing the files again
+        shutil.rmtree(os.path.join(self.dir, "aa"))
+        cache.put("bb", b"x" * 1000)
+        cache.put("bb", b"x" * 1000)
+        assert cache.size == 2 * size
+
+
+if __name__ == '__main__':
+    unittest.main()
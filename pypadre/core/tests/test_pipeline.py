@@ -49,3 +49,149 @@
 #
 # if __name__ == '__main__':
 #     unittest.main()
+
+import unittest
+from types import SimpleNamespace
+
+from pypadre.core.events.events import CommonSignals, connect_class_signal
+from pypadre.core.model.computation.computation import Computation
+from pypadre.core.model.generic.branch_state import in_branch
+from pypadre.core.model.pipeline.components.component_mixins import ParameterizedPipelineComponentMixin
+from pypadre.core.model.pipeline.executors import ThreadExecutor
+from pypadre.core.model.pipeline.parameter_providers.bayesian import BayesianSearch
+from pypadre.core.model.pipeline.pipeline import Pipeline
+from pypadre.core.util.sampling import SearchSpace, Uniform
+
+
+class _RecordingSearch(BayesianSearch):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.requested = []
+
+    def suggest(self, n=None):
+        self.requested.append(n)
+        return super().suggest(n)
+
+
+class _Estimator(ParameterizedPipelineComponentMixin):
+    name = "estimator"
+
+    # noinspection PyMissingConstructor
+    def __init__(self):
+        self.searches = []
+
+    def combinations(self, *, run, predecessor, parameter_map):
+        search = _RecordingSearch(component=SimpleNamespace(id="estimator"), run=SimpleNamespace(id="run"),
+                                  parameters={}, space=SearchSpace({"alpha": Uniform(0, 1)}), n_trials=8,
+                                  n_initial=4)
+        self.searches.append(search)
+        return search
+
+
+class _Folds:
+    branch = True
+
+    @staticmethod
+    def iter_result():
+        return iter([0, 1])
+
+
+class _Pipeline:
+    """ Pipeline with a split into two folds followed by a searched estimator. """
+    _execute_folds = Pipeline._execute_folds
+    _execute_search = Pipeline._execute_search
+    _execute_trial = Pipeline._execute_trial
+
+    def __init__(self):
+        self.estimator = _Estimator()
+        self.branches = []
+
+    def successors(self, node):
+        return [self.estimator]
+
+    def send_info(self, **kwargs):
+        pass
+
+    def _execute_branch(self, node, parameters, *, data, **kwargs):
+        self.branches.append((data, in_branch()))
+        return {"classification_metrics": {"accuracy": 1 - abs(parameters["alpha"] - 0.3)}}
+
+
+class _Computation(SimpleNamespace):
+    """ Computation stored in a dict by its hash. """
+    branch = False
+    format = None
+
+    def send_put(self, **kwargs):
+        # Computations are put once, when they and their successors are done
+        assert self.metadata[Computation.HASH] not in self.stored and not kwargs.get("allow_overwrite", False)
+        self.stored[self.metadata[Computation.HASH]] = dict(self.metadata)
+
+
+class _ResumedPipeline:
+    """ Pipeline whose node branches into folds. The folds are counted instead of executed. """
+    _execute_pipeline_helper = Pipeline._execute_pipeline_helper
+    _resume_key = staticmethod(Pipeline._resume_key)
+    allow_metrics = False
+
+    def __init__(self, stored):
+        self.stored = stored
+        self.executed = 0
+
+    def out_degree(self, node):
+        return 1
+
+    def send_info(self, **kwargs):
+        pass
+
+    def _execute_folds(self, node, computation, executor, **kwargs):
+        self.executed += 1
+        return {"classification_metrics": {"accuracy": 0.75}}
+
+    def execute(self, **kwargs):
+        return _Computation(metadata={}, stored=self.stored)
+
+    def run(self, resume=True):
+        return self._execute_pipeline_helper(SimpleNamespace(id="split", name="split", execute=self.execute),
+                                             data=None, parameter_map=None, metrics_map=None,
+                                             write_parameters_map=SimpleNamespace(get_for=lambda node: {}),
+                                             run=SimpleNamespace(execution_id="execution", resume=resume))
+
+
+class TestPipelineExecution(unittest.TestCase):
+
+    def test_resume(self):
+        stored = {}
+
+        def get(sender, **kwargs):
+            if kwargs.get("metadata", False) and kwargs.get("hash") in stored:
+                kwargs[Computation.RETURN_VAL][Computation.RETURN_VAL] = stored[kwargs.get("hash")]
+
+        connect_class_signal(Computation, CommonSignals.GET.name, get)
+        try:
+            # The crashed or finished run doesn't need to resume itself
+            first = _ResumedPipeline(stored)
+            assert first.run(resume=False) == {"classification_metrics": {"accuracy": 0.75}} and first.executed == 1
+            assert len(stored) == 1
+            # The second run skips the completed subtree but reports its metrics
+            second = _ResumedPipeline(stored)
+            assert second.run() == {"classification_metrics": {"accuracy": 0.75}} and second.executed == 0
+        finally:
+            Computation.signals().get(CommonSignals.GET.name).disconnect(get)
+
+    def test_parallel_search_in_folds(self):
+        pipeline = _Pipeline()
+        results = pipeline._execute_folds(None, _Folds(), ThreadExecutor(4), run=None, parameter_map=None,
+                                          write_parameters_map=None, metrics_map=None)
+        # Each fold searches with the whole pool. Batches and pending trials are suggested for the free branches.
+        assert len(pipeline.estimator.searches) == 2
+        for search in pipeline.estimator.searches:
+            assert search.requested[0] == 4 and max(search.requested) > 1
+            assert len(search.history) == 8
+        assert sorted(data for data, _ in pipeline.branches) == [0] * 8 + [1] * 8
+        assert all(branched for _, branched in pipeline.branches)
+        assert 0 < results["classification_metrics"]["accuracy"] <= 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from pypadre.core.model.computation.predictions import Predictions, as_predictions
+
+
+class TestPredictions(unittest.TestCase):
+
+    def setUp(self):
+        self.predictions = Predictions(index=np.array([4, 2, 7]), truth=np.array([0, 1, 1]),
+                                       predicted=np.array([0, 0, 1]),
+                                       probabilities=np.array([[0.9, 0.1], [0.6, 0.4], [0.2, 0.8]]))
+
+    def test_dict_access(self):
+        rows = self.predictions.to_dict()
+        assert list(rows.keys()) == [4, 2, 7]
+        assert rows[2] == {"truth": 1, "predicted": 0, "probabilities": [0.6, 0.4]}
+        assert self.predictions.get(7)["predicted"] == 1 and self.predictions.get(3) is None
+        assert dict(self.predictions.items()) == rows
+        assert as_predictions(rows) == self.predictions
+
+        without = Predictions(index=[1], truth=["a"], predicted=["b"])
+        assert without[1] == {"truth": "a", "predicted": "b", "probabilities": []}
+        assert as_predictions(without.to_dict()).probabilities is None
+
+    def test_binary(self):
+        restored = pickle.loads(pickle.dumps(self.predictions))
+        assert restored == self.predictions
+        assert restored.probabilities.shape == (3, 2)
+        assert Predictions.from_bytes(self.predictions.to_bytes()) == self.predictions
+        self.assertRaises(ValueError, Predictions, index=[1, 2], truth=[1], predicted=[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+from itertools import islice
+
+import numpy as np
+
+from pypadre.core.util.sampling import SearchSpace, Uniform, LogUniform, IntUniform, sobol_points, \
+    latin_hypercube_points, MAX_SOBOL_DIMENSIONS
+
+
+class TestSampling(unittest.TestCase):
+
+    def test_sobol(self):
+        points = np.array(list(islice(sobol_points(2), 4)))
+        assert np.allclose(points, [[0, 0], [0.5, 0.5], [0.75, 0.25], [0.25, 0.75]])
+
+        # Every dimension of the first 2^k points is stratified, also with a random shift
+        points = np.array(list(islice(sobol_points(MAX_SOBOL_DIMENSIONS, np.random.RandomState(1)), 64)))
+        for d in range(MAX_SOBOL_DIMENSIONS):
+            assert sorted(np.floor(points[:, d] * 64).astype(int)) == list(range(64))
+
+    def test_latin_hypercube(self):
+        points = np.array(list(latin_hypercube_points(3, 10, np.random.RandomState(1))))
+        assert points.shape == (10, 3)
+        for d in range(3):
+            assert sorted(np.floor(points[:, d] * 10).astype(int)) == list(range(10))
+
+    def test_space(self):
+        space = SearchSpace({"C": LogUniform(1e-3, 1e3), "degree": IntUniform(1, 3), "kernel": ["rbf", "poly"],
+                             "tol": 0.1, "alpha": Uniform(0, 1)})
+        assert space.names == ["C", "degree", "kernel", "tol", "alpha"]
+        assert space.size is None
+        values = space.decode([0.5, 0.99, 0.2, 0.7, 0.25])
+        assert np.isclose(values[0], 1.0) and values[1:] == (3, "rbf", 0.1, 0.25)
+        decoded = space.decode(space.encode(values))
+        assert np.isclose(decoded[0], 1.0) and decoded[1:] == (3, "rbf", 0.1, 0.25)
+        assert SearchSpace({"a": [1, 2], "b": range(3)}).size == 6
+
+
+if __name__ == '__main__':
+    unittest.main()
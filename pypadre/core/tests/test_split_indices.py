@@ -0,0 +1,77 @@
+import unittest
+
+import numpy as np
+
+from pypadre.core.model.split.indices import cv_folds, complement, index_dtype, folds_of_assignment, \
+    stratified_assignment, group_assignment, stratified_holdout, time_series_folds, encode_indices, decode_indices
+
+
+class TestSplitIndices(unittest.TestCase):
+
+    def test_cv_folds(self):
+        folds = list(cv_folds(10, 3))
+        assert len(folds) == 3
+        for i, (train, test) in enumerate(folds):
+            assert train.dtype == np.int32 and test.dtype == np.int32
+            assert list(test) == list(range(i * 3, i * 3 + 3))
+            assert list(train) == sorted(set(range(10)) - set(test))
+        self.assertRaises(ValueError, lambda: list(cv_folds(2, 3)))
+
+    def test_complement(self):
+        assert list(complement(6, np.array([4, 0, 2]))) == [1, 3, 5]
+        assert index_dtype(2 ** 31) == np.int64
+
+    def test_stratified(self):
+        random_state = np.random.RandomState(0)
+        y = random_state.randint(0, 5, 1000)
+        fold = stratified_assignment(y, 4, random_state)
+        assert list(np.bincount(fold)) == [250] * 4
+        for label in range(5):
+            counts = np.bincount(fold[y == label], minlength=4)
+            assert counts.max() - counts.min() <= 1
+        for train, test in folds_of_assignment(fold, 4):
+            assert len(np.intersect1d(train, test)) == 0 and len(train) + len(test) == 1000
+
+        train, test = stratified_holdout(y.reshape(-1, 1), 0.25, random_state)
+        assert np.allclose(np.bincount(y[test]) / np.bincount(y), 0.25, atol=0.01)
+
+    def test_group(self):
+        groups = np.random.RandomState(0).randint(0, 30, 1000)
+        fold = group_assignment(groups, 4)
+        assert all(len(np.unique(fold[groups == g])) == 1 for g in range(30))
+        self.assertRaises(ValueError, group_assignment, groups, 31)
+
+    def test_time_series(self):
+        folds = list(time_series_folds(10, 3, gap=1))
+        assert [(list(train), list(test)) for train, test in folds] == \
+            [([0, 1, 2], [4, 5]), ([0, 1, 2, 3, 4], [6, 7]), ([0, 1, 2, 3, 4, 5, 6], [8, 9])]
+
+    def test_encoding(self):
+        random_state = np.random.RandomState(0)
+        shuffled = random_state.permutation(1000)
+        sparse = np.flatnonzero(random_state.random_sample(10000) < 0.5)
+        for idx, encoding in [(np.arange(100, 900), "ranges"), (np.r_[500:1000, 0:500], "ranges"),
+                              (sparse, "bitmap"), (shuffled, "array"), (np.array([], dtype=int), "ranges")]:
+            encoded = encode_indices(idx)
+            assert encoded["encoding"] == encoding
+            assert list(decode_indices(encoded)) == list(idx)
+        assert list(decode_indices([3, 1, 2])) == [3, 1, 2]
+        assert encode_indices(None) is None and decode_indices(None) is None
+
+    def test_validation(self):
+        from types import SimpleNamespace
+        from pypadre.core.model.dataset.dataset import Dataset
+        from pypadre.core.model.split.splitter import split
+
+        dataset = Dataset(name="validation", description="Validation rows", type="Multivariat")
+        dataset.set_data(np.arange(40.).reshape(20, 2))
+        ctx = {"data": dataset, "run": SimpleNamespace(id="run"), "component": SimpleNamespace(id="splitter")}
+        for strategy in ["random", "cv"]:
+            s = next(iter(split(ctx, strategy=strategy, test_ratio=0.25, n_folds=3, val_ratio=0.2)))
+            # The validation rows are the first fifth of the training rows
+            assert len(s.val_idx) == int((len(s.train_idx) + len(s.val_idx)) * 0.2)
+            assert len(set(s.train_idx) | set(s.val_idx) | set(s.test_idx)) == 20
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+
+from pypadre.core.util.surrogate import GaussianProcess, propose_gaussian_process, propose_tree_parzen
+
+
+def _score(x):
+    return -np.sum((np.asarray(x) - 0.3) ** 2, axis=-1)
+
+
+class TestSurrogate(unittest.TestCase):
+
+    def test_gaussian_process(self):
+        x = np.linspace(0, 1, 8).reshape(-1, 1)
+        process = GaussianProcess().fit(x, np.sin(6 * x[:, 0]))
+        mean, std = process.predict(np.array([[0.5]]))
+        assert abs(mean[0] - np.sin(3)) < 0.1 and std[0] < 0.2
+
+    def test_proposals(self):
+        for propose in [propose_gaussian_process, propose_tree_parzen]:
+            random_state = np.random.RandomState(1)
+            x = list(random_state.random_sample((5, 2)))
+            for _ in range(5):
+                batch = propose(x, _score(np.array(x)), 3, random_state)
+                assert len(batch) == 3
+                # Proposals of a batch differ
+                assert len({tuple(p) for p in batch}) == 3
+                x.extend(batch)
+            assert np.max(_score(np.array(x))) > -0.02
+
+
+if __name__ == '__main__':
+    unittest.main()
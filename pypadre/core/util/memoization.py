@@ -0,0 +1,198 @@
+import hashlib
+import os
+import tempfile
+import threading
+
+import dill
+import numpy as np
+
+# Default location and size of the cache of component results
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".pypadre", "memoization")
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+_POSTFIX = ".bin"
+
+
+def fingerprint_array(array):
+    """
+    Hash the content of an array.
+    :param array: Numpy array or None
+    :return: Hex digest
+    """
+    if array is None:
+        return "none"
+    array = np.ascontiguousarray(array)
+    h = hashlib.sha256(str((array.dtype, array.shape)).encode("utf-8"))
+    if array.dtype.hasobject:
+        h.update(dill.dumps(array.tolist()))
+    else:
+        h.update(array.data)
+    return h.hexdigest()
+
+
+class MemoizationCache:
+    """
+    Cache of component results on disk. Results are stored by a fingerprint of their inputs, so identical
+    computations of other runs, executions or experiments reuse them. The cache is bounded by the size of its files.
+    If it grows too large the least recently used results are removed.
+
+    directory
+      |------ab\
+      |      |------ab0123... .bin (fingerprint of the inputs)
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        :param directory: Directory of the cache
+        :param max_bytes: Maximal size of all cached results in bytes
+        """
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._bytes = None
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    def path(self, key):
+        return os.path.join(self._directory, key[:2], key + _POSTFIX)
+
+    def _files(self):
+        if not os.path.exists(self._directory):
+            return []
+        files = []
+        for prefix in os.listdir(self._directory):
+            folder = os.path.join(self._directory, prefix)
+            if os.path.isdir(folder):
+                files.extend(os.path.join(folder, name) for name in os.listdir(folder) if name.endswith(_POSTFIX))
+        return files
+
+    def _count(self):
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = sum(os.path.getsize(f) for f in self._files())
+            return self._bytes
+
+    @property
+    def size(self):
+        """
+        :return: Size of all cached results in bytes
+        """
+        return self._count()
+
+    def get(self, key):
+        """
+        Load a cached result. A hit marks the result as recently used.
+        :param key: Fingerprint of the inputs
+        :return: Tuple of a hit flag and the result
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                value = dill.load(f)
+            os.utime(path)
+            return True, value
+        except (OSError, EOFError, dill.UnpicklingError):
+            # Missing or evicted meanwhile by another process
+            return False, None
+
+    def put(self, key, value):
+        """
+        Cache a result and evict the least recently used results if the cache grew too large.
+        :param key: Fingerprint of the inputs
+        :param value: Result to cache
+        :return: True if the result was cached
+        """
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Count the existing files once. Afterwards a running total is kept.
+        self._count()
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                dill.dump(value, f)
+            size = os.path.getsize(tmp_path)
+            if size > self._max_bytes:
+                os.remove(tmp_path)
+                return False
+            # Writers of the same key write the same result. The last one wins.
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        # Results written by other processes sharing the cache are counted when the eviction lists the files
+        with self._lock:
+            self._bytes += size - previous
+            full = self._bytes > self._max_bytes
+        if full:
+            self.evict()
+        return True
+
+    def evict(self):
+        """
+        Remove the least recently used results until the cache fits its size.
+        :return: Number of removed results
+        """
+        if self.size <= self._max_bytes:
+            return 0
+        entries = []
+        for f in self._files():
+            try:
+                stat = os.stat(f)
+                entries.append((stat.st_mtime, stat.st_size, f))
+            except OSError:
+                pass
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, f in sorted(entries):
+            if total <= self._max_bytes:
+                break
+            try:
+                os.remove(f)
+            except OSError:
+                pass
+            total -= size
+            removed += 1
+        with self._lock:
+            self._bytes = total
+        return removed
+
+    def clear(self):
+        for f in self._files():
+            os.remove(f)
+        with self._lock:
+            self._bytes = 0
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def make_cache(memoize=None):
+    """
+    Get the cache for a memoization configuration like {"directory": "/tmp/memo", "max_bytes": 1024 ** 3}. Caches are
+    shared for the same directory.
+    :param memoize: Dict of the configuration, True for the default cache or a cache
+    :return: Cache or None if memoization is disabled
+    """
+    if memoize is None or memoize is False:
+        return None
+    if isinstance(memoize, MemoizationCache):
+        return memoize
+    if memoize is True:
+        memoize = {}
+    directory = os.path.expanduser(memoize.get("directory", DEFAULT_DIRECTORY))
+    max_bytes = memoize.get("max_bytes", DEFAULT_MAX_BYTES)
+    with _caches_lock:
+        cache = _caches.get(directory, None)
+        if cache is None or cache.max_bytes != max_bytes:
+            cache = MemoizationCache(directory, max_bytes)
+            _caches[directory] = cache
+        return cache
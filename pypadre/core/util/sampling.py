@@ -0,0 +1,303 @@
+"""
+Distributions of hyperparameters and samplers of the unit cube. A search space maps points of the unit cube to
+parameter combinations, so random, quasi-random and model based searches share the same description of the space.
+"""
+import math
+from abc import ABCMeta, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
+from scipy.special import ndtri
+
+RANDOM = "random"
+SOBOL = "sobol"
+LATIN_HYPERCUBE = "latin_hypercube"
+
+_BITS = 30
+
+# Primitive polynomials (degree s, coefficients a) and initial direction numbers m of the dimensions 2 to 21 of the
+# Sobol sequence by Joe and Kuo (new-joe-kuo-6.21201). The first dimension is the van der Corput sequence.
+_SOBOL_DIRECTIONS = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+]
+
+MAX_SOBOL_DIMENSIONS = len(_SOBOL_DIRECTIONS) + 1
+
+
+class Distribution:
+    """ Distribution of a hyperparameter given by its inverse cumulative distribution function. """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def ppf(self, u):
+        """
+        :param u: Quantile in [0, 1)
+        :return: Value of the parameter
+        """
+        raise NotImplementedError()
+
+    @property
+    def size(self):
+        """
+        :return: Number of distinct values or None for continuous distributions
+        """
+        return None
+
+    def cdf(self, value):
+        """
+        Inverse of ppf. Model based searches use it to map observed values back into the unit cube.
+        :param value: Value of the parameter
+        :return: Quantile in [0, 1]
+        """
+        raise NotImplementedError()
+
+
+class Uniform(Distribution):
+
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def ppf(self, u):
+        return self.low + u * (self.high - self.low)
+
+    def cdf(self, value):
+        return (value - self.low) / (self.high - self.low)
+
+    def __repr__(self):
+        return "Uniform(" + str(self.low) + ", " + str(self.high) + ")"
+
+
+class LogUniform(Distribution):
+    """ Uniform on the logarithmic scale. For example for learning rates or regularization constants. """
+
+    def __init__(self, low, high):
+        if low <= 0:
+            raise ValueError("The bounds of a log uniform distribution have to be positive.")
+        self.low = low
+        self.high = high
+
+    def ppf(self, u):
+        return math.exp(math.log(self.low) + u * (math.log(self.high) - math.log(self.low)))
+
+    def cdf(self, value):
+        return (math.log(value) - math.log(self.low)) / (math.log(self.high) - math.log(self.low))
+
+    def __repr__(self):
+        return "LogUniform(" + str(self.low) + ", " + str(self.high) + ")"
+
+
+class Normal(Distribution):
+
+    def __init__(self, mean=0.0, std=1.0):
+        self.mean = mean
+        self.std = std
+
+    def ppf(self, u):
+        # Keep the quantile away from 0 where the inverse is infinite
+        return self.mean + self.std * float(ndtri(min(max(u, 1e-12), 1 - 1e-12)))
+
+    def cdf(self, value):
+        return 0.5 * (1 + math.erf((value - self.mean) / (self.std * math.sqrt(2))))
+
+    def __repr__(self):
+        return "Normal(" + str(self.mean) + ", " + str(self.std) + ")"
+
+
+class IntUniform(Distribution):
+    """ Uniform over the integers from low to high (both included). """
+
+    def __init__(self, low, high):
+        self.low = int(low)
+        self.high = int(high)
+
+    @property
+    def size(self):
+        return self.high - self.low + 1
+
+    def ppf(self, u):
+        return self.low + min(int(u * self.size), self.size - 1)
+
+    def cdf(self, value):
+        return (value - self.low + 0.5) / self.size
+
+    def __repr__(self):
+        return "IntUniform(" + str(self.low) + ", " + str(self.high) + ")"
+
+
+class Choice(Distribution):
+    """ Uniform over a list of values. """
+
+    def __init__(self, values):
+        self.values = list(values)
+        if len(self.values) == 0:
+            raise ValueError("A choice needs at least one value.")
+
+    @property
+    def size(self):
+        return len(self.values)
+
+    def ppf(self, u):
+        return self.values[min(int(u * self.size), self.size - 1)]
+
+    def cdf(self, value):
+        return (self.values.index(value) + 0.5) / self.size
+
+    def __repr__(self):
+        return "Choice(" + str(self.values) + ")"
+
+
+def as_distribution(value):
+    """
+    Interpret a value of a parameter map. Lists are choices, dicts and other values are constants like in the grid
+    search.
+    :param value: Distribution, list of values or constant
+    :return: Distribution
+    """
+    if isinstance(value, Distribution):
+        return value
+    if isinstance(value, (list, tuple, range, np.ndarray)):
+        return Choice(value)
+    return Choice([value])
+
+
+class SearchSpace:
+    """ Product of the distributions of named parameters. Points of the unit cube are decoded into combinations. """
+
+    def __init__(self, parameters: dict):
+        """
+        :param parameters: Dict of parameter names and their distributions, lists of values or constants
+        """
+        self._distributions = OrderedDict((name, as_distribution(value)) for name, value in parameters.items())
+
+    @property
+    def names(self):
+        return list(self._distributions.keys())
+
+    @property
+    def distributions(self):
+        return list(self._distributions.values())
+
+    @property
+    def dimensions(self):
+        return len(self._distributions)
+
+    @property
+    def size(self):
+        """
+        :return: Number of distinct combinations or None if the space has continuous parameters
+        """
+        size = 1
+        for distribution in self._distributions.values():
+            if distribution.size is None:
+                return None
+            size *= distribution.size
+        return size
+
+    def decode(self, point):
+        """
+        :param point: Point of the unit cube
+        :return: Tuple of the parameter values
+        """
+        return tuple(distribution.ppf(float(u)) for distribution, u in zip(self._distributions.values(), point))
+
+    def encode(self, values):
+        """
+        :param values: Tuple of the parameter values
+        :return: Point of the unit cube
+        """
+        return np.array([distribution.cdf(value) for distribution, value in zip(self._distributions.values(), values)])
+
+
+def _sobol_directions(dimensions):
+    directions = [[1 << (_BITS - 1 - i) for i in range(_BITS)]]
+    for s, a, m in _SOBOL_DIRECTIONS[:dimensions - 1]:
+        v = [m[i] << (_BITS - 1 - i) for i in range(s)]
+        for i in range(s, _BITS):
+            x = v[i - s] ^ (v[i - s] >> s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    x ^= v[i - k]
+            v.append(x)
+        directions.append(v)
+    return directions
+
+
+def sobol_points(dimensions, random_state=None):
+    """
+    Sobol sequence in gray code order. The first 2^k points stratify every dimension into 2^k intervals.
+    :param dimensions: Number of dimensions
+    :param random_state: Random state for a random digital shift. Without it the sequence starts at the origin.
+    :return: Generator of points
+    """
+    if dimensions > MAX_SOBOL_DIMENSIONS:
+        raise ValueError("Sobol sequences are supported up to " + str(MAX_SOBOL_DIMENSIONS) + " dimensions.")
+    directions = _sobol_directions(dimensions)
+    x = [int(s) for s in random_state.randint(0, 1 << _BITS, size=dimensions)] if random_state is not None \
+        else [0] * dimensions
+    scale = float(1 << _BITS)
+    for n in range(1 << _BITS):
+        yield np.array(x) / scale
+        # Flip the direction number of the lowest zero bit of n
+        c = 0
+        while (n >> c) & 1:
+            c += 1
+        x = [xi ^ v[c] for xi, v in zip(x, directions)]
+
+
+def random_points(dimensions, random_state):
+    """
+    :return: Infinite generator of uniform points
+    """
+    while True:
+        yield random_state.random_sample(dimensions)
+
+
+def latin_hypercube_points(dimensions, n, random_state):
+    """
+    Latin hypercube sample. Every dimension is split into n intervals which contain exactly one point each.
+    :param n: Number of points
+    :return: Generator of points
+    """
+    strata = np.stack([random_state.permutation(n) for _ in range(dimensions)], axis=1) if dimensions > 0 \
+        else np.zeros((n, 0))
+    points = (strata + random_state.random_sample((n, dimensions))) / n
+    for point in points:
+        yield point
+
+
+def make_points(method, dimensions, random_state, n=None):
+    """
+    :param method: "random", "sobol" or "latin_hypercube"
+    :param n: Number of points. Needed for latin hypercubes.
+    :return: Generator of points of the unit cube
+    """
+    if method == RANDOM:
+        return random_points(dimensions, random_state)
+    if method == SOBOL:
+        return sobol_points(dimensions, random_state)
+    if method == LATIN_HYPERCUBE:
+        if n is None:
+            raise ValueError("A latin hypercube needs the number of trials.")
+        return latin_hypercube_points(dimensions, n, random_state)
+    raise ValueError("Unknown sampling method " + str(method) + ". Known methods are " +
+                     str([RANDOM, SOBOL, LATIN_HYPERCUBE]))
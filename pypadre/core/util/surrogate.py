@@ -0,0 +1,179 @@
+"""
+Surrogate models proposing the next points of a model based search. Points live in the unit cube of a search space
+(see pypadre.core.util.sampling) and scores are maximized. Proposals are made in batches. Points which were proposed
+but not yet scored are taken into account, so parallel branches don't evaluate the same region.
+"""
+import math
+
+import numpy as np
+from scipy.linalg import cho_factor, cho_solve
+from scipy.special import ndtr
+
+GAUSSIAN_PROCESS = "gaussian_process"
+TREE_PARZEN = "tree_parzen"
+
+_SQRT5 = math.sqrt(5)
+
+
+def _matern52(a, b, length_scale):
+    distance = np.sqrt(np.sum(((a[:, None, :] - b[None, :, :]) / length_scale) ** 2, axis=-1))
+    return (1 + _SQRT5 * distance + 5 / 3 * distance ** 2) * np.exp(-_SQRT5 * distance)
+
+
+class GaussianProcess:
+    """
+    Gaussian process regression with a Matern 5/2 kernel. The length scale and the noise are chosen from a small grid
+    by the marginal likelihood of the observations.
+    """
+
+    def __init__(self, length_scales=(0.05, 0.1, 0.2, 0.4, 0.8, 1.6), noises=(1e-6, 1e-3, 1e-1)):
+        self._length_scales = length_scales
+        self._noises = noises
+        self._x = None
+        self._factor = None
+        self._alpha = None
+        self._length_scale = None
+        self._mean = 0.0
+        self._std = 1.0
+
+    @property
+    def length_scale(self):
+        return self._length_scale
+
+    def fit(self, x, y):
+        """
+        :param x: Array of points (n x d)
+        :param y: Array of scores (n)
+        :return: The fitted process
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self._mean = y.mean()
+        self._std = y.std() if y.std() > 0 else 1.0
+        y = (y - self._mean) / self._std
+        best = None
+        for length_scale in self._length_scales:
+            kernel = _matern52(x, x, length_scale)
+            for noise in self._noises:
+                try:
+                    factor = cho_factor(kernel + (noise + 1e-9) * np.eye(len(x)), lower=True)
+                except np.linalg.LinAlgError:
+                    continue
+                alpha = cho_solve(factor, y)
+                likelihood = -0.5 * y.dot(alpha) - np.sum(np.log(np.diag(factor[0])))
+                if best is None or likelihood > best[0]:
+                    best = (likelihood, length_scale, factor, alpha)
+        _, self._length_scale, self._factor, self._alpha = best
+        self._x = x
+        return self
+
+    def predict(self, x):
+        """
+        :param x: Array of points (m x d)
+        :return: Tuple of the predicted means and standard deviations
+        """
+        k = _matern52(np.asarray(x, dtype=float), self._x, self._length_scale)
+        mean = k.dot(self._alpha)
+        variance = 1 - np.sum(k * cho_solve(self._factor, k.T).T, axis=1)
+        return mean * self._std + self._mean, np.sqrt(np.maximum(variance, 1e-12)) * self._std
+
+
+def expected_improvement(mean, std, best, xi=0.01):
+    """
+    :return: Expected improvement of normally distributed scores over the best score
+    """
+    improvement = mean - best - xi
+    z = improvement / std
+    return improvement * ndtr(z) + std * np.exp(-0.5 * z ** 2) / math.sqrt(2 * math.pi)
+
+
+def propose_gaussian_process(x, y, n, random_state, pending=None, n_candidates=1000):
+    """
+    Propose points maximizing the expected improvement. Batches are filled with the constant liar strategy: every
+    proposed or pending point is assumed to score as the worst observation, which pushes the next proposal elsewhere.
+    :param x: Observed points
+    :param y: Scores of the observed points
+    :param n: Number of points to propose
+    :param random_state: Random state drawing the candidates
+    :param pending: Points proposed before which are not yet scored
+    :param n_candidates: Number of random candidates the expected improvement is evaluated on
+    :return: List of points
+    """
+    x = [np.asarray(p, dtype=float) for p in x]
+    y = list(y)
+    best = max(y)
+    liar = min(y)
+    for point in pending or []:
+        x.append(np.asarray(point, dtype=float))
+        y.append(liar)
+    dimensions = len(x[0])
+    proposals = []
+    for _ in range(n):
+        process = GaussianProcess().fit(np.array(x), np.array(y))
+        # Candidates are spread over the cube and concentrated around the best observation
+        incumbent = x[int(np.argmax(y))]
+        local = incumbent + random_state.normal(0, 0.05, size=(n_candidates // 4, dimensions))
+        candidates = np.vstack([random_state.random_sample((n_candidates, dimensions)),
+                                np.clip(local, 0, 1 - 1e-9)])
+        mean, std = process.predict(candidates)
+        point = candidates[int(np.argmax(expected_improvement(mean, std, best)))]
+        proposals.append(point)
+        x.append(point)
+        y.append(liar)
+    return proposals
+
+
+def _log_parzen(candidates, points, bandwidth, prior_weight):
+    # Mixture of a gaussian around every point and a uniform prior over the cube
+    if len(points) == 0:
+        return np.zeros(len(candidates))
+    z = (candidates[:, None, :] - points[None, :, :]) / bandwidth
+    log_kernels = np.sum(-0.5 * z ** 2 - np.log(bandwidth * math.sqrt(2 * math.pi)), axis=-1)
+    peak = np.max(log_kernels, axis=1)
+    log_mixture = peak + np.log(np.mean(np.exp(log_kernels - peak[:, None]), axis=1))
+    return np.logaddexp(math.log(prior_weight), math.log(1 - prior_weight) + log_mixture)
+
+
+def _bandwidth(points):
+    if len(points) < 2:
+        return np.full(points.shape[1], 0.25)
+    return np.maximum(points.std(axis=0) * len(points) ** (-1 / (points.shape[1] + 4)), 0.02)
+
+
+def propose_tree_parzen(x, y, n, random_state, pending=None, gamma=0.25, n_candidates=100, prior_weight=0.1):
+    """
+    Propose points with a tree structured parzen estimator. The observations are split into the best gamma and the
+    rest. Candidates drawn around the best observations are ranked by the ratio of the densities of both groups.
+    Proposed and pending points count as bad observations, which diversifies batches.
+    :param x: Observed points
+    :param y: Scores of the observed points
+    :param n: Number of points to propose
+    :param random_state: Random state drawing the candidates
+    :param pending: Points proposed before which are not yet scored
+    :param gamma: Fraction of the observations counted as good
+    :return: List of points
+    """
+    x = np.asarray(x, dtype=float)
+    order = np.argsort(-np.asarray(y, dtype=float), kind="mergesort")
+    n_good = max(1, int(math.ceil(gamma * len(x))))
+    good = x[order[:n_good]]
+    bad = [x[i] for i in order[n_good:]] + [np.asarray(p, dtype=float) for p in pending or []]
+    good_bandwidth = _bandwidth(good)
+    proposals = []
+    for _ in range(n):
+        bad_points = np.array(bad).reshape(-1, x.shape[1])
+        centers = good[random_state.randint(0, len(good), size=n_candidates)]
+        candidates = np.clip(centers + random_state.normal(size=centers.shape) * good_bandwidth, 0, 1 - 1e-9)
+        ratio = _log_parzen(candidates, good, good_bandwidth, prior_weight) - \
+            _log_parzen(candidates, bad_points, _bandwidth(bad_points) if len(bad_points) > 0 else good_bandwidth,
+                        prior_weight)
+        point = candidates[int(np.argmax(ratio))]
+        proposals.append(point)
+        bad.append(point)
+    return proposals
+
+
+proposers = {
+    GAUSSIAN_PROCESS: propose_gaussian_process,
+    TREE_PARZEN: propose_tree_parzen
+}
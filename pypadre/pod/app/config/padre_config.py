@@ -44,8 +44,24 @@ class PadreConfig:
     [GENERAL]\n
     offline = True\n
     oml_key = openML_api_key\n
+    backends = [{'root_dir': '~/.pypadre/'}]\n
     ---------------------------------------
 
+    Every backend entry can additionally define
+    dataset_format: "pickle" or "columnar" storage of dataset binaries
+    serializers: dict of file kinds (results, metrics, parameters, dataset) and serialization formats of the
+    SerializerRegistry. For example {'results': 'zstd:msgpack', 'metrics': 'orjson'}
+    durability: "none" (default), "batch" or "always". Batch syncs the files of a transaction (for example a run) to the
+    disk at its end, always syncs every file when written
+    write_behind: True to store put objects in a background thread instead of blocking the execution
+    write_behind_queue_size: Number of puts which can be queued before putting blocks (default 1000)
+    blob_store: True to store results and dataset binaries once per content in a content addressed store under
+    root_dir/blobs. Files in git repositories (datasets, projects, experiments) store their blobs in the .blobs
+    directory of the repository, so they are committed with it. A list of file kinds can be given instead of True.
+    verify_blobs: True to rehash blobs on load. Otherwise only their size is checked.
+    cache: Memory budget of the object cache shared by the repositories in bytes and optional budgets per type. For
+    example {'max_bytes': 2147483648, 'budgets': {'Dataset': 1073741824}}
+
     Implemented functionality.
 
     1- Get list of dicts containing key, value pairs for all sections in config
@@ -94,7 +94,8 @@ class PadreApp(CoreApp):
                    preprocessing_fn=None, reference=None, reference_package=None, reference_git=None,
                    dataset: Union[Dataset, str], project_name=None, experiment_name=None,
                    project_description=None, seed=None, estimator=None, evaluator=None,
-                   experiment_description=None, auto_main=True, **kwargs):
+                   experiment_description=None, auto_main=True, concurrency=None, memoize=None,
+                   **kwargs):
         """
         Decorator for functions that return a single workflow to be executed in an experiment with name exp_name
         :param args: additional positional parameters to an experiment (replaces other positional parameters if longer)
@@ -107,6 +108,8 @@ class PadreApp(CoreApp):
         :param project_description:
         :param experiment_description:
         :param auto_main:
+        :param concurrency: Execution of the grid branches. For example {"executor": "thread", "max_workers": 8}
+        :param memoize: Cache of component results. True or for example {"directory": "/tmp/memo"}
         :param kwargs: kwarguments for experiments
         :return:
         """
@@ -156,7 +159,8 @@ class PadreApp(CoreApp):
             d = dataset if isinstance(dataset, Dataset) else self.datasets.get_by_name(dataset)
             experiment = self.experiments.create(
                 **filter_nones({"name": experiment_name, "description": experiment_description}),
-                project=project, pipeline=pipeline, dataset=d, reference=creator, seed=seed)
+                project=project, pipeline=pipeline, dataset=d, reference=creator, seed=seed,
+                concurrency=concurrency, memoize=memoize)
             if auto_main:
                 experiment.execute(parameters=parameters, **kwargs)
                 return experiment
@@ -215,10 +219,10 @@ class PadreApp(CoreApp):
             @wraps(f_create_splitter)
             def wrap_splitter(*args, **kwargs):
                 # here the custom splitter get called.
-                num = -1
+                num = 0
                 (data, run, component, predecessor) = unpack(args[0], "data", "run", "component", ("predecessor", None))
                 train_idx, test_idx, val_idx = f_create_splitter(data, **kwargs)
-                yield Split(run=run, num=++num, train_idx=train_idx, test_idx=test_idx,
+                yield Split(run=run, num=num, train_idx=train_idx, test_idx=test_idx,
                             val_idx=val_idx, component=component, predecessor=predecessor, **kwargs)
 
             creator = to_decorator_reference(variable=f_create_splitter.__name__,reference=reference, reference_package=reference_package,
@@ -282,8 +286,8 @@ class PadreApp(CoreApp):
                 split = data["split"]
 
                 component.send_error(message="Test set is missing.", condition=not split.has_testset())
-                train_idx = split.train_idx.tolist()
-                test_idx = split.test_idx.tolist()
+                train_idx = split.train_idx
+                test_idx = split.test_idx
                 y = split.test_targets.reshape((len(split.test_targets),))
                 X_test = split.test_features
                 component.send_start(message="Starting phase " + phases.inferencing)
@@ -292,9 +296,9 @@ class PadreApp(CoreApp):
                 results = SKLearnEvaluator.create_results_dictionary(split_num=split.number, train_idx=train_idx,
                                                                      test_idx=test_idx,
                                                                      dataset=split.dataset.name,
-                                                                     truth=y.tolist(), predicted=y_pred.tolist(),
+                                                                     truth=y, predicted=y_pred,
                                                                      type_=task_type,
-                                                                     probabilities=probabilities.tolist())
+                                                                     probabilities=probabilities)
 
                 return Evaluation(training=predecessor, result_format=task_type, result=results, component=component,
                                   run=run,
@@ -9,6 +9,7 @@ from pypadre.pod.repository.local.file.computation_repository import Computation
 from pypadre.pod.repository.local.file.dataset_repository import DatasetFileRepository
 from pypadre.pod.repository.local.file.execution_repository import ExecutionFileRepository
 from pypadre.pod.repository.local.file.experiment_repository import ExperimentFileRepository
+from pypadre.pod.repository.local.file.generic.blob_store import BlobStore
 from pypadre.pod.repository.local.file.metric_repository import MetricFileRepository
 from pypadre.pod.repository.local.file.pipeline_output_repository import PipelineOutputFileRepository
 from pypadre.pod.repository.local.file.project_repository import ProjectFileRepository
@@ -23,6 +24,7 @@ class PadreFileBackend(IPadreBackend):
     root_dir
       |------datasets\
       |------experiments\
+      |------blobs\ (only if the blob store is enabled)
     """
 
     def _get_time_as_string(self):
@@ -59,6 +61,8 @@ class PadreFileBackend(IPadreBackend):
         self._code = CodeFileRepository(self)
         self._pipeline_output = PipelineOutputFileRepository(self)
 
+        self._blob_store = None
+
         # logging
         self._file = None
 
@@ -69,6 +73,17 @@ class PadreFileBackend(IPadreBackend):
 
         # super.__del__()
 
+    @property
+    def blob_store(self):
+        """
+        Content addressed store for results and dataset binaries. Enabled by the "blob_store" entry of the
+        configuration.
+        :return: The blob store or None if it isn't enabled
+        """
+        if self._blob_store is None and self.config.get("blob_store", False):
+            self._blob_store = BlobStore(os.path.join(os.path.expanduser(self.root_dir), "blobs"))
+        return self._blob_store
+
     @property
     def dataset(self) -> DatasetFileRepository:
         return self._dataset
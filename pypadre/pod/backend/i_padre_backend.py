@@ -1,6 +1,9 @@
 from abc import abstractmethod
+from contextlib import contextmanager, ExitStack
 
+from pypadre.pod.backend.persistence_worker import PersistenceWorker
 from pypadre.pod.repository.generic.i_repository_mixins import ILogRepository
+from pypadre.pod.util.object_cache import ObjectCache, DEFAULT_MAX_BYTES
 from pypadre.pod.repository.i_repository import IComputationRepository, IMetricRepository, ICodeRepository, \
     IPipelineOutputRepository
 
@@ -14,6 +17,8 @@ class IPadreBackend(ILogRepository):
     def __init__(self, config, **kwargs):
         super().__init__(**kwargs)
         self._config = config
+        self._worker = None
+        self._cache = None
 
     @property
     def config(self):
@@ -31,6 +36,72 @@ class IPadreBackend(ILogRepository):
     def token(self):
         return self._config.get("token")
 
+    @property
+    def cache(self):
+        """
+        Object cache shared by all repositories of the backend. It is configured by the "cache" entry of the backend
+        configuration. (For example {"max_bytes": 2 * 1024 ** 3, "budgets": {"Dataset": 1024 ** 3}})
+        :return: The cache
+        """
+        if self._cache is None:
+            config = self._config.get("cache", {}) if self._config is not None else {}
+            self._cache = ObjectCache(max_bytes=config.get("max_bytes", DEFAULT_MAX_BYTES),
+                                      budgets=config.get("budgets", None))
+        return self._cache
+
+    @property
+    def worker(self):
+        """
+        Write behind worker of the backend. Puts are only written in the background if "write_behind" is set in the
+        configuration of the backend. The size of the queue is set by "write_behind_queue_size".
+        :return: The worker or None if puts are written synchronously
+        """
+        if self._worker is None and self._config is not None and self._config.get("write_behind", False):
+            self._worker = PersistenceWorker(max_size=self._config.get("write_behind_queue_size", 1000),
+                                             on_error=self.log_error)
+        return self._worker
+
+    def flush(self, raise_errors=False):
+        """
+        Wait until all puts queued for writing in the background are stored.
+        :param raise_errors: Raise a PersistenceError if puts failed
+        :return:
+        """
+        if self._worker is not None:
+            self._worker.flush(raise_errors=raise_errors)
+
+    def repositories(self):
+        """
+        :return: All repositories of the backend
+        """
+        repositories = []
+        for name in ["dataset", "project", "experiment", "execution", "run", "split", "computation", "metric", "code",
+                     "pipeline_output"]:
+            try:
+                repository = getattr(self, name)
+            except NotImplementedError:
+                continue
+            if repository is not None and repository not in repositories:
+                repositories.append(repository)
+        return repositories
+
+    @contextmanager
+    def transaction(self):
+        """
+        Open a transaction on all repositories of the backend. Writes of all repositories are batched until the
+        context ends.
+        :return:
+        """
+        with ExitStack() as stack:
+            for repository in self.repositories():
+                if hasattr(repository, "transaction"):
+                    if self.worker is not None:
+                        # The transaction has to be opened and closed on the thread executing the puts
+                        stack.enter_context(self.worker.context(repository.transaction()))
+                    else:
+                        stack.enter_context(repository.transaction())
+            yield self
+
     @property
     @abstractmethod
     def dataset(self) -> IDatasetRepository:
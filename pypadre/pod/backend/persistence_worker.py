@@ -0,0 +1,172 @@
+import atexit
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from contextlib import contextmanager
+from logging import error
+from queue import Queue
+
+from pypadre.pod.repository.exceptions import PersistenceError
+
+_STOP = object()
+
+
+class PersistenceWorker:
+    """
+    Write behind worker draining puts to the repositories of a backend in a background thread. Tasks are executed in
+    the order they were submitted, so all writes of an object (and of its parents) are applied in order. The queue is
+    bounded. If it is full, submit blocks until the worker caught up (backpressure). Remaining tasks are written when
+    the interpreter exits.
+
+    Objects are serialized when their task is executed and not when they are submitted. Changes made to an object in
+    the meantime are therefore also written.
+    """
+
+    def __init__(self, max_size=1000, on_error=None, name="padre-persistence"):
+        """
+        :param max_size: Maximal number of queued tasks
+        :param on_error: Function called with the error message of a failed task
+        :param name: Name of the thread
+        """
+        self._queue = Queue(maxsize=max_size)
+        self._on_error = on_error
+        self._name = name
+        self._pending = Counter()
+        self._condition = threading.Condition()
+        self._errors = []
+        self._thread = None
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    @property
+    def errors(self):
+        """
+        :return: List of (id, exception) tuples of the failed tasks
+        """
+        return list(self._errors)
+
+    @property
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _start(self):
+        with self._lock:
+            if not self.is_alive:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+
+    def submit(self, uid, fn, *args, **kwargs):
+        """
+        Queue a task. Blocks if the queue is full.
+        :param uid: Id of the object the task writes. None if the task doesn't belong to an object.
+        :param fn: Function to call
+        :return:
+        """
+        if threading.current_thread() is self._thread:
+            # Tasks submitted by a running task are executed directly to avoid waiting on ourselves
+            return fn(*args, **kwargs)
+        self._start()
+        with self._condition:
+            self._pending[uid] += 1
+        self._queue.put((uid, fn, args, kwargs))
+
+    def call(self, uid, fn, *args, **kwargs):
+        """
+        Execute a task on the worker thread in order with the other tasks and wait for it. Repositories keep the state
+        of their transactions per instance, therefore writes which have to be synchronous are executed here too
+        instead of on the calling thread.
+        :param uid: Id of the object the task writes
+        :param fn: Function to call
+        :return: Result of the function. Exceptions of the function are raised.
+        """
+        if threading.current_thread() is self._thread:
+            return fn(*args, **kwargs)
+        future = Future()
+
+        def _call():
+            try:
+                future.set_result(fn(*args, **kwargs))
+            except Exception as e:
+                future.set_exception(e)
+        self.submit(uid, _call)
+        return future.result()
+
+    @contextmanager
+    def context(self, manager):
+        """
+        Enter and exit a context manager on the worker thread in order with the other tasks. (For example a
+        transaction of a repository)
+        :param manager: Context manager
+        :return:
+        """
+        self.submit(None, manager.__enter__)
+        try:
+            yield self
+        finally:
+            self.submit(None, manager.__exit__, None, None, None)
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is _STOP:
+                    return
+                uid, fn, args, kwargs = task
+                try:
+                    fn(*args, **kwargs)
+                except Exception as e:
+                    self._report(uid, e)
+                finally:
+                    with self._condition:
+                        self._pending[uid] -= 1
+                        if self._pending[uid] <= 0:
+                            del self._pending[uid]
+                        self._condition.notify_all()
+            finally:
+                self._queue.task_done()
+
+    def _report(self, uid, e):
+        self._errors.append((uid, e))
+        message = "Couldn't store object " + str(uid) + "! " + str(e)
+        error(message)
+        if self._on_error is not None:
+            try:
+                self._on_error(message)
+            except Exception:
+                pass
+
+    def is_pending(self, uid):
+        with self._condition:
+            return self._pending[uid] > 0
+
+    def wait(self, uid):
+        """
+        Block until all queued tasks of the object with given id are written.
+        :param uid: Id of the object
+        :return:
+        """
+        if threading.current_thread() is self._thread:
+            return
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending[uid] <= 0 or not self.is_alive)
+
+    def flush(self, raise_errors=False):
+        """
+        Block until all queued tasks are written.
+        :param raise_errors: Raise a PersistenceError if tasks failed since the last flush
+        :return:
+        """
+        if self.is_alive and threading.current_thread() is not self._thread:
+            self._queue.join()
+        if raise_errors and self._errors:
+            errors, self._errors = self._errors, []
+            raise PersistenceError("Storing of " + str(len(errors)) + " objects failed.", errors)
+
+    def close(self):
+        """
+        Write all queued tasks and stop the worker thread.
+        :return:
+        """
+        if self.is_alive:
+            self._queue.put(_STOP)
+            self._thread.join()
@@ -1,2 +1,15 @@
 class ObjectAlreadyExists(RuntimeError):
     pass
+
+
+class PersistenceError(RuntimeError):
+    """ Raised if objects couldn't be stored by the write behind persistence worker. """
+
+    def __init__(self, message, errors):
+        super().__init__(message)
+        self.errors = errors
+
+
+class BlobIntegrityError(RuntimeError):
+    """ Raised if a blob of the blob store is missing or doesn't match its hash. """
+    pass
@@ -1,4 +1,5 @@
 from abc import ABCMeta, abstractmethod
+from contextlib import contextmanager
 
 from pypadre.core.util.inheritance import SuperStop
 
@@ -23,6 +24,13 @@ class IStoreableRepository:
         # TODO don't load object for better performance
         return self.get(uid) is not None
 
+    def exists_by_hash(self, hash):
+        return self.get_by_hash(hash) is not None
+
+    def get_metadata_by_hash(self, hash):
+        obj = self.get_by_hash(hash)
+        return obj.metadata if obj is not None else None
+
     def exists_object(self, obj):
         return self.exists(obj.id)
 
@@ -30,6 +38,24 @@ class IStoreableRepository:
     def put(self, obj, *args, merge=False, allow_overwrite=False, **kwargs):
         raise NotImplementedError()
 
+    def put_many(self, objs, *args, **kwargs):
+        """
+        Put multiple objects as one batch.
+        :param objs: Objects to put
+        :return: List of the results of put
+        """
+        with self.transaction():
+            return [self.put(obj, *args, **kwargs) for obj in objs]
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context grouping the puts within into one batch. Repositories which can buffer their writes flush them at the
+        end of the outermost transaction. By default every put is written directly.
+        :return:
+        """
+        yield self
+
     @abstractmethod
     def delete_by_id(self, uid):
         raise NotImplementedError()
@@ -64,7 +90,10 @@ class ISearchable:
     @staticmethod
     def in_search(obj, search: dict):
         # TODO Enable more sophisticated search
-        return all([hasattr(obj, k) and getattr(obj, k) == v for k, v in search.items()])
+        metadata = getattr(obj, "metadata", None)
+        metadata = metadata if isinstance(metadata, dict) else {}
+        return all([metadata[k] == v if k in metadata else hasattr(obj, k) and getattr(obj, k) == v
+                    for k, v in search.items()])
 
 
 class IProgressableRepository(SuperStop):
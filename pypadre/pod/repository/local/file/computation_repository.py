@@ -1,6 +1,7 @@
 from types import GeneratorType
 
 from pypadre.core.model.computation.computation import Computation
+from pypadre.core.model.computation.hyper_parameter_search import ParameterGrid
 from pypadre.core.model.generic.lazy_loader import SimpleLazyObject
 from pypadre.pod.backend.i_padre_backend import IPadreBackend
 from pypadre.pod.repository.i_repository import IComputationRepository
@@ -11,9 +12,10 @@ from pypadre.pod.repository.serializer.serialiser import JSonSerializer, DillSer
 NAME = "computations"
 
 META_FILE = File("metadata.json", JSonSerializer)
-PARAMETER_FILE = File("parameters.json", JSonSerializer)
-METRIC_FILE = File("metrics.json", JSonSerializer)
-RESULT_FILE = File("results.bin", DillSerializer)
+PARAMETER_FILE = File("parameters.json", JSonSerializer, kind="parameters")
+METRIC_FILE = File("metrics.json", JSonSerializer, kind="metrics")
+RESULT_FILE = File("results.bin", DillSerializer, kind="results")
+GRID_FILE = File("grid.bin", DillSerializer)
 INITIAL_HYPERPARAMETERS = File("initial_hyperparameters.json", JSonSerializer)
 
 
@@ -29,6 +31,9 @@ class ComputationFileRepository(IChildFileRepository, ILogFileRepository, ICompu
     def _get_by_dir(self, directory):
         metadata = self.get_file(directory, META_FILE)
         result = self.get_file(directory, RESULT_FILE)
+        grid = self.get_file(directory, GRID_FILE)
+        if grid is not None:
+            result = ParameterGrid.from_dict(grid)
         hyper_parameters = self.get_file(directory, INITIAL_HYPERPARAMETERS)
         metric = self.get_file(directory, METRIC_FILE)
         parameters = self.get_file(directory, PARAMETER_FILE, {})
@@ -55,7 +60,11 @@ class ComputationFileRepository(IChildFileRepository, ILogFileRepository, ICompu
         if computation.parameters != {}:
             self.write_file(directory, PARAMETER_FILE, computation.parameters)
         self.write_file(directory, INITIAL_HYPERPARAMETERS, computation.initial_hyperparameters)
-        if not isinstance(computation.result, GeneratorType) and store_results:
+        if isinstance(computation.result, ParameterGrid):
+            # Grids are stored by their names and value lists instead of their combinations
+            self.write_file(directory, GRID_FILE, computation.result.to_dict())
+        elif not isinstance(computation.result, GeneratorType) and store_results:
+            # The result is streamed into the file by the serializer
             self.write_file(directory, RESULT_FILE, computation.result, mode='wb')
         if computation.metrics:
-            self.write_file(directory, RESULT_FILE, computation.result)
+            self.write_file(directory, METRIC_FILE, computation.metrics)
@@ -8,11 +8,16 @@ from pypadre.pod.backend.i_padre_backend import IPadreBackend
 from pypadre.pod.repository.i_repository import IDatasetRepository
 from pypadre.pod.repository.local.file.generic.i_file_repository import File
 from pypadre.pod.repository.local.file.generic.i_git_repository import IGitRepository
+from pypadre.pod.repository.serializer.columnar_serializer import ColumnarSerializer
 from pypadre.pod.repository.serializer.serialiser import JSonSerializer, PickleSerializer
 from pypadre.pod.util.git_util import add_git_lfs_attribute_file
 
 META_FILE = File("metadata.json", JSonSerializer)
-DATA_FILE = File("data.bin", PickleSerializer)
+DATA_FILE = File("data.bin", PickleSerializer, kind="dataset")
+COLUMNAR_DATA_DIR = "data"
+
+PICKLE_FORMAT = "pickle"
+COLUMNAR_FORMAT = "columnar"
 
 
 NAME = "datasets"
@@ -27,12 +32,31 @@ class DatasetFileRepository(IGitRepository, IDatasetRepository):
     def __init__(self, backend: IPadreBackend):
         super().__init__(root_dir=os.path.join(backend.root_dir, NAME), backend=backend)
 
+    @property
+    def data_format(self):
+        """
+        Format used to store the binary of a dataset. This can be set by the "dataset_format" entry of the backend
+        configuration. "pickle" dumps the whole binary into a single file, "columnar" stores every column in its own
+        file which can be memory mapped on load.
+        :return: Format of the binary
+        """
+        config = self.backend.config if self.backend is not None else None
+        return config.get("dataset_format", PICKLE_FORMAT) if config is not None else PICKLE_FORMAT
+
     def _put(self, obj, *args, directory: str, merge=False, **kwargs):
         dataset = obj
 
+        data = dataset.data()
+        # The fingerprint is stored in the metadata, so loaded datasets don't have to hash their binary again
+        dataset.fingerprint()
         self.write_file(directory, META_FILE, dataset.metadata)
-        self.write_file(directory, DATA_FILE, dataset.data(), 'wb')
-        add_git_lfs_attribute_file(directory, "*.bin", message="Adding the metadata and the binary dump of the dataset")
+        if self.data_format == COLUMNAR_FORMAT and ColumnarSerializer.can_write(data):
+            ColumnarSerializer.write(os.path.join(directory, COLUMNAR_DATA_DIR), data)
+            add_git_lfs_attribute_file(directory, "*.npy", message="Adding the metadata and the columns of the dataset")
+        else:
+            self.write_file(directory, DATA_FILE, data, 'wb')
+            add_git_lfs_attribute_file(directory, "*.bin",
+                                       message="Adding the metadata and the binary dump of the dataset")
 
     def _get_by_dir(self, directory):
         if len(directory) == 0:
@@ -45,8 +69,15 @@ class DatasetFileRepository(IGitRepository, IDatasetRepository):
 
         ds = Dataset(metadata=metadata)
 
-        if self.has_file(os.path.join(self.root_dir, directory), DATA_FILE):
-            # TODO: Implement lazy loading of the dataset
+        if ColumnarSerializer.has_manifest(os.path.join(self.root_dir, directory, COLUMNAR_DATA_DIR)):
+            def _load_data():
+                # Columns are memory mapped and only read on access
+                return ColumnarSerializer.read(os.path.join(self.root_dir, directory, COLUMNAR_DATA_DIR))
+            ds.add_proxy_loader(_load_data)
+            # The manifest is small and lets caches account the dataset by its stored dtypes before it is loaded
+            manifest = ColumnarSerializer.read_manifest(os.path.join(self.root_dir, directory, COLUMNAR_DATA_DIR))
+            ds.set_dtypes([column["dtype"] for column in manifest["columns"]])
+        elif self.has_file(os.path.join(self.root_dir, directory), DATA_FILE):
             def _load_data():
                 return self.get_file(os.path.join(self.root_dir, directory), DATA_FILE)
             ds.add_proxy_loader(_load_data)
@@ -60,7 +60,7 @@ class ExperimentFileRepository(IChildFileRepository, IGitRepository, IExperiment
         # preprocess_workflow = self.get_file(path, PREPROCESS_WORKFLOW_FILE)
 
         executions = SimpleLazyObject(
-            load_fn=lambda: self.backend.execution.list({'experiment_id': metadata.get("id")}))
+            load_fn=lambda: self.backend.execution.list({'experiment_id': metadata.get("id")}, size=None))
 
         project = self.backend.project.get(metadata.get(Experiment.PROJECT_ID))
         dataset = self.backend.dataset.get(metadata.get(Experiment.DATASET_ID))
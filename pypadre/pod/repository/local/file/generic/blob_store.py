@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import tempfile
+
+from pypadre.pod.repository.exceptions import BlobIntegrityError
+
+# Files stored in the blob store are replaced by a small reference file with this postfix
+REFERENCE_POSTFIX = ".ref"
+
+# Directory of the blob store of a git repository. Blobs of files in a repository are stored inside of it, so they are
+# committed, pushed and cloned together with their references.
+REPOSITORY_BLOB_DIR = ".blobs"
+
+_CHUNK_SIZE = 1 << 20
+
+
+class _HashingWriter:
+    """
+    File object wrapper hashing all bytes written through it.
+    """
+
+    def __init__(self, f):
+        self._f = f
+        self._hash = hashlib.sha256()
+        self._size = 0
+
+    @property
+    def closed(self):
+        return self._f.closed
+
+    @property
+    def size(self):
+        return self._size
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._hash.update(data)
+        self._size += len(data)
+        return self._f.write(data)
+
+    def tell(self):
+        return self._size
+
+    def flush(self):
+        self._f.flush()
+
+
+class BlobStore:
+    """
+    Content addressed store of serialized objects. Every blob is stored under the sha256 hash of its bytes, so equal
+    results, models or datasets are only stored once no matter how many objects reference them.
+
+    root_dir
+      |------ab\
+      |      |------cdef0123... (remaining characters of the hash)
+    """
+
+    def __init__(self, root_dir):
+        self._root_dir = root_dir
+
+    @property
+    def root_dir(self):
+        return self._root_dir
+
+    def path(self, digest):
+        return os.path.join(self._root_dir, digest[:2], digest[2:])
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put(self, write_fn, fsync=False):
+        """
+        Store the bytes written by write_fn. The bytes are streamed into a temporary file and hashed on the fly. The
+        file is then moved to its address or dropped if the blob already exists.
+        :param write_fn: Function writing into the given binary file object
+        :param fsync: Sync the blob to the disk before moving it to its address
+        :return: Tuple of the hash and the size of the blob
+        """
+        if not os.path.exists(self._root_dir):
+            os.makedirs(self._root_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._root_dir, prefix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer = _HashingWriter(f)
+                write_fn(writer)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            digest = writer.hexdigest()
+            path = self.path(digest)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+            return digest, writer.size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def put_bytes(self, data: bytes, fsync=False):
+        return self.put(lambda f: f.write(data), fsync=fsync)
+
+    def check(self, digest, size=None):
+        """
+        Check the integrity of a blob.
+        :param digest: Hash of the blob
+        :param size: Expected size. Only the size is compared if given, which doesn't need to read the blob.
+        :return: True if the blob is intact
+        """
+        path = self.path(digest)
+        if not os.path.exists(path):
+            return False
+        if size is not None:
+            return os.path.getsize(path) == size
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                h.update(chunk)
+        return h.hexdigest() == digest
+
+    def open(self, digest, size=None, verify=False):
+        """
+        Open a blob for reading.
+        :param digest: Hash of the blob
+        :param size: Expected size of the blob. The size is checked before opening.
+        :param verify: Rehash the whole blob before opening
+        :return: Binary file object
+        """
+        if not self.exists(digest):
+            raise BlobIntegrityError("Blob " + digest + " is missing in " + self._root_dir + ".")
+        if (size is not None and not self.check(digest, size)) or (verify and not self.check(digest)):
+            raise BlobIntegrityError("Blob " + digest + " in " + self._root_dir + " is corrupted.")
+        return open(self.path(digest), "rb")
+
+    def digests(self):
+        """
+        :return: Hashes of all stored blobs
+        """
+        if not os.path.exists(self._root_dir):
+            return []
+        return [prefix + name for prefix in os.listdir(self._root_dir)
+                if os.path.isdir(os.path.join(self._root_dir, prefix))
+                for name in os.listdir(os.path.join(self._root_dir, prefix))]
+
+    def collect(self, referenced, candidates=None):
+        """
+        Remove all blobs which aren't referenced anymore.
+        :param referenced: Hashes of the referenced blobs
+        :param candidates: Hashes of the blobs to check. Defaults to all blobs.
+        :return: Hashes of the removed blobs
+        """
+        referenced = set(referenced)
+        candidates = self.digests() if candidates is None else candidates
+        removed = [digest for digest in set(candidates) if digest not in referenced and self.exists(digest)]
+        for digest in removed:
+            os.remove(self.path(digest))
+        return removed
+
+    @staticmethod
+    def references(directory):
+        """
+        :param directory: Directory to search
+        :return: Set of the hashes referenced by the reference files in the directory and its subdirectories
+        """
+        referenced = set()
+        for path, dirs, files in os.walk(directory):
+            dirs[:] = [d for d in dirs if d not in (".git", REPOSITORY_BLOB_DIR)]
+            for name in files:
+                if name.endswith(REFERENCE_POSTFIX):
+                    try:
+                        referenced.add(BlobStore.read_reference(os.path.join(path, name))[0])
+                    except (ValueError, KeyError, OSError):
+                        pass
+        return referenced
+
+    @staticmethod
+    def write_reference(path, digest, size):
+        with open(path, "w") as f:
+            f.write(json.dumps({"blob": digest, "size": size}))
+
+    @staticmethod
+    def read_reference(path):
+        with open(path, "r") as f:
+            reference = json.loads(f.read())
+        return reference["blob"], reference.get("size", None)
@@ -1,23 +1,27 @@
 import os
 import shutil
 from abc import abstractmethod, ABCMeta
+from contextlib import contextmanager
 from logging import warning
 
-from cachetools import LRUCache, cached
-
 from pypadre.core.base import ChildMixin
 from pypadre.core.model.generic.i_storable_mixin import StoreableMixin
-from pypadre.core.util.utils import remove_cached
 from pypadre.pod.backend.i_padre_backend import IPadreBackend
 from pypadre.pod.repository.exceptions import ObjectAlreadyExists
 from pypadre.pod.repository.generic.i_repository_mixins import IStoreableRepository, ISearchable, IRepository
+from pypadre.pod.repository.local.file.generic.blob_store import BlobStore, REFERENCE_POSTFIX, REPOSITORY_BLOB_DIR
+from pypadre.pod.repository.local.file.generic.metadata_index import MetadataIndex, INDEX_FILE_POSTFIX
+from pypadre.pod.repository.serializer.serialiser import JSonSerializer
+from pypadre.pod.repository.serializer.serializer_registry import SerializerRegistry
 from pypadre.pod.util.file_util import get_path
+from pypadre.pod.util.object_cache import ObjectCache
 
 
 class File:
-    def __init__(self, name, serializer):
+    def __init__(self, name, serializer, kind=None):
         self._name = name
         self._serializer = serializer
+        self._kind = kind
 
     @property
     def name(self):
@@ -35,6 +39,38 @@ class File:
         """
         return self._serializer
 
+    @property
+    def kind(self):
+        """
+        Kind of the file (for example results or metrics). The serialization format of a kind can be configured in the
+        "serializers" entry of the backend configuration.
+        :return: Kind of the file or None if the format is fixed
+        """
+        return self._kind
+
+
+META_FILE = File("metadata.json", JSonSerializer)
+
+# Durability of written files. The level is configured in the "durability" entry of the backend configuration.
+# none: Files are left to the buffers of the operating system.
+# batch: Files written in a transaction are synced to the disk once at its end. Puts outside of a transaction are synced
+# directly.
+# always: Every file is synced to the disk when it is written.
+DURABILITY = "durability"
+DURABILITY_NONE = "none"
+DURABILITY_BATCH = "batch"
+DURABILITY_ALWAYS = "always"
+
+
+# Kinds of files stored in the blob store if the "blob_store" entry of the backend configuration is set to True. The
+# entry can also list the kinds explicitly.
+BLOB_KINDS = ["results", "dataset"]
+
+
+def _fsync(path):
+    with open(path, "rb") as f:
+        os.fsync(f.fileno())
+
 
 class IFileRepository(IRepository, ISearchable, IStoreableRepository):
     """ This is the abstract class implementation of a backend storing its information onto the disk in a file
@@ -46,9 +82,136 @@ class IFileRepository(IRepository, ISearchable, IStoreableRepository):
     @abstractmethod
     def __init__(self, *, root_dir: str, backend: IPadreBackend, **kwargs):
         self.root_dir = root_dir
-        self._cache = LRUCache(maxsize=16)
+        self._cache = None
+        self._index = None
+        self._directories = None
+        # Files written in the currently open transaction. None if no transaction is open.
+        self._written = None
         super().__init__(backend=backend, **kwargs)
 
+    @property
+    def index(self):
+        """
+        Metadata index of the repository. The index is built by scanning the file system on first access if it doesn't
+        exist yet and is kept up to date by put and delete afterwards.
+        :return: The metadata index
+        """
+        if self._index is None:
+            index = MetadataIndex(self._index_path())
+            if not index.exists():
+                self._rebuild_index(index)
+            self._index = index
+        return self._index
+
+    def rebuild_index(self):
+        """
+        Rebuild the metadata index from the file system. This is only needed if the repository was changed without
+        using put or delete. (For example by copying or pulling folders manually.)
+        :return:
+        """
+        self._index = None
+        self._directories = None
+        index = MetadataIndex(self._index_path())
+        self._rebuild_index(index)
+        self._index = index
+
+    @property
+    def directories(self):
+        """
+        Map of object ids to their directories. The map is loaded from the index on first access and kept up to date by
+        put and delete. Ids are stored as strings, like in the index.
+        :return: Dict of ids and directories
+        """
+        if self._directories is None:
+            self._directories = self.index.directories()
+        return self._directories
+
+    @property
+    def cache(self):
+        """
+        Cache of loaded objects. The cache is shared with the other repositories of the backend.
+        :return: The cache
+        """
+        if self._cache is None:
+            cache = getattr(self.backend, "cache", None) if self.backend is not None else None
+            self._cache = cache if cache is not None else ObjectCache()
+        return self._cache
+
+    def _cache_key(self, uid):
+        return self.__class__.__name__, str(uid)
+
+    @property
+    def durability(self):
+        config = getattr(self.backend, "config", None) if self.backend is not None else None
+        durability = config.get(DURABILITY, DURABILITY_NONE) if config is not None else DURABILITY_NONE
+        if durability not in [DURABILITY_NONE, DURABILITY_BATCH, DURABILITY_ALWAYS]:
+            raise ValueError("Unknown durability " + str(durability) + ".")
+        return durability
+
+    @property
+    def in_transaction(self):
+        return self._written is not None
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group all puts within the context into one batch, which is flushed at the end of the outermost transaction.
+        Index updates share one sqlite connection but are committed per put, so the index stays complete if the batch
+        never ends and other processes can still write to it.
+        :return:
+        """
+        if self.in_transaction:
+            yield self
+            return
+        self._written = []
+        try:
+            with self.index.batch():
+                yield self
+        finally:
+            written, self._written = self._written, None
+            self.flush(written)
+
+    def flush(self, written):
+        """
+        Called at the end of a batch.
+        :param written: Paths of the files written in the batch
+        :return:
+        """
+        if self.durability == DURABILITY_BATCH:
+            for path in written:
+                if os.path.exists(path):
+                    _fsync(path)
+
+    def _rebuild_index(self, index):
+        entries = []
+        for directory in self._get_all_dirs():
+            directory = os.path.normpath(directory)
+            metadata = self._get_metadata_by_dir(directory)
+            if isinstance(metadata, dict) and "id" in metadata:
+                entries.append((metadata["id"], directory, os.path.basename(directory), metadata))
+        index.rebuild(entries)
+
+    def _index_path(self):
+        # The index is placed next to the first placeholder of the root dir to cover all objects of the repository
+        root_dir = os.path.expanduser(self.root_dir)
+        if "{" in root_dir:
+            base_dir = os.path.dirname(root_dir[:root_dir.index("{")])
+        else:
+            base_dir = root_dir
+        return os.path.join(base_dir, "." + os.path.basename(os.path.normpath(root_dir)) + INDEX_FILE_POSTFIX)
+
+    def _get_metadata_by_dir(self, directory):
+        """
+        Loads only the metadata of an object without deserializing the object itself.
+        :param directory: Directory of the object
+        :return: Metadata dict or None
+        """
+        try:
+            return self.get_file(directory, META_FILE)
+        except Exception as e:
+            warning("Couldn't load metadata in dir " + str(directory) + ". Error: " + str(e))
+            return None
+
     def get(self, uid):
         """
         Gets the object via uid. This might have to scan the metadatas on the local file system.
@@ -56,39 +219,93 @@ class IFileRepository(IRepository, ISearchable, IStoreableRepository):
         :return:
         """
 
-        # noinspection PyShadowingNames
-        @cached(self._cache)
-        def cached_get(uid):
+        def _load():
             directory = self.find_dir_by_id(uid)
             if directory is None:
                 return None
             return self.get_by_dir(directory)
 
-        return cached_get(uid=uid)
+        return self.cache.get_or_load(self._cache_key(uid), _load)
 
     def get_by_hash(self, hash):
-        return next(iter(self.list({StoreableMixin.HASH: hash})), None)
+        return next(iter(self.list({StoreableMixin.HASH: hash}, size=1)), None)
+
+    def exists(self, uid):
+        return self.find_dir_by_id(uid) is not None
+
+    def exists_by_hash(self, hash):
+        return self.get_metadata_by_hash(hash) is not None
+
+    def get_metadata_by_hash(self, hash):
+        # Only load the metadata file instead of the object
+        metadata = self._get_metadata_by_hash(hash)
+        if metadata is None and self._index_unknown_dirs():
+            # The object might have been written without updating the index, for example by a process which crashed
+            metadata = self._get_metadata_by_hash(hash)
+        return metadata
+
+    def _get_metadata_by_hash(self, hash):
+        for directory in self.index.find({StoreableMixin.HASH: hash}, strict=True):
+            if self.has_dir(directory):
+                return self._get_metadata_by_dir(directory)
+        return None
+
+    def _index_unknown_dirs(self):
+        """
+        Scan the file system for objects missing in the index and add them. Only the metadata files of unknown
+        directories are read.
+        :return: True if objects were added to the index
+        """
+        known = set(self.directories.values())
+        added = False
+        for directory in self._get_all_dirs():
+            directory = os.path.normpath(directory)
+            if directory in known or not self.has_file(directory, META_FILE):
+                continue
+            metadata = self._get_metadata_by_dir(directory)
+            if isinstance(metadata, dict) and "id" in metadata:
+                self.index.put(metadata["id"], directory, os.path.basename(directory), metadata)
+                self.directories[str(metadata["id"])] = directory
+                added = True
+        return added
 
     def exists_object(self, obj):
         try:
-            return self.get_by_dir(self.to_directory(obj)) is not None
+            # Only check for the metadata file instead of loading the object
+            return self.has_file(self.to_directory(obj), META_FILE)
         except:
             return False
 
     def list(self, search, offset=0, size=100):
         """
-        List all objects in the repository
-        :param offset:
-        :param size:
+        List all objects in the repository. Candidates are looked up in the metadata index and only these are loaded.
+        :param offset: Number of matching objects to skip
+        :param size: Maximal number of objects to return. None for all matching objects.
         :param search: search object. You can pass key value pairs to search for.
         """
         folder = None
         if search is not None and self.FOLDER_SEARCH in search:
+            search = dict(search)
             folder = search.pop(self.FOLDER_SEARCH)
-        dirs = self.find_dirs(folder)
-        # TODO look into metadata file without loading the object to increase performance and filter sooner
-        # TODO add offset und size
-        return self.filter([self.get_by_dir(d) for d in dirs], search)
+
+        objs = []
+        skipped = 0
+        for directory in self.index.find(search, folder=folder):
+            if size is not None and len(objs) >= size:
+                break
+            if not self.has_dir(directory):
+                # The object was removed without using the repository
+                self.index.remove_directory(directory)
+                self._directories = None
+                continue
+            obj = self.get_by_dir(directory)
+            if obj is None or (search is not None and not self.in_search(obj, search)):
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            objs.append(obj)
+        return objs
 
     def delete_by_id(self, uid):
         """
@@ -104,8 +321,10 @@ class IFileRepository(IRepository, ISearchable, IStoreableRepository):
         :param obj: Object to delete
         :return:
         """
-        remove_cached(self._cache, obj.id)
+        self.cache.invalidate(self._cache_key(obj.id))
         self.delete_dir(self.to_directory(obj))
+        self.index.remove(obj.id)
+        self.directories.pop(str(obj.id), None)
 
     def put(self, obj, *args, merge=False, allow_overwrite=False, **kwargs):
         """
@@ -130,11 +349,14 @@ class IFileRepository(IRepository, ISearchable, IStoreableRepository):
             shutil.rmtree(directory)
         os.makedirs(directory)
 
-        remove_cached(self._cache, obj.id)
+        self.cache.invalidate(self._cache_key(obj.id))
 
         # Put data of the object
         self._put(obj, *args, directory=directory, merge=merge, **kwargs)
 
+        self.index.put(obj.id, os.path.normpath(directory), self.to_folder_name(obj), obj.metadata)
+        self.directories[str(obj.id)] = os.path.normpath(directory)
+
     @abstractmethod
     def _put(self, obj, *args, directory: str, merge=False, **kwargs):
         """
@@ -177,15 +399,24 @@ class IFileRepository(IRepository, ISearchable, IStoreableRepository):
 
     def find_dir_by_id(self, uid):
         """
-        Find a dir by searching for the corresponding id of the object.
+        Find a dir by looking up the id in the id to directory map of the repository.
         :param uid: Id to search for
         :return: Directory of the object
         """
-        # TODO: Change the hardcoded 'id' to a key value to be searched
-        dirs = self.get_dirs_by_search({'id': uid})
-        if len(dirs) > 1:
-            raise RuntimeError("Found multiple directories for one ID. Data corrupted! " + str(dirs))
-        return dirs.pop() if len(dirs) == 1 else None
+        key = str(uid)
+        directory = self.directories.get(key, None)
+        if directory is None:
+            # The object might have been added by another process
+            directory = self.index.directory(uid)
+            if directory is None:
+                return None
+            self.directories[key] = directory
+        if not self.has_dir(directory):
+            # The object was removed without using the repository
+            self.index.remove(uid)
+            self.directories.pop(key, None)
+            return None
+        return directory
 
     def has_dir(self, directory):
         """
@@ -201,7 +432,7 @@ class IFileRepository(IRepository, ISearchable, IStoreableRepository):
         :param search: The search object
         :return: List of directories validated for the search
         """
-        return [self.to_directory(o) for o in self.list(search)]
+        return [self.to_directory(o) for o in self.list(search, size=None)]
 
     def find_dirs(self, matcher, strip_postfix=""):
         # TODO postfix stripping?
@@ -223,7 +454,12 @@ class IFileRepository(IRepository, ISearchable, IStoreableRepository):
         :return:
         """
         if self.has_dir(directory):
+            # Blobs only referenced by the deleted files are removed as well
+            referenced = BlobStore.references(directory)
+            store, scope = self._blob_store_for(directory)
             shutil.rmtree(directory)
+            if referenced and store is not None and scope is not None and os.path.exists(scope):
+                store.collect(BlobStore.references(scope), candidates=referenced)
 
     def get_file(self, dir, file: File, default=None):
         """
@@ -243,7 +479,74 @@ class IFileRepository(IRepository, ISearchable, IStoreableRepository):
         :param file: File object
         :return: true if file exists
         """
-        return os.path.exists(os.path.join(dir, file.name))
+        return os.path.exists(os.path.join(dir, file.name)) or \
+            os.path.exists(os.path.join(dir, file.name + REFERENCE_POSTFIX))
+
+    @property
+    def blob_store(self):
+        """
+        :return: Blob store of the backend or None if the backend doesn't store files content addressed
+        """
+        return getattr(self.backend, "blob_store", None) if self.backend is not None else None
+
+    def _is_git_repository(self, directory):
+        return os.path.isdir(os.path.join(directory, ".git"))
+
+    def _repository_of(self, directory):
+        """
+        :param directory: Directory within the root directory of the backend
+        :return: The innermost git repository containing the directory or None
+        """
+        top = os.path.abspath(os.path.expanduser(self.backend.root_dir))
+        directory = os.path.abspath(os.path.expanduser(directory))
+        while directory.startswith(top + os.sep):
+            if self._is_git_repository(directory):
+                return directory
+            directory = os.path.dirname(directory)
+        return None
+
+    def _blob_store_for(self, directory):
+        """
+        Blob store of the files in a directory. Files in git repositories store their blobs in the repository, so
+        pushing and cloning it keeps the data. Other files use the blob store of the backend.
+        :param directory: Directory of the files
+        :return: Tuple of the blob store and the directory whose reference files use it
+        """
+        if self.backend is None:
+            return None, None
+        repository = self._repository_of(directory)
+        if repository is not None:
+            return BlobStore(os.path.join(repository, REPOSITORY_BLOB_DIR)), repository
+        store = self.blob_store
+        if store is None:
+            store = BlobStore(os.path.join(os.path.expanduser(self.backend.root_dir), "blobs"))
+        return store, os.path.expanduser(self.backend.root_dir)
+
+    def _use_blob_store(self, file: File):
+        if file.kind is None or self.blob_store is None:
+            return False
+        kinds = self.backend.config.get("blob_store")
+        return file.kind in (kinds if isinstance(kinds, (list, tuple, set)) else BLOB_KINDS)
+
+    def _open_file(self, dir, file: File):
+        """
+        Open a file for reading. Files stored in the blob store are resolved by their reference file.
+        :param dir: Location of the repo
+        :param file: File object
+        :return: Binary file object or None if the file doesn't exist
+        """
+        reference = os.path.join(dir, file.name + REFERENCE_POSTFIX)
+        if os.path.exists(reference):
+            store, _ = self._blob_store_for(dir)
+            digest, size = BlobStore.read_reference(reference)
+            if not store.exists(digest) and self.blob_store is not None and self.blob_store.exists(digest):
+                # Blobs written before the repository stored its own blobs
+                store = self.blob_store
+            # The size check is cheap. Rehashing the blob is only done if configured.
+            return store.open(digest, size=size, verify=self.backend.config.get("verify_blobs", False))
+        if not os.path.exists(os.path.join(dir, file.name)):
+            return None
+        return open(os.path.join(dir, file.name), 'rb')
 
     def get_file_fn(self, dir, file: File):
         """
@@ -254,26 +557,95 @@ class IFileRepository(IRepository, ISearchable, IStoreableRepository):
         """
 
         def __load_data():
-            if not os.path.exists(os.path.join(dir, file.name)):
+            f = self._open_file(dir, file)
+            if f is None:
                 # TODO Raise exception
                 return None
-            with open(os.path.join(dir, file.name), 'rb') as f:
-                data = file.serializer.deserialize(f.read())
+            with f:
+                # Files written with a configured format carry a header naming it. The serializer reads from the file
+                # object directly instead of copying the whole content into a buffer first.
+                data = SerializerRegistry.load(f, default=file.serializer, allowed=self.allowed_formats(file))
             return data
 
         return __load_data
 
+    def iter_file(self, dir, file: File):
+        """
+        Incrementally read the items of a file. Files written in a stream format like jsonl or msgpack-stream are never
+        loaded as a whole.
+        :param dir: Location of the repo
+        :param file: File object
+        :return: Generator of the items of the file
+        """
+        f = self._open_file(dir, file)
+        if f is None:
+            return
+        with f:
+            yield from SerializerRegistry.iter_load(f, default=file.serializer, allowed=self.allowed_formats(file))
+
     def write_file(self, dir, file: File, target, mode="w"):
         """
         Write given file object into directory with given name and serializer
         :param dir: directory
         :param file: file object containing name and serializer
         :param target: target to serialize
-        :param mode: The mode to use when writing to disk
+        :param mode: The mode to use when writing to disk. Files are always written binary, "a" appends to the file.
         :return:
         """
-        with open(os.path.join(dir, file.name), mode) as f:
-            f.write(file.serializer.serialise(target))
+        # Serializers stream the target into the file in chunks instead of building the whole buffer first
+        spec = self.serializer_format(file)
+        path = os.path.join(dir, file.name)
+        durability = self.durability
+        sync = durability == DURABILITY_ALWAYS or (durability == DURABILITY_BATCH and not self.in_transaction)
+
+        def _dump(f):
+            if spec is not None:
+                SerializerRegistry.dump(target, f, spec)
+            else:
+                file.serializer.dump(target, f)
+
+        if 'a' not in mode and self._use_blob_store(file):
+            # Store the content once in the blob store and only reference it here
+            store, _ = self._blob_store_for(dir)
+            digest, size = store.put(_dump, fsync=sync)
+            path = path + REFERENCE_POSTFIX
+            BlobStore.write_reference(path, digest, size)
+            if self.in_transaction:
+                self._written.append(store.path(digest))
+            elif sync:
+                _fsync(path)
+        else:
+            with open(path, 'ab' if 'a' in mode else 'wb') as f:
+                _dump(f)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+        if self.in_transaction:
+            self._written.append(path)
+
+    def serializer_format(self, file: File):
+        """
+        Get the configured serialization format for the kind of the file. Formats are configured per backend as dict
+        of file kinds and format names. (For example {"results": "zstd:msgpack", "metrics": "orjson"})
+        :param file: File object
+        :return: Format name or None if the serializer of the file should be used
+        """
+        if file.kind is None or self.backend is None:
+            return None
+        config = getattr(self.backend, "config", None)
+        serializers = config.get("serializers", None) if config is not None else None
+        if not serializers:
+            return None
+        return serializers.get(file.kind, None)
+
+    def allowed_formats(self, file: File):
+        """
+        Formats the header of a file may name. Formats which can execute code on load (pickle, dill) are only allowed if
+        they are the serializer of the file or configured for its kind.
+        :param file: File object
+        :return: Set of format names
+        """
+        return SerializerRegistry.allowed_formats(file.serializer, self.serializer_format(file))
 
     def to_directory(self, obj):
         """
@@ -1,3 +1,4 @@
+import os
 from abc import abstractmethod, ABCMeta
 
 from git import Repo
@@ -18,6 +19,8 @@ class IGitRepository(IFileRepository):
 
     @abstractmethod
     def __init__(self, **kwargs):
+        # Repositories changed in the open transaction and the messages to commit them with
+        self._pending_commits = {}
         super().__init__(**kwargs)
 
     # database backend functions
@@ -30,7 +33,7 @@ class IGitRepository(IFileRepository):
         :return:
         """
         # TODO: Possibly, look for in the remote repositories if possible
-        return super().list(search)
+        return super().list(search, offset, size)
 
     # Abstract method which would create a repo based on the requirements
     def put(self, obj, *args, merge=False, allow_overwrite=False, **kwargs):
@@ -40,13 +43,33 @@ class IGitRepository(IFileRepository):
         directory = self.to_directory(obj)
         if not repo_exists(directory):
             repo = Repo.init(path=directory, **kwargs.pop("repo_kwargs", {}))
-            add_and_commit(directory, message=kwargs.pop('message', 'Initial Commit of Repository'))
+            message = kwargs.pop('message', 'Initial Commit of Repository')
         else:
             repo = get_repo(path=directory, **kwargs.pop("repo_kwargs", {}))
-            add_and_commit(directory, message=kwargs.pop('message', 'Commiting existing changes'))
+            message = kwargs.pop('message', 'Commiting existing changes')
+
+        if self.in_transaction:
+            # Commit all changes of the batch at once when the transaction ends
+            self._pending_commits.setdefault(directory, message)
+        else:
+            add_and_commit(directory, message=message)
 
         return repo
 
+    def flush(self, written):
+        super().flush(written)
+        pending, self._pending_commits = self._pending_commits, {}
+        for directory, message in pending.items():
+            if repo_exists(directory):
+                add_and_commit(directory, message=message)
+
+    def _is_git_repository(self, directory):
+        # The directories of the objects of this repository are git repositories, even before they are initialized
+        import fnmatch
+        return super()._is_git_repository(directory) or fnmatch.fnmatch(
+            os.path.abspath(os.path.dirname(directory)),
+            os.path.abspath(os.path.expanduser(self._replace_placeholders_with_wildcard(self.root_dir))))
+
     def get(self, uid):
         # Call the File backend get function
         return super().get(uid=uid)
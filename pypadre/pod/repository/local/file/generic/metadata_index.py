@@ -0,0 +1,204 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+INDEX_FILE_POSTFIX = ".index.sqlite"
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _encode(value):
+    """
+    Encode a scalar metadata value to the string representation stored in the index.
+    :param value: Value to encode
+    :return: Encoded value or None if the value can't be indexed
+    """
+    if not isinstance(value, _SCALARS):
+        return None
+    return json.dumps(value)
+
+
+def is_indexable(value):
+    return isinstance(value, _SCALARS)
+
+
+class MetadataIndex:
+    """
+    Persistent index over the metadata of all objects of a file repository. The index is stored as a sqlite file and
+    maps the id of an object to its directory as well as to all scalar top level entries of its metadata. This allows
+    to answer key / value searches without deserializing the objects on the file system.
+    """
+
+    def __init__(self, path):
+        self._path = path
+        self._connection = None
+        # Branches of a grid may read the index from multiple threads while a batch connection is open
+        self._lock = threading.RLock()
+
+    @property
+    def path(self):
+        return self._path
+
+    def exists(self):
+        return os.path.exists(self._path)
+
+    def _open(self):
+        directory = os.path.dirname(self._path)
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        return sqlite3.connect(self._path, timeout=60, check_same_thread=False)
+
+    @contextmanager
+    def _connect(self):
+        with self._lock:
+            if self._connection is not None:
+                # Part of a batch. The connection is reused, but every change is committed directly, so the index
+                # doesn't hold the write lock of the file between puts.
+                with self._connection:
+                    yield self._connection
+                return
+        connection = self._open()
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def batch(self):
+        """
+        Run all index changes within the context on a single connection instead of opening one per change. Each change
+        is still committed on its own, so other connections are never blocked for the duration of the batch and a crash
+        only loses the change in progress.
+        :return:
+        """
+        with self._lock:
+            nested = self._connection is not None
+            if not nested:
+                self._connection = self._open()
+        if nested:
+            yield self
+            return
+        try:
+            yield self
+        finally:
+            with self._lock:
+                connection, self._connection = self._connection, None
+                connection.close()
+
+    @staticmethod
+    def _create_tables(connection):
+        connection.execute("CREATE TABLE IF NOT EXISTS objects "
+                           "(id TEXT PRIMARY KEY, directory TEXT NOT NULL, folder TEXT)")
+        connection.execute("CREATE TABLE IF NOT EXISTS metadata (id TEXT NOT NULL, key TEXT NOT NULL, value TEXT)")
+        connection.execute("CREATE INDEX IF NOT EXISTS metadata_key_value ON metadata (key, value)")
+        connection.execute("CREATE INDEX IF NOT EXISTS metadata_id ON metadata (id)")
+        connection.execute("CREATE INDEX IF NOT EXISTS objects_directory ON objects (directory)")
+
+    @staticmethod
+    def _insert(connection, uid, directory, folder, metadata):
+        # Ids are bound as text. Integer ids may exceed the range of sqlite integers.
+        uid = str(uid)
+        connection.execute("DELETE FROM metadata WHERE id = ?", (uid,))
+        connection.execute("INSERT OR REPLACE INTO objects (id, directory, folder) VALUES (?, ?, ?)",
+                           (uid, directory, folder))
+        connection.executemany("INSERT INTO metadata (id, key, value) VALUES (?, ?, ?)",
+                               [(uid, key, _encode(value)) for key, value in metadata.items()
+                                if is_indexable(value)])
+
+    def rebuild(self, entries):
+        """
+        Drops the current index and recreates it from the given entries.
+        :param entries: Iterable of (id, directory, folder, metadata) tuples
+        :return:
+        """
+        with self._connect() as connection:
+            connection.execute("DROP TABLE IF EXISTS objects")
+            connection.execute("DROP TABLE IF EXISTS metadata")
+            self._create_tables(connection)
+            for uid, directory, folder, metadata in entries:
+                self._insert(connection, uid, directory, folder, metadata)
+
+    def put(self, uid, directory, folder, metadata: dict):
+        """
+        Add or replace the entry of an object.
+        :param uid: Id of the object
+        :param directory: Directory the object is stored in
+        :param folder: Folder name of the object
+        :param metadata: Metadata of the object. Only scalar values are indexed.
+        :return:
+        """
+        with self._connect() as connection:
+            self._create_tables(connection)
+            self._insert(connection, uid, directory, folder, metadata)
+
+    def remove(self, uid):
+        with self._connect() as connection:
+            self._create_tables(connection)
+            connection.execute("DELETE FROM metadata WHERE id = ?", (str(uid),))
+            connection.execute("DELETE FROM objects WHERE id = ?", (str(uid),))
+
+    def remove_directory(self, directory):
+        with self._connect() as connection:
+            self._create_tables(connection)
+            connection.execute("DELETE FROM metadata WHERE id IN (SELECT id FROM objects WHERE directory = ?)",
+                               (directory,))
+            connection.execute("DELETE FROM objects WHERE directory = ?", (directory,))
+
+    def directory(self, uid):
+        """
+        Get the directory of the object with given id.
+        :param uid: Id to look up
+        :return: The directory or None if the id is not indexed
+        """
+        with self._connect() as connection:
+            self._create_tables(connection)
+            row = connection.execute("SELECT directory FROM objects WHERE id = ?", (str(uid),)).fetchone()
+        return row[0] if row is not None else None
+
+    def directories(self):
+        """
+        :return: Dict of all indexed ids and their directories
+        """
+        with self._connect() as connection:
+            self._create_tables(connection)
+            return dict(connection.execute("SELECT id, directory FROM objects"))
+
+    def find(self, search: dict = None, folder=None, offset=0, size=None, strict=False):
+        """
+        Find the directories of objects matching the search. A search entry is matched if the metadata of an object
+        holds the same value for the key. Objects whose metadata doesn't contain a searched key as well as searches for
+        non scalar values are also returned, because they have to be checked on the loaded object itself.
+        :param search: Key value pairs to search for
+        :param folder: Folder name to match
+        :param offset: Number of candidates to skip
+        :param size: Maximal number of candidates to return. None for all.
+        :param strict: Only return objects whose metadata holds all searched keys
+        :return: List of directories
+        """
+        query = "SELECT directory FROM objects"
+        conditions = []
+        arguments = []
+        if folder is not None:
+            conditions.append("folder = ?")
+            arguments.append(folder)
+        if search is not None:
+            for key, value in search.items():
+                if not is_indexable(value):
+                    continue
+                if strict:
+                    conditions.append("id IN (SELECT id FROM metadata WHERE key = ? AND value = ?)")
+                    arguments.extend([key, _encode(value)])
+                else:
+                    conditions.append("(id IN (SELECT id FROM metadata WHERE key = ? AND value = ?) "
+                                      "OR id NOT IN (SELECT id FROM metadata WHERE key = ?))")
+                    arguments.extend([key, _encode(value), key])
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY rowid LIMIT ? OFFSET ?"
+        arguments.extend([-1 if size is None else size, offset])
+        with self._connect() as connection:
+            self._create_tables(connection)
+            return [row[0] for row in connection.execute(query, arguments)]
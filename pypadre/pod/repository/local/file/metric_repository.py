@@ -11,7 +11,7 @@ from pypadre.pod.repository.serializer.serialiser import JSonSerializer
 NAME = "metrics"
 
 META_FILE = File("metadata.json", JSonSerializer)
-RESULT_FILE = File("results.json", JSonSerializer)
+RESULT_FILE = File("results.json", JSonSerializer, kind="metrics")
 
 
 class MetricFileRepository(IChildFileRepository, ILogFileRepository, IMetricRepository):
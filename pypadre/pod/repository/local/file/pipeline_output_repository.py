@@ -8,9 +8,9 @@ from pypadre.pod.repository.serializer.serialiser import JSonSerializer
 NAME = "output"
 
 META_FILE = File("metadata.json", JSonSerializer)
-PARAMETER_FILE = File("parameters.json", JSonSerializer)
-METRIC_FILE = File("metrics.json", JSonSerializer)
-RESULT_FILE = File("results.json", JSonSerializer)
+PARAMETER_FILE = File("parameters.json", JSonSerializer, kind="parameters")
+METRIC_FILE = File("metrics.json", JSonSerializer, kind="metrics")
+RESULT_FILE = File("results.json", JSonSerializer, kind="results")
 
 
 class PipelineOutputFileRepository(IChildFileRepository, ILogFileRepository, IPipelineOutputRepository):
@@ -10,8 +10,8 @@ from pypadre.pod.repository.serializer.serialiser import JSonSerializer
 NAME = "splits"
 
 META_FILE = File("metadata.json", JSonSerializer)
-RESULTS_FILE = File("results.json", JSonSerializer)
-METRICS_FILE = File("metrics.json", JSonSerializer)
+RESULTS_FILE = File("results.json", JSonSerializer, kind="results")
+METRICS_FILE = File("metrics.json", JSonSerializer, kind="metrics")
 
 
 class SplitFileRepository(IChildFileRepository, ILogFileRepository, ISplitRepository):
@@ -11,7 +11,6 @@ from abc import abstractmethod, ABCMeta
 from logging import warning
 
 import gitlab
-from cachetools import cached
 from git import GitCommandError
 
 from pypadre.core.model.generic.i_storable_mixin import StoreableMixin
@@ -20,6 +19,7 @@ from pypadre.pod.repository.generic.i_repository_mixins import ISearchable
 from pypadre.pod.repository.local.file.generic.i_file_repository import File
 from pypadre.pod.repository.local.file.generic.i_git_repository import IGitRepository
 from pypadre.pod.util.git_util import repo_exists, get_repo, crawl_repo
+from pypadre.pod.repository.serializer.serializer_registry import SerializerRegistry
 
 permissions = {"guest": gitlab.GUEST_ACCESS,
                "maintainer": gitlab.MAINTAINER_ACCESS,
@@ -282,7 +282,7 @@ class GitLabRepository(IGitRepository):
         try:
             file_path = path + '/' + file.name if path != '' else file.name
             f = repo.files.get(file_path=file_path, ref='master')
-            data = file.serializer.deserialize(f.decode())
+            data = SerializerRegistry.loads(f.decode(), default=file.serializer)
             return data
         except Exception as e:
             return None
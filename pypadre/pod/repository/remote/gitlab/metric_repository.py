@@ -1,5 +1,4 @@
 from pypadre.core.metrics.metrics import Metric
-from pypadre.core.util.utils import remove_cached
 from pypadre.pod.backend.i_padre_backend import IPadreBackend
 from pypadre.pod.repository.local.file.generic.i_file_repository import File
 from pypadre.pod.repository.local.file.metric_repository import MetricFileRepository
@@ -0,0 +1,45 @@
+import pandas as pd
+
+from pypadre.core.model.dataset import dataset
+from pypadre.core.model.dataset.container.column_store import ColumnStore
+
+
+class ColumnarSerializer:
+    """
+    Serializer writing two dimensional data column wise into a directory. Every column is stored as its own .npy file
+    and described in a small json manifest. Numerical columns can be opened memory mapped on load, so only the pages of
+    the accessed rows and columns have to be read from the disk.
+    """
+
+    @staticmethod
+    def can_write(data):
+        return ColumnStore.can_write(data)
+
+    @staticmethod
+    def write(directory, data):
+        """
+        Write the data column wise into the directory.
+        :param directory: Directory to write to
+        :param data: Two dimensional numpy array or pandas data frame
+        :return:
+        """
+        bin_format = dataset.formats.pandas if isinstance(data, pd.DataFrame) else dataset.formats.numpy
+        ColumnStore.write(directory, data, bin_format)
+
+    @staticmethod
+    def has_manifest(directory):
+        return ColumnStore.has_manifest(directory)
+
+    @staticmethod
+    def read_manifest(directory):
+        return ColumnStore.read_manifest(directory)
+
+    @staticmethod
+    def read(directory, mmap_mode="r"):
+        """
+        Open the data stored in the directory. Columns are only read on access.
+        :param directory: Directory to read from
+        :param mmap_mode: Memory map mode for numerical columns. None to read the columns into memory.
+        :return: ColumnStore serving the columns
+        """
+        return ColumnStore.open(directory, mmap_mode=mmap_mode)
@@ -23,3 +23,24 @@ class Serializer:
         :return:
         """
         pass
+
+    @classmethod
+    def dump(cls, obj, f):
+        """
+        Serialize the object into a binary file object. Serializers supporting it write the object in chunks instead
+        of building the whole buffer in memory.
+        :param obj: object to serialise
+        :param f: binary file object to write to
+        :return:
+        """
+        data = cls.serialise(obj)
+        f.write(data.encode() if isinstance(data, str) else data)
+
+    @classmethod
+    def load(cls, f):
+        """
+        Deserialize an object from a binary file object.
+        :param f: binary file object to read from
+        :return:
+        """
+        return cls.deserialize(f.read())
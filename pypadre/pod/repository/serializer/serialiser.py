@@ -1,3 +1,5 @@
+import codecs
+import io
 import json
 import pickle
 import dill
@@ -5,7 +7,6 @@ import dill
 import yaml
 import msgpack_numpy as mn
 
-# TODO : we should support faster / more sophisticated / cross-plattform serialisation. for example using pyarrow
 # TODO: write PickleSerialiser Test
 from pypadre.pod.repository.serializer.i_serializer import Serializer
 
@@ -33,6 +34,14 @@ class PickleSerializer(Serializer):
         """
         return pickle.loads(buffer)
 
+    @classmethod
+    def dump(cls, obj, f):
+        pickle.dump(obj, f)
+
+    @classmethod
+    def load(cls, f):
+        return pickle.load(f)
+
 
 class DillSerializer(Serializer):
     """
@@ -57,6 +66,14 @@ class DillSerializer(Serializer):
         """
         return dill.loads(buffer)
 
+    @classmethod
+    def dump(cls, obj, f):
+        dill.dump(obj, f)
+
+    @classmethod
+    def load(cls, f):
+        return dill.load(f)
+
 
 class JSonSerializer(Serializer):
 
@@ -68,6 +85,16 @@ class JSonSerializer(Serializer):
     def deserialize(buffer):
         return json.loads(buffer)
 
+    @classmethod
+    def dump(cls, obj, f):
+        # json.dump encodes with the slow pure python encoder. Encoding the whole document with the C encoder first is
+        # several times faster.
+        f.write(json.dumps(obj).encode("utf-8"))
+
+    @classmethod
+    def load(cls, f):
+        return json.load(f)
+
 class YamlSerializer(Serializer):
 
     @staticmethod
@@ -78,6 +105,14 @@ class YamlSerializer(Serializer):
     def deserialize(buffer):
         return yaml.load(buffer, Loader=yaml.FullLoader)
 
+    @classmethod
+    def dump(cls, obj, f):
+        yaml.dump(obj, codecs.getwriter("utf-8")(f))
+
+    @classmethod
+    def load(cls, f):
+        return yaml.load(f, Loader=yaml.FullLoader)
+
 class TextSerializer(Serializer):
 
     @staticmethod
@@ -97,3 +132,225 @@ class MsgPack(Serializer):
     @staticmethod
     def deserialize(buffer):
         return mn.loads(buffer)
+
+    @classmethod
+    def dump(cls, obj, f):
+        mn.dump(obj, f)
+
+    @classmethod
+    def load(cls, f):
+        return mn.load(f)
+
+
+class JsonLinesSerializer(Serializer):
+    """
+    Serializer writing an iterable as one json document per line. Items are written and read one by one, so neither
+    the writer nor the incremental reader has to hold the whole file in memory.
+    """
+
+    @staticmethod
+    def serialise(obj):
+        return "".join(json.dumps(item) + "\n" for item in obj)
+
+    @staticmethod
+    def deserialize(buffer):
+        if isinstance(buffer, (bytes, bytearray, memoryview)):
+            buffer = bytes(buffer).decode("utf-8")
+        return [json.loads(line) for line in buffer.splitlines() if line.strip()]
+
+    @classmethod
+    def dump(cls, obj, f):
+        for item in obj:
+            f.write(json.dumps(item).encode("utf-8") + b"\n")
+
+    @classmethod
+    def load(cls, f):
+        return list(cls.iter_load(f))
+
+    @staticmethod
+    def iter_load(f):
+        """
+        Incrementally read the items of a file object.
+        :param f: binary file object
+        :return: Generator of the items
+        """
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class MsgPackStreamSerializer(Serializer):
+    """
+    Serializer writing an iterable as stream of msgpack (numpy aware) objects. Items can be read incrementally.
+    """
+
+    @staticmethod
+    def serialise(obj):
+        return b"".join(mn.packb(item) for item in obj)
+
+    @staticmethod
+    def deserialize(buffer):
+        return list(MsgPackStreamSerializer.iter_load(io.BytesIO(buffer)))
+
+    @classmethod
+    def dump(cls, obj, f):
+        packer = mn.Packer()
+        for item in obj:
+            f.write(packer.pack(item))
+
+    @classmethod
+    def load(cls, f):
+        return list(cls.iter_load(f))
+
+    @staticmethod
+    def iter_load(f):
+        """
+        Incrementally read the items of a file object.
+        :param f: binary file object
+        :return: Generator of the items
+        """
+        import msgpack
+        for item in msgpack.Unpacker(f, object_hook=mn.decode, raw=False):
+            yield item
+
+
+class OrJsonSerializer(Serializer):
+    """
+    Fast json serializer using orjson. Numpy arrays are serialized natively.
+    """
+
+    @staticmethod
+    def serialise(obj):
+        import orjson
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    def deserialize(buffer):
+        import orjson
+        return orjson.loads(buffer)
+
+
+class ArrowSerializer(Serializer):
+    """
+    Serializer writing numpy arrays, pandas data frames and dicts of equally long columns as Arrow IPC stream.
+    """
+    _TYPE = b"padre_type"
+    _SHAPE = b"padre_shape"
+
+    @staticmethod
+    def serialise(obj):
+        import numpy as np
+        import pandas as pd
+        import pyarrow as pa
+
+        if isinstance(obj, pd.DataFrame):
+            table = pa.Table.from_pandas(obj)
+            obj_type = b"dataframe"
+            shape = b""
+        elif isinstance(obj, np.ndarray):
+            matrix = obj.reshape(obj.shape[0], -1) if obj.ndim > 1 else obj.reshape(-1, 1)
+            table = pa.Table.from_arrays([pa.array(matrix[:, i]) for i in range(matrix.shape[1])],
+                                         names=[str(i) for i in range(matrix.shape[1])])
+            obj_type = b"ndarray"
+            shape = json.dumps(list(obj.shape)).encode()
+        elif isinstance(obj, dict):
+            table = pa.Table.from_arrays([pa.array(np.asarray(v)) for v in obj.values()],
+                                         names=[str(k) for k in obj.keys()])
+            obj_type = b"dict"
+            shape = b""
+        else:
+            raise ValueError("Arrow serialization is not supported for type %s." % type(obj))
+
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                               ArrowSerializer._TYPE: obj_type, ArrowSerializer._SHAPE: shape})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    @staticmethod
+    def deserialize(buffer):
+        import numpy as np
+        import pyarrow as pa
+
+        table = pa.ipc.open_stream(pa.py_buffer(buffer)).read_all()
+        metadata = table.schema.metadata or {}
+        obj_type = metadata.get(ArrowSerializer._TYPE, b"dataframe")
+        if obj_type == b"ndarray":
+            shape = json.loads(metadata.get(ArrowSerializer._SHAPE).decode())
+            return np.column_stack([c.to_numpy() for c in table.columns]).reshape(shape)
+        elif obj_type == b"dict":
+            return {name: table.column(name).to_numpy() for name in table.column_names}
+        return table.to_pandas()
+
+
+def _iter_load(serializer, f):
+    if hasattr(serializer, "iter_load"):
+        return serializer.iter_load(f)
+    return iter(serializer.load(f))
+
+
+class ZstdSerializer(Serializer):
+    """
+    Wrapper compressing the output of another serializer with zstandard.
+    """
+
+    def __init__(self, serializer, level=3):
+        self._serializer = serializer
+        self._level = level
+
+    def serialise(self, obj):
+        import zstandard
+        data = self._serializer.serialise(obj)
+        return zstandard.ZstdCompressor(level=self._level).compress(data.encode() if isinstance(data, str) else data)
+
+    def deserialize(self, buffer):
+        # Frames written by dump don't hold the content size, therefore they are decompressed as stream
+        return self.load(io.BytesIO(buffer))
+
+    def dump(self, obj, f):
+        import zstandard
+        with zstandard.ZstdCompressor(level=self._level).stream_writer(f, closefd=False) as writer:
+            self._serializer.dump(obj, writer)
+
+    def load(self, f):
+        return self._serializer.load(self._reader(f))
+
+    def iter_load(self, f):
+        return _iter_load(self._serializer, self._reader(f))
+
+    @staticmethod
+    def _reader(f):
+        import zstandard
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(f, closefd=False))
+
+
+class Lz4Serializer(Serializer):
+    """
+    Wrapper compressing the output of another serializer with lz4.
+    """
+
+    def __init__(self, serializer):
+        self._serializer = serializer
+
+    def serialise(self, obj):
+        import lz4.frame
+        data = self._serializer.serialise(obj)
+        return lz4.frame.compress(data.encode() if isinstance(data, str) else data)
+
+    def deserialize(self, buffer):
+        import lz4.frame
+        return self._serializer.deserialize(lz4.frame.decompress(buffer))
+
+    def dump(self, obj, f):
+        import lz4.frame
+        with lz4.frame.open(f, mode="wb") as writer:
+            self._serializer.dump(obj, writer)
+
+    def load(self, f):
+        import lz4.frame
+        return self._serializer.load(lz4.frame.open(f, mode="rb"))
+
+    def iter_load(self, f):
+        import lz4.frame
+        return _iter_load(self._serializer, lz4.frame.open(f, mode="rb"))
@@ -0,0 +1,216 @@
+from pypadre.pod.repository.serializer.serialiser import PickleSerializer, DillSerializer, JSonSerializer, \
+    YamlSerializer, TextSerializer, MsgPack, OrJsonSerializer, ArrowSerializer, ZstdSerializer, Lz4Serializer, \
+    JsonLinesSerializer, MsgPackStreamSerializer
+
+# Files written with a registered format start with this header followed by the length and the name of the format
+HEADER_MAGIC = b"\x00PADRE"
+
+SEPARATOR = ":"
+
+# Formats whose decoders can execute code. A header may only name them if the reader allows them explicitly or the
+# default serializer of the file is such a format anyway.
+UNSAFE_FORMATS = {"pickle", "dill"}
+
+
+class SerializerRegistry:
+    """
+    Registry of all serializers known to padre. Formats are referenced by name. Compression wrappers can be prepended
+    to a format name, for example "zstd:msgpack" compresses the msgpack output with zstandard. Data written via the
+    registry carries a header with the name of the format so readers can pick the right decoder.
+    """
+
+    _serializers = {
+        "pickle": PickleSerializer,
+        "dill": DillSerializer,
+        "json": JSonSerializer,
+        "yaml": YamlSerializer,
+        "text": TextSerializer,
+        "msgpack": MsgPack,
+        "orjson": OrJsonSerializer,
+        "arrow": ArrowSerializer,
+        "jsonl": JsonLinesSerializer,
+        "msgpack-stream": MsgPackStreamSerializer
+    }
+
+    _wrappers = {
+        "zstd": ZstdSerializer,
+        "lz4": Lz4Serializer
+    }
+
+    _unsafe = set(UNSAFE_FORMATS)
+
+    @classmethod
+    def register(cls, name, serializer, unsafe=False):
+        """
+        Register a serializer.
+        :param name: Name of the format
+        :param serializer: Serializer providing serialise and deserialize
+        :param unsafe: True if decoding the format can execute code (like pickle)
+        :return:
+        """
+        if SEPARATOR in name:
+            raise ValueError("Format names can't contain '%s'." % SEPARATOR)
+        cls._serializers[name] = serializer
+        if unsafe:
+            cls._unsafe.add(name)
+        else:
+            cls._unsafe.discard(name)
+
+    @classmethod
+    def allowed_formats(cls, default=None, spec=None):
+        """
+        Formats a header is allowed to name when reading a file. These are the formats which can't execute code, the
+        format of the default serializer and the configured format of the file.
+        :param default: Default serializer of the file
+        :param spec: Configured format specification of the file
+        :return: Set of format names
+        """
+        allowed = {name for name in cls._serializers if name not in cls._unsafe}
+        allowed.update(name for name, serializer in cls._serializers.items() if serializer is default)
+        if spec is not None:
+            allowed.add(spec.split(SEPARATOR)[-1])
+        return allowed
+
+    @classmethod
+    def register_wrapper(cls, name, wrapper):
+        """
+        Register a wrapper like a compression. The wrapper is constructed with the serializer it wraps.
+        :param name: Name of the wrapper
+        :param wrapper: Class or function taking the wrapped serializer
+        :return:
+        """
+        if SEPARATOR in name:
+            raise ValueError("Format names can't contain '%s'." % SEPARATOR)
+        cls._wrappers[name] = wrapper
+
+    @classmethod
+    def formats(cls):
+        return list(cls._serializers.keys()), list(cls._wrappers.keys())
+
+    @classmethod
+    def get(cls, spec):
+        """
+        Get the serializer for a format specification like "msgpack" or "lz4:pickle".
+        :param spec: Format specification
+        :return: Serializer
+        """
+        *wrappers, name = spec.split(SEPARATOR)
+        if name not in cls._serializers:
+            raise ValueError("Unknown serialization format %s. Known formats are %s." % (name, cls.formats()))
+        serializer = cls._serializers[name]
+        for wrapper in reversed(wrappers):
+            if wrapper not in cls._wrappers:
+                raise ValueError("Unknown serialization wrapper %s. Known wrappers are %s." % (wrapper, cls.formats()))
+            serializer = cls._wrappers[wrapper](serializer)
+        return serializer
+
+    @staticmethod
+    def header(spec):
+        name = spec.encode("ascii")
+        if len(name) > 255:
+            raise ValueError("Format specification %s is too long." % spec)
+        return HEADER_MAGIC + bytes([len(name)]) + name
+
+    @staticmethod
+    def read_header(buffer):
+        """
+        Read the format header of a buffer.
+        :param buffer: Serialized data
+        :return: Tuple of format specification (None if no header is present) and offset of the payload
+        """
+        if not buffer[:len(HEADER_MAGIC)] == HEADER_MAGIC:
+            return None, 0
+        length = buffer[len(HEADER_MAGIC)]
+        start = len(HEADER_MAGIC) + 1
+        return bytes(buffer[start:start + length]).decode("ascii"), start + length
+
+    @classmethod
+    def dumps(cls, obj, spec):
+        """
+        Serialize an object with the given format and prepend the format header.
+        :param obj: Object to serialize
+        :param spec: Format specification
+        :return: bytes
+        """
+        data = cls.get(spec).serialise(obj)
+        return cls.header(spec) + (data.encode() if isinstance(data, str) else data)
+
+    @classmethod
+    def _checked(cls, spec, default, allowed):
+        # A header must not choose a decoder the file isn't allowed to use, like pickle for a json file
+        if allowed is None:
+            allowed = cls.allowed_formats(default)
+        if spec.split(SEPARATOR)[-1] not in allowed:
+            raise ValueError("The format %s named by the header is not allowed here. Allowed formats are %s."
+                             % (spec, sorted(allowed)))
+        return cls.get(spec)
+
+    @classmethod
+    def loads(cls, buffer, default=None, allowed=None):
+        """
+        Deserialize a buffer. The decoder is chosen by the format header. Buffers without header are passed to the
+        default serializer.
+        :param buffer: Serialized data
+        :param default: Serializer for data without header
+        :param allowed: Formats the header may name. Defaults to allowed_formats(default).
+        :return: Deserialized object
+        """
+        spec, offset = cls.read_header(buffer)
+        if spec is None:
+            if default is None:
+                raise ValueError("Data holds no format header and no default serializer was given.")
+            return default.deserialize(buffer)
+        return cls._checked(spec, default, allowed).deserialize(buffer[offset:])
+
+    @classmethod
+    def dump(cls, obj, f, spec):
+        """
+        Write the format header and stream the serialized object into a binary file object.
+        :param obj: Object to serialize
+        :param f: Binary file object
+        :param spec: Format specification
+        :return:
+        """
+        serializer = cls.get(spec)
+        f.write(cls.header(spec))
+        serializer.dump(obj, f)
+
+    @classmethod
+    def _open(cls, f, default, allowed):
+        # Peek for the header and rewind if the file was written without one
+        start = f.tell()
+        magic = f.read(len(HEADER_MAGIC))
+        if magic != HEADER_MAGIC:
+            f.seek(start)
+            if default is None:
+                raise ValueError("Data holds no format header and no default serializer was given.")
+            return default
+        length = f.read(1)[0]
+        return cls._checked(f.read(length).decode("ascii"), default, allowed)
+
+    @classmethod
+    def load(cls, f, default=None, allowed=None):
+        """
+        Deserialize an object from a binary file object. The decoder is chosen by the format header.
+        :param f: Seekable binary file object
+        :param default: Serializer for data without header
+        :param allowed: Formats the header may name. Defaults to allowed_formats(default).
+        :return: Deserialized object
+        """
+        return cls._open(f, default, allowed).load(f)
+
+    @classmethod
+    def iter_load(cls, f, default=None, allowed=None):
+        """
+        Incrementally read the items of a file written in a stream format like jsonl or msgpack-stream. Other formats
+        are loaded as a whole and their items are returned one by one.
+        :param f: Seekable binary file object
+        :param default: Serializer for data without header
+        :param allowed: Formats the header may name. Defaults to allowed_formats(default).
+        :return: Generator of the items
+        """
+        serializer = cls._open(f, default, allowed)
+        if hasattr(serializer, "iter_load"):
+            yield from serializer.iter_load(f)
+        else:
+            yield from serializer.load(f)
@@ -1,5 +1,6 @@
 from _py_abc import ABCMeta
 from abc import abstractmethod
+from contextlib import contextmanager, ExitStack
 from logging import info
 from typing import List, Type, Callable
 
@@ -23,6 +24,12 @@ class ServiceMixin:
     def backends(self):
         return self._backends
 
+    @staticmethod
+    def _worker(backend):
+        # Write behind worker of the padre backend holding the repository
+        padre_backend = getattr(backend, "backend", None)
+        return getattr(padre_backend, "worker", None) if padre_backend is not None else None
+
     def save_signal_fn(self, fn: Callable):
         setattr(self, "_signal_" + str(hash(fn)), fn)
 
@@ -44,6 +51,9 @@ class CrudServiceMixin(ServiceMixin):
         entities = []
         for b in self.backends:
             backend: ISearchable = b
+            worker = self._worker(b)
+            if worker is not None:
+                worker.flush()
             # TODO here the first backend takes priority can we change that?
             [entities.append(e) for e in backend.list(search=search, offset=offset, size=size) if len(entities) < size and e not in entities]
         return entities
@@ -56,11 +66,43 @@ class CrudServiceMixin(ServiceMixin):
         """
         for b in self.backends:
             backend: IStoreableRepository = b
+            worker = self._worker(b)
+            if worker is not None:
+                # Write behind. Failures are reported by the worker.
+                worker.submit(obj.id, backend.put, obj, **kwargs)
+                continue
             try:
                 backend.put(obj, **kwargs)
             except Exception as e:
                 info("Couldn't store object " + str(obj) + "! " + str(e) + " Skipping storing the object.")
 
+    def put_many(self, objs, **kwargs):
+        """
+        Puts multiple entities as one batch. Every backend writes the batch at once.
+        :param objs: Entities to put
+        :return:
+        """
+        with self.transaction():
+            for obj in objs:
+                self.put(obj, **kwargs)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context batching all puts of the service until it ends.
+        :return:
+        """
+        with ExitStack() as stack:
+            for b in self.backends:
+                if hasattr(b, "transaction"):
+                    worker = self._worker(b)
+                    if worker is not None:
+                        # The transaction has to be opened and closed on the thread executing the puts
+                        stack.enter_context(worker.context(b.transaction()))
+                    else:
+                        stack.enter_context(b.transaction())
+            yield self
+
     def patch(self, obj):
         """
         Updates the entity
@@ -69,6 +111,11 @@ class CrudServiceMixin(ServiceMixin):
         """
         for b in self.backends:
             backend: IStoreableRepository = b
+            worker = self._worker(b)
+            if worker is not None:
+                # The worker may hold a transaction of the repository. Its state must only be touched by the worker.
+                worker.call(obj.id, backend.put, obj, allow_overwrite=True, merge=True)
+                continue
             backend.put(obj, allow_overwrite=True, merge=True)
 
     def get(self, uid):
@@ -80,6 +127,9 @@ class CrudServiceMixin(ServiceMixin):
         obj_list = []
         for b in self.backends:
             backend: IStoreableRepository = b
+            worker = self._worker(b)
+            if worker is not None:
+                worker.wait(uid)
             obj = backend.get(uid)
             if obj is not None:
                 obj_list.append(obj)
@@ -94,11 +144,45 @@ class CrudServiceMixin(ServiceMixin):
         obj_list = []
         for b in self.backends:
             backend: IStoreableRepository = b
+            worker = self._worker(b)
+            if worker is not None:
+                worker.flush()
             obj = backend.get_by_hash(hash)
             if obj is not None:
                 obj_list.append(obj)
         return obj_list
 
+    def exists_by_hash(self, hash):
+        """
+        Check if an entity with the hash exists in any backend
+        :param hash: Hash of the entity
+        :return: True if the entity exists
+        """
+        for b in self.backends:
+            backend: IStoreableRepository = b
+            worker = self._worker(b)
+            if worker is not None:
+                worker.flush()
+            if backend.exists_by_hash(hash):
+                return True
+        return False
+
+    def get_metadata_by_hash(self, hash):
+        """
+        Get the metadata of an entity with the hash without loading the entity
+        :param hash: Hash of the entity
+        :return: Metadata of the entity of the first backend holding it or None
+        """
+        for b in self.backends:
+            backend: IStoreableRepository = b
+            worker = self._worker(b)
+            if worker is not None:
+                worker.flush()
+            metadata = backend.get_metadata_by_hash(hash)
+            if metadata is not None:
+                return metadata
+        return None
+
     def delete(self, obj):
         """
         Delete the entity
@@ -107,6 +191,10 @@ class CrudServiceMixin(ServiceMixin):
         """
         for b in self.backends:
             backend: IStoreableRepository = b
+            worker = self._worker(b)
+            if worker is not None:
+                worker.call(obj.id, backend.delete, obj)
+                continue
             backend.delete(obj)
 
     def delete_by_id(self, uid):
@@ -117,6 +205,10 @@ class CrudServiceMixin(ServiceMixin):
         """
         for b in self.backends:
             backend: IStoreableRepository = b
+            worker = self._worker(b)
+            if worker is not None:
+                worker.call(uid, backend.delete_by_id, uid)
+                continue
             backend.delete_by_id(uid)
 
 
@@ -143,7 +235,12 @@ class ModelServiceMixin(CrudServiceMixin):
                 return_val[StoreableMixin.RETURN_VAL] = next(iter(self.get(uid)), None)
             else:
                 hash = sended_kwargs.get("hash")
-                if hash is not None:
+                if hash is not None and sended_kwargs.get("metadata", False):
+                    # Don't hide metadata found by another receiver of the signal
+                    metadata = self.get_metadata_by_hash(hash)
+                    if metadata is not None:
+                        return_val[StoreableMixin.RETURN_VAL] = metadata
+                elif hash is not None:
                     return_val[StoreableMixin.RETURN_VAL] = next(iter(self.get_by_hash(hash)), None)
         self.save_signal_fn(get)
 
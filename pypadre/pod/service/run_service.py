@@ -1,6 +1,7 @@
+from contextlib import ExitStack
 from typing import List
 
-from pypadre.core.events.events import connect
+from pypadre.core.events.events import connect, CommonSignals
 from pypadre.core.model.computation.run import Run
 from pypadre.pod.repository.i_repository import IRunRepository
 from pypadre.pod.service.base_service import ModelServiceMixin
@@ -14,6 +15,26 @@ class RunService(ModelServiceMixin):
     def __init__(self, backends: List[IRunRepository], **kwargs):
         super().__init__(model_clz=Run, backends=backends, **kwargs)
 
+        # Open transactions of the running runs
+        self._transactions = {}
+
+        @connect(Run, name=CommonSignals.START.name)
+        def start(obj, **kwargs):
+            # Batch all writes of the run and flush them when the run ends
+            stack = ExitStack()
+            for b in self.backends:
+                if b.backend is not None:
+                    stack.enter_context(b.backend.transaction())
+            self._transactions[obj.id] = stack
+        self.save_signal_fn(start)
+
+        @connect(Run, name=CommonSignals.STOP.name)
+        def stop(obj, **kwargs):
+            stack = self._transactions.pop(obj.id, None)
+            if stack is not None:
+                stack.close()
+        self.save_signal_fn(stop)
+
         @connect(Run)
         def put(obj, **kwargs):
             self.put(obj)
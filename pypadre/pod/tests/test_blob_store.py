@@ -0,0 +1,55 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pypadre.pod.repository.exceptions import BlobIntegrityError
+from pypadre.pod.repository.local.file.generic.blob_store import BlobStore
+
+
+class TestBlobStore(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.store = BlobStore(os.path.join(self.dir, "blobs"))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_deduplication(self):
+        digest, size = self.store.put_bytes(b"result")
+        assert self.store.put_bytes(b"result") == (digest, size)
+        assert self.store.digests() == [digest]
+        with self.store.open(digest, size=size, verify=True) as f:
+            assert f.read() == b"result"
+
+    def test_integrity(self):
+        digest, size = self.store.put_bytes(b"result")
+        with open(self.store.path(digest), "wb") as f:
+            f.write(b"resulx")
+        assert self.store.check(digest, size)
+        assert not self.store.check(digest)
+        self.assertRaises(BlobIntegrityError, self.store.open, digest, verify=True)
+        self.assertRaises(BlobIntegrityError, self.store.open, digest, size=3)
+
+    def test_collect(self):
+        digest, _ = self.store.put_bytes(b"a")
+        self.store.put_bytes(b"b")
+        assert len(self.store.collect([digest])) == 1
+        assert self.store.digests() == [digest]
+
+    def test_references(self):
+        kept, size = self.store.put_bytes(b"kept")
+        dropped, _ = self.store.put_bytes(b"dropped")
+        other, _ = self.store.put_bytes(b"other")
+        os.makedirs(os.path.join(self.dir, "a", "b"))
+        BlobStore.write_reference(os.path.join(self.dir, "a", "results.bin.ref"), kept, size)
+        BlobStore.write_reference(os.path.join(self.dir, "a", "b", "results.bin.ref"), kept, size)
+        assert BlobStore.references(self.dir) == {kept}
+        # Only the candidates are collected
+        assert self.store.collect(BlobStore.references(self.dir), candidates=[kept, dropped]) == [dropped]
+        assert sorted(self.store.digests()) == sorted([kept, other])
+
+
+if __name__ == '__main__':
+    unittest.main()
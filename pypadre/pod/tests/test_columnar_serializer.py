@@ -0,0 +1,40 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from pypadre.pod.repository.serializer.columnar_serializer import ColumnarSerializer
+
+
+class TestColumnarSerializer(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_numpy(self):
+        data = np.arange(40, dtype=np.float64).reshape(10, 4)
+        ColumnarSerializer.write(self.dir, data)
+        store = ColumnarSerializer.read(self.dir)
+
+        assert store.shape == (10, 4)
+        assert isinstance(store.column(0), np.memmap)
+        assert np.array_equal(store.take([0, 1, 2], rows=[1, 5]), data[[1, 5], :3])
+        assert np.array_equal(store.to_numpy(), data)
+
+    def test_pandas(self):
+        data = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": ["x", "y", "z"]}, index=[3, 4, 5])
+        ColumnarSerializer.write(self.dir, data)
+        store = ColumnarSerializer.read(self.dir)
+
+        assert list(store.columns) == ["a", "b"]
+        assert np.array_equal(store.take([1], rows=[2]), [["z"]])
+        assert store.to_pandas().equals(data)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from pypadre.pod.util.job_queue import JobQueue, Worker, DONE, FAILED, PENDING
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.queue = JobQueue(os.path.join(self.dir, "queue.sqlite"))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_claim(self):
+        ids = self.queue.put_many([b"a", b"b"], group="run")
+        job = self.queue.claim("w1")
+        assert job.id == ids[0] and job.payload == b"a" and job.attempts == 1
+        assert self.queue.claim("w2").id == ids[1]
+        assert self.queue.claim("w3") is None
+        self.queue.complete(ids[0], "w1")
+        assert self.queue.states(ids)[ids[0]][0] == DONE
+
+    def test_migrate(self):
+        # Queue created before tasks returned results
+        connection = sqlite3.connect(self.queue.path)
+        connection.execute("CREATE TABLE jobs (id TEXT PRIMARY KEY, job_group TEXT, payload BLOB, state TEXT, "
+                           "attempts INTEGER, max_attempts INTEGER, worker TEXT, lease_until REAL, error TEXT, "
+                           "created REAL, updated REAL)")
+        connection.commit()
+        connection.close()
+        uid = self.queue.put(b"a")
+        job = self.queue.claim("w")
+        self.queue.complete(job.id, "w", b"result")
+        assert self.queue.results([uid]) == {uid: b"result"}
+
+    def test_lease(self):
+        uid = self.queue.put(b"a", max_attempts=2)
+        self.queue.claim("crashed", lease=0)
+        time.sleep(0.01)
+        # The lease of the crashed worker expired
+        job = self.queue.claim("w", lease=60)
+        assert job.id == uid and job.attempts == 2
+        # The crashed worker can't renew or complete anymore
+        assert not self.queue.renew(uid, "crashed")
+        self.queue.complete(uid, "crashed")
+        assert self.queue.states([uid])[uid][0] != DONE
+
+    def test_retry(self):
+        def handler(payload):
+            raise ValueError(payload)
+
+        uid = self.queue.put(b"a", max_attempts=2)
+        worker = Worker(self.queue, handler, name="w")
+        worker.run(max_tasks=1)
+        assert self.queue.states([uid])[uid][0] == PENDING
+        assert worker.run(exit_when_empty=True) == 1
+        assert self.queue.states([uid])[uid][0] == FAILED
+        assert self.queue.wait([uid]) == {uid: self.queue.states([uid])[uid][1]}
+        assert self.queue.purge() == 1
+
+    def test_claim_timeout(self):
+        # Nobody works on the queue
+        uid = self.queue.put(b"a")
+        self.assertRaises(TimeoutError, self.queue.wait, [uid], poll_interval=0.01, claim_timeout=0.05)
+        self.queue.claim("w")
+        self.assertRaises(TimeoutError, self.queue.wait, [uid], poll_interval=0.01, timeout=0.05, claim_timeout=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
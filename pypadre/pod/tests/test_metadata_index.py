@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pypadre.pod.repository.local.file.generic.metadata_index import MetadataIndex
+
+
+class TestMetadataIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.index = MetadataIndex(os.path.join(self.dir, ".test.index.sqlite"))
+        self.index.rebuild([("1", "/objects/1", "a", {"id": "1", "name": "a", "seed": 1}),
+                            ("2", "/objects/2", "b", {"id": "2", "name": "b", "seed": 1}),
+                            ("3", "/objects/3", "c", {"id": "3", "name": "c", "tags": ["x"]})])
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_find(self):
+        assert self.index.find({"name": "b"}) == ["/objects/2"]
+        assert self.index.find(None, folder="c") == ["/objects/3"]
+        # Objects without the key have to be checked on the loaded object
+        assert self.index.find({"seed": 1}) == ["/objects/1", "/objects/2", "/objects/3"]
+        assert self.index.find({"seed": 1}, strict=True) == ["/objects/1", "/objects/2"]
+        assert self.index.find(None, offset=1, size=1) == ["/objects/2"]
+
+    def test_put_and_remove(self):
+        self.index.put("4", "/objects/4", "d", {"id": "4", "name": "d"})
+        assert self.index.directory("4") == "/objects/4"
+        self.index.put("4", "/objects/4", "d", {"id": "4", "name": "e"})
+        assert self.index.find({"name": "d"}) == []
+        self.index.remove("4")
+        assert self.index.directory("4") is None
+        self.index.remove_directory("/objects/1")
+        assert set(self.index.directories().keys()) == {"2", "3"}
+
+    def test_large_ids(self):
+        # Ids above the range of sqlite integers are stored and looked up as text
+        uid = 2 ** 64 + 1
+        self.index.put(uid, "/objects/large", "large", {"id": uid, "name": "large"})
+        assert self.index.directory(uid) == "/objects/large"
+        assert self.index.directory(str(uid)) == "/objects/large"
+        assert self.index.find({"name": "large"}) == ["/objects/large"]
+        self.index.remove(uid)
+        assert self.index.directory(uid) is None
+
+    def test_batch(self):
+        try:
+            with self.index.batch():
+                self.index.put("4", "/objects/4", "d", {"id": "4", "name": "d"})
+                assert self.index.find({"name": "d"}) == ["/objects/4"]
+                # Changes are committed directly and visible to other connections during the batch
+                other = MetadataIndex(self.index.path)
+                assert other.directory("4") == "/objects/4"
+                other.put("5", "/objects/5", "e", {"id": "5", "name": "e"})
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+        # Changes of the batch are kept even if it failed
+        assert MetadataIndex(self.index.path).directory("4") == "/objects/4"
+        assert self.index.directory("5") == "/objects/5"
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from pypadre.pod.util.object_cache import ObjectCache, estimate_size
+
+
+class TestObjectCache(unittest.TestCase):
+
+    def test_size(self):
+        assert estimate_size(np.zeros(1000)) == 8000
+        assert estimate_size({"data": np.zeros(1000)}) > 8000
+
+        # Views are counted by the buffer of their base, but only once
+        data = np.zeros((100, 10))
+        assert estimate_size(data.reshape(-1)) == 8000
+        assert estimate_size([data.reshape(-1), data[:, :5]]) < 9000
+
+        class Lazy:
+            def estimate_memory(self):
+                return 123
+        assert estimate_size(Lazy()) == 123
+
+    def test_eviction(self):
+        cache = ObjectCache(max_bytes=20000)
+        cache.put("a", np.zeros(1000))
+        cache.put("b", np.zeros(1000))
+        assert cache.get("a") is not None
+        # b is the least recently used entry
+        cache.put("c", np.zeros(1000))
+        assert "b" not in cache and "a" in cache and "c" in cache
+        assert not cache.put("d", np.zeros(10000))
+
+        stats = cache.stats()
+        assert stats["hits"] == 1 and stats["evictions"] == 1 and stats["bytes"] == 16000
+
+    def test_budgets(self):
+        cache = ObjectCache(max_bytes=100000, budgets={"ndarray": 10000})
+        cache.put("a", np.zeros(1000))
+        cache.put("b", "small")
+        cache.put("c", np.zeros(1000))
+        assert "a" not in cache and "b" in cache and "c" in cache
+
+    def test_invalidate(self):
+        cache = ObjectCache()
+        assert cache.get_or_load("a", lambda: None) is None
+        assert cache.get_or_load("a", lambda: 1) == 1
+        assert cache.invalidate("a")
+        assert len(cache) == 0 and cache.size == 0
+
+
+if __name__ == '__main__':
+    unittest.main()
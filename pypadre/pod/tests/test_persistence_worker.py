@@ -0,0 +1,64 @@
+import threading
+import unittest
+
+from pypadre.pod.backend.persistence_worker import PersistenceWorker
+from pypadre.pod.repository.exceptions import PersistenceError
+
+
+class TestPersistenceWorker(unittest.TestCase):
+
+    def test_order(self):
+        worker = PersistenceWorker(max_size=2)
+        written = []
+        for i in range(20):
+            worker.submit(str(i % 3), written.append, i)
+        worker.wait("1")
+        assert not worker.is_pending("1")
+        worker.flush()
+        assert written == list(range(20))
+        worker.close()
+
+    def test_backpressure(self):
+        worker = PersistenceWorker(max_size=1)
+        release = threading.Event()
+        worker.submit("a", release.wait)
+        worker.submit("b", lambda: None)
+        submitted = threading.Event()
+
+        def submit():
+            worker.submit("c", lambda: None)
+            submitted.set()
+        threading.Thread(target=submit, daemon=True).start()
+        # The queue is full while the first task blocks
+        assert not submitted.wait(0.2)
+        release.set()
+        assert submitted.wait(5)
+        worker.close()
+
+    def test_call(self):
+        worker = PersistenceWorker()
+        threads = []
+        worker.submit("a", lambda: threads.append(threading.current_thread()))
+        assert worker.call("a", lambda: threading.current_thread()) is threads[0]
+        assert threads[0] is not threading.current_thread()
+
+        def fail():
+            raise ValueError("failed")
+        self.assertRaises(ValueError, worker.call, "a", fail)
+        assert worker.errors == []
+        worker.close()
+
+    def test_errors(self):
+        reported = []
+        worker = PersistenceWorker(on_error=reported.append)
+
+        def fail():
+            raise ValueError("failed")
+        worker.submit("a", fail)
+        self.assertRaises(PersistenceError, worker.flush, raise_errors=True)
+        assert len(reported) == 1 and worker.errors == []
+        worker.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
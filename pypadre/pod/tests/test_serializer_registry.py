@@ -0,0 +1,46 @@
+import io
+import unittest
+
+from pypadre.pod.repository.serializer.serialiser import JSonSerializer, DillSerializer
+from pypadre.pod.repository.serializer.serializer_registry import SerializerRegistry
+
+
+class TestSerializerRegistry(unittest.TestCase):
+
+    def test_header(self):
+        buffer = SerializerRegistry.dumps({"a": [1, 2]}, "json")
+        assert SerializerRegistry.read_header(buffer)[0] == "json"
+        # The header decides the decoder, not the default
+        assert SerializerRegistry.loads(SerializerRegistry.dumps([1, 2], "msgpack"), default=JSonSerializer) == [1, 2]
+        assert SerializerRegistry.loads(SerializerRegistry.dumps([1, 2], "zstd:pickle"), default=DillSerializer,
+                                        allowed=SerializerRegistry.allowed_formats(DillSerializer, "zstd:pickle")) \
+            == [1, 2]
+
+    def test_unsafe_header(self):
+        # A header must not turn a json file into a pickle
+        for spec in ["pickle", "dill", "lz4:pickle"]:
+            buffer = SerializerRegistry.dumps([1, 2], spec)
+            self.assertRaises(ValueError, SerializerRegistry.loads, buffer, default=JSonSerializer)
+            self.assertRaises(ValueError, SerializerRegistry.load, io.BytesIO(buffer), default=JSonSerializer)
+        assert SerializerRegistry.loads(SerializerRegistry.dumps([1, 2], "dill"), default=DillSerializer) == [1, 2]
+
+    def test_legacy(self):
+        assert SerializerRegistry.read_header(b'{"a": 1}') == (None, 0)
+        assert SerializerRegistry.loads(b'{"a": 1}', default=JSonSerializer) == {"a": 1}
+
+    def test_stream(self):
+        f = io.BytesIO()
+        SerializerRegistry.dump(({"item": i} for i in range(3)), f, "jsonl")
+        f.seek(0)
+        assert list(SerializerRegistry.iter_load(f)) == [{"item": 0}, {"item": 1}, {"item": 2}]
+
+        f = io.BytesIO(b'{"a": 1}')
+        assert SerializerRegistry.load(f, default=JSonSerializer) == {"a": 1}
+
+    def test_unknown(self):
+        self.assertRaises(ValueError, SerializerRegistry.get, "unknown")
+        self.assertRaises(ValueError, SerializerRegistry.get, "unknown:json")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,304 @@
+import os
+import socket
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from collections import namedtuple
+from contextlib import contextmanager
+from logging import info, error
+
+# Default location of the queue. Workers on other hosts need a path on a shared file system.
+DEFAULT_QUEUE = os.path.join(os.path.expanduser("~"), ".pypadre", "queue.sqlite")
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+Job = namedtuple("Job", ["id", "group", "payload", "attempts"])
+
+
+class JobQueue:
+    """
+    Durable queue of tasks stored in a sqlite file. Tasks are claimed by workers with a lease. A worker has to renew
+    the lease of its task while executing it. Tasks of crashed workers are claimed again as soon as their lease
+    expired. Failed tasks are retried until they used up their attempts.
+    """
+
+    def __init__(self, path=DEFAULT_QUEUE):
+        self._path = path
+        self._migrated = False
+
+    @property
+    def path(self):
+        return self._path
+
+    def _open(self):
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self._path, timeout=60, isolation_level=None)
+        connection.execute("CREATE TABLE IF NOT EXISTS jobs (id TEXT PRIMARY KEY, job_group TEXT, payload BLOB, "
+                           "state TEXT, attempts INTEGER, max_attempts INTEGER, worker TEXT, lease_until REAL, "
+                           "error TEXT, result BLOB, created REAL, updated REAL)")
+        connection.execute("CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, created)")
+        if not self._migrated:
+            self._migrate(connection)
+            self._migrated = True
+        return connection
+
+    @staticmethod
+    def _migrate(connection):
+        # Queues created before tasks returned results lack the result column
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(jobs)")]
+        if "result" not in columns:
+            try:
+                connection.execute("ALTER TABLE jobs ADD COLUMN result BLOB")
+            except sqlite3.OperationalError:
+                # Added by another process in the meantime
+                if "result" not in [row[1] for row in connection.execute("PRAGMA table_info(jobs)")]:
+                    raise
+
+    @contextmanager
+    def _transaction(self):
+        connection = self._open()
+        try:
+            # Take the write lock right away, so two workers can't claim the same task
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        finally:
+            connection.close()
+
+    def put_many(self, payloads, group=None, max_attempts=3):
+        """
+        Queue tasks.
+        :param payloads: Serialized tasks
+        :param group: Group of the tasks. For example the run they belong to.
+        :param max_attempts: Number of times a task is executed before it is marked as failed
+        :return: Ids of the tasks in the order of the payloads
+        """
+        now = time.time()
+        ids = []
+        with self._transaction() as connection:
+            for payload in payloads:
+                uid = str(uuid.uuid4())
+                # Columns are named, as migrated queues hold them in another order
+                connection.execute("INSERT INTO jobs (id, job_group, payload, state, attempts, max_attempts, created, "
+                                   "updated) VALUES (?, ?, ?, ?, 0, ?, ?, ?)",
+                                   (uid, group, sqlite3.Binary(payload), PENDING, max_attempts, now, now))
+                ids.append(uid)
+        return ids
+
+    def put(self, payload, group=None, max_attempts=3):
+        return self.put_many([payload], group=group, max_attempts=max_attempts)[0]
+
+    def claim(self, worker, lease=60):
+        """
+        Claim the oldest pending task or a task whose lease expired.
+        :param worker: Name of the claiming worker
+        :param lease: Seconds until the task may be claimed by another worker if the lease isn't renewed
+        :return: Claimed job or None if no task is available
+        """
+        now = time.time()
+        with self._transaction() as connection:
+            # Tasks of crashed workers without attempts left won't be claimed again
+            connection.execute("UPDATE jobs SET state = ?, error = ?, updated = ? WHERE state = ? AND lease_until < ? "
+                               "AND attempts >= max_attempts",
+                               (FAILED, "Lease expired", now, RUNNING, now))
+            row = connection.execute("SELECT id, job_group, payload, attempts FROM jobs WHERE state = ? OR "
+                                     "(state = ? AND lease_until < ?) ORDER BY created LIMIT 1",
+                                     (PENDING, RUNNING, now)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE jobs SET state = ?, worker = ?, lease_until = ?, attempts = attempts + 1, "
+                               "updated = ? WHERE id = ?", (RUNNING, worker, now + lease, now, row[0]))
+            return Job(row[0], row[1], bytes(row[2]), row[3] + 1)
+
+    def renew(self, uid, worker, lease=60):
+        """
+        Extend the lease of a task.
+        :return: False if the task isn't held by the worker anymore
+        """
+        with self._transaction() as connection:
+            return connection.execute("UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND state = ?",
+                                      (time.time() + lease, uid, worker, RUNNING)).rowcount > 0
+
+    def complete(self, uid, worker, result: bytes = None):
+        """
+        Mark a task as done.
+        :param result: Serialized result of the task
+        """
+        with self._transaction() as connection:
+            connection.execute("UPDATE jobs SET state = ?, payload = NULL, result = ?, updated = ? WHERE id = ? AND "
+                               "worker = ?", (DONE, sqlite3.Binary(result) if result is not None else None,
+                                              time.time(), uid, worker))
+
+    def fail(self, uid, worker, message):
+        """
+        Release a failed task. The task is queued again if it has attempts left.
+        """
+        with self._transaction() as connection:
+            connection.execute("UPDATE jobs SET state = CASE WHEN attempts < max_attempts THEN ? ELSE ? END, "
+                               "worker = NULL, lease_until = NULL, error = ?, updated = ? WHERE id = ? AND worker = ?",
+                               (PENDING, FAILED, message, time.time(), uid, worker))
+
+    def states(self, ids):
+        """
+        :param ids: Ids of tasks
+        :return: Dict of the ids and a tuple of their state and their last error
+        """
+        ids = list(ids)
+        connection = self._open()
+        try:
+            states = {}
+            # Stay below the sqlite limit of variables per statement
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                for uid, state, message in connection.execute(
+                        "SELECT id, state, error FROM jobs WHERE id IN (" + ", ".join("?" * len(chunk)) + ")", chunk):
+                    states[uid] = (state, message)
+            return states
+        finally:
+            connection.close()
+
+    def results(self, ids):
+        """
+        :param ids: Ids of tasks
+        :return: Dict of the ids and the serialized results of the done tasks
+        """
+        ids = list(ids)
+        connection = self._open()
+        try:
+            results = {}
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i + 500]
+                for uid, result in connection.execute("SELECT id, result FROM jobs WHERE state = ? AND id IN (" +
+                                                      ", ".join("?" * len(chunk)) + ")", [DONE] + chunk):
+                    results[uid] = bytes(result) if result is not None else None
+            return results
+        finally:
+            connection.close()
+
+    def wait(self, ids, poll_interval=1.0, timeout=None, claim_timeout=None):
+        """
+        Block until all tasks are done or failed.
+        :param ids: Ids of the tasks
+        :param poll_interval: Seconds between polls of the queue
+        :param timeout: Maximal seconds to wait
+        :param claim_timeout: Maximal seconds to wait for a worker claiming the first of the tasks
+        :return: Dict of the ids and errors of the failed tasks
+        """
+        start = time.time()
+        claimed = False
+        while True:
+            states = self.states(ids)
+            if all(state in (DONE, FAILED) for state, _ in states.values()):
+                return {uid: message for uid, (state, message) in states.items() if state == FAILED}
+            claimed = claimed or any(state != PENDING for state, _ in states.values())
+            if not claimed and claim_timeout is not None and time.time() - start > claim_timeout:
+                raise TimeoutError("No worker claimed the tasks of the queue " + self._path + " within " +
+                                   str(claim_timeout) + "s. Start workers with \"pypadre worker\".")
+            if timeout is not None and time.time() - start > timeout:
+                raise TimeoutError("Tasks of the queue " + self._path + " didn't finish within " + str(timeout) + "s.")
+            time.sleep(poll_interval)
+
+    def purge(self, group=None):
+        """
+        Remove finished tasks.
+        :param group: Only remove the tasks of this group
+        :return: Number of removed tasks
+        """
+        with self._transaction() as connection:
+            if group is None:
+                return connection.execute("DELETE FROM jobs WHERE state IN (?, ?)", (DONE, FAILED)).rowcount
+            return connection.execute("DELETE FROM jobs WHERE state IN (?, ?) AND job_group = ?",
+                                      (DONE, FAILED, group)).rowcount
+
+    def stats(self):
+        """
+        :return: Dict of the states and the number of tasks in them
+        """
+        connection = self._open()
+        try:
+            return {state: count for state, count in
+                    connection.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state")}
+        finally:
+            connection.close()
+
+
+class Worker:
+    """
+    Worker pulling tasks from a job queue and passing their payload to a handler. The lease of a task is renewed by a
+    background thread while the handler runs.
+    """
+
+    def __init__(self, queue: JobQueue, handler, name=None, lease=60, poll_interval=1.0):
+        """
+        :param queue: Queue to pull from
+        :param handler: Function executing the payload of a task and returning its serialized result
+        :param name: Name of the worker. Defaults to host and process id.
+        :param lease: Seconds of a lease
+        :param poll_interval: Seconds to wait if the queue is empty
+        """
+        self._queue = queue
+        self._handler = handler
+        self._name = name if name is not None else socket.gethostname() + "-" + str(os.getpid())
+        self._lease = lease
+        self._poll_interval = poll_interval
+
+    @property
+    def name(self):
+        return self._name
+
+    def _heartbeat(self, job, stop):
+        while not stop.wait(self._lease / 3):
+            if not self._queue.renew(job.id, self._name, self._lease):
+                return
+
+    def process(self, job):
+        """
+        Execute a claimed task.
+        :param job: Job to execute
+        :return: True if the task succeeded
+        """
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(job, stop), daemon=True)
+        heartbeat.start()
+        try:
+            result = self._handler(job.payload)
+        except Exception as e:
+            error("Task " + job.id + " failed in attempt " + str(job.attempts) + ". " + str(e))
+            self._queue.fail(job.id, self._name, traceback.format_exc())
+            return False
+        finally:
+            stop.set()
+            heartbeat.join()
+        self._queue.complete(job.id, self._name, result if isinstance(result, bytes) else None)
+        return True
+
+    def run(self, max_tasks=None, exit_when_empty=False):
+        """
+        Pull and execute tasks.
+        :param max_tasks: Stop after this number of tasks
+        :param exit_when_empty: Stop as soon as the queue is empty instead of polling
+        :return: Number of executed tasks
+        """
+        executed = 0
+        while max_tasks is None or executed < max_tasks:
+            job = self._queue.claim(self._name, self._lease)
+            if job is None:
+                if exit_when_empty:
+                    break
+                time.sleep(self._poll_interval)
+                continue
+            info("Worker " + self._name + " executes task " + job.id + ".")
+            self.process(job)
+            executed += 1
+        return executed
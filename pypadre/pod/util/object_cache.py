@@ -0,0 +1,189 @@
+import mmap
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Default memory budget of a cache in bytes
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def estimate_size(obj, depth=6, seen=None):
+    """
+    Estimate the memory held by an object. Numpy arrays and pandas objects are measured by their buffers, containers
+    and the attributes of objects are followed up to the given depth. Objects can estimate themselves by a method
+    estimate_memory, for example datasets whose binary isn't loaded yet. The method returns None to be measured
+    like other objects.
+    :param obj: Object to measure
+    :param depth: Maximal depth to follow references
+    :param seen: Ids of already measured objects
+    :return: Estimated size in bytes
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        if obj.base is None:
+            return obj.nbytes
+        # Views share the buffer of their base. The buffer is counted once, unless it is memory mapped.
+        base = obj
+        while isinstance(base, np.ndarray) and base.base is not None:
+            base = base.base
+        if isinstance(obj, np.memmap) or isinstance(base, mmap.mmap) or id(base) in seen:
+            return sys.getsizeof(obj)
+        seen.add(id(base))
+        return base.nbytes if isinstance(base, np.ndarray) else obj.nbytes
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(index=True, deep=False)
+        return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+
+    estimate_memory = getattr(obj, "estimate_memory", None)
+    if callable(estimate_memory) and not isinstance(obj, type):
+        estimate = estimate_memory()
+        if estimate is not None:
+            return estimate
+
+    size = sys.getsizeof(obj, 0)
+    if depth <= 0 or isinstance(obj, (str, bytes, bytearray, int, float, bool, type)):
+        return size
+    if isinstance(obj, dict):
+        size += sum(estimate_size(k, depth - 1, seen) + estimate_size(v, depth - 1, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(estimate_size(v, depth - 1, seen) for v in obj)
+    elif hasattr(obj, "__dict__"):
+        size += estimate_size(vars(obj), depth - 1, seen)
+    return size
+
+
+class ObjectCache:
+    """
+    Least recently used cache bounded by the memory of its entries instead of their number. The cache can be shared by
+    multiple repositories and services. Entries are stored per key (for example the repository and the id of an
+    object) and can be invalidated by that key. Additional budgets can limit the memory taken by entries of a type
+    (for example {"Dataset": 1024 ** 3}), so some large datasets don't evict all small objects.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, budgets: dict = None, sizeof=estimate_size):
+        """
+        :param max_bytes: Memory budget of the whole cache in bytes
+        :param budgets: Dict of type names and their memory budget in bytes
+        :param sizeof: Function estimating the size of a value
+        """
+        self._max_bytes = max_bytes
+        self._budgets = budgets if budgets is not None else {}
+        self._sizeof = sizeof
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._type_bytes = {}
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @property
+    def size(self):
+        """
+        :return: Estimated memory of all entries in bytes
+        """
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def get_or_load(self, key, load_fn):
+        """
+        Get the value of the key or load and cache it if missing. None is never cached.
+        :param key: Key of the value
+        :param load_fn: Function loading the value
+        :return: Value
+        """
+        value = self.get(key)
+        if value is None:
+            value = load_fn()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        """
+        Cache a value. Values larger than the budget of the cache or of their type aren't cached.
+        :param key: Key of the value
+        :param value: Value to cache
+        :return: True if the value was cached
+        """
+        type_name = type(value).__name__
+        size = self._sizeof(value)
+        with self._lock:
+            self.invalidate(key)
+            budget = self._budgets.get(type_name, None)
+            if size > self._max_bytes or (budget is not None and size > budget):
+                return False
+            if budget is not None:
+                self._evict(lambda: self._type_bytes.get(type_name, 0) + size > budget, type_name)
+            self._evict(lambda: self._bytes + size > self._max_bytes)
+            self._entries[key] = (value, size, type_name)
+            self._bytes += size
+            self._type_bytes[type_name] = self._type_bytes.get(type_name, 0) + size
+            return True
+
+    def _evict(self, condition, type_name=None):
+        # Evict the least recently used entries (of the given type) while the condition holds
+        for key in list(self._entries.keys()):
+            if not condition():
+                return
+            if type_name is None or self._entries[key][2] == type_name:
+                self.invalidate(key)
+                self._evictions += 1
+
+    def invalidate(self, key):
+        """
+        Remove the entry of the key.
+        :param key: Key to remove
+        :return: True if an entry was removed
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            self._bytes -= entry[1]
+            self._type_bytes[entry[2]] -= entry[1]
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._type_bytes = {}
+
+    def stats(self):
+        """
+        :return: Dict of hit and miss counts, evictions and the memory taken by the entries (in total and per type)
+        """
+        with self._lock:
+            requests = self._hits + self._misses
+            return {"hits": self._hits, "misses": self._misses,
+                    "hit_rate": self._hits / requests if requests > 0 else 0.0,
+                    "evictions": self._evictions, "items": len(self._entries), "bytes": self._bytes,
+                    "max_bytes": self._max_bytes, "type_bytes": dict(self._type_bytes)}